@@ -0,0 +1,20 @@
+import argparse
+import logging
+
+from constants import ASSET_ARCHIVES, BAKED_DIRS, BAKED_ROOT
+from utils.bake import bake
+from utils.vfs import asset_fs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-scale and trim the sprites and describe their frames in a manifest, for tools and builds.")
+    parser.add_argument("directories", nargs="*", default=BAKED_DIRS, help="asset directories to bake")
+    parser.add_argument("--output", default=BAKED_ROOT, help="where to write the baked images and their manifest")
+    parser.add_argument("--force", action="store_true", help="bake every image, even unchanged ones")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(filename)s - %(levelname)s - %(message)s', level=logging.INFO)
+    asset_fs.mount_all(ASSET_ARCHIVES)
+
+    manifest = bake(args.directories, args.output, force=args.force)
+    print(f"{len(manifest)} images in {args.output}")
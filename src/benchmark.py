@@ -0,0 +1,77 @@
+import os
+import sys
+import argparse
+import logging
+
+import pygame
+
+from constants import ASSET_ARCHIVES, CACHE_ROOT
+from utils import bench
+from utils.vfs import asset_fs
+
+# Baselines are only meaningful on the machine they were recorded on, so they are kept out of the repository
+BASELINE = os.path.join(CACHE_ROOT, "benchmarks", "baseline.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the gameplay hot paths headless, optionally comparing them against a baseline of this machine.")
+    parser.add_argument("names", nargs="*", help="cases to run, all by default")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--round-time", type=float, default=0.02, help="minimum seconds per round")
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON")
+    parser.add_argument(
+        "--baseline", metavar="PATH", nargs="?", const=BASELINE,
+        help=f"compare against the results at PATH, or at {BASELINE} if not given, and fail on regressions"
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="replace the baseline with these results")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that fails the run, 0.25 is 25%%")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(filename)s - %(levelname)s - %(message)s', level=logging.WARNING)
+
+    # Same headless setup as the simulation, the display is only needed for surface conversion
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((576 * 2, 324 * 2))
+    asset_fs.mount_all(ASSET_ARCHIVES)
+
+    import benchmarks  # noqa: F401, registers the cases
+    if args.list:
+        print("\n".join(bench.cases()))
+        sys.exit()
+
+    unknown = set(args.names) - set(bench.cases())
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = []
+    for name in args.names or bench.cases():
+        result, = bench.run([name], args.rounds, args.round_time)
+        print(result)
+        results.append(result)
+
+    if args.output:
+        bench.save(results, args.output)
+    if args.save_baseline:
+        path = args.baseline or BASELINE
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        bench.save(results, path)
+        sys.exit()
+
+    if args.baseline is None:
+        sys.exit()
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, record one on this machine with --save-baseline")
+        sys.exit()
+
+    comparisons = bench.compare(results, bench.load(args.baseline))
+    print(f"\nAgainst {args.baseline}:")
+    for comparison in comparisons:
+        print(comparison)
+    regressions = [c.name for c in comparisons if c.regressed(args.threshold)]
+    if regressions:
+        print(f"{len(regressions)} regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    pygame.quit()
@@ -0,0 +1,7 @@
+"""
+Benchmark cases of the gameplay hot paths, run with ``python benchmark.py``.
+
+Importing this package registers every case with `utils.bench`. The cases
+need an initialized display, which the runner sets up headless.
+"""
+from benchmarks import controls, entities, level
@@ -0,0 +1,27 @@
+import numpy as np
+
+from controls.gestures import HandFeatures
+from controls.gestures.commands import GesturePlay, GesturePause, GestureShop, GestureExit
+from controls.gestures.movement import GestureLeft, GestureRight, GestureUp, GestureDown
+from controls.gestures.spells import GesturePray
+from controls.standard import KeyboardMouse
+from utils.bench import benchmark
+
+
+@benchmark("keyboard.get_inputs")
+def keyboard_get_inputs():
+    controls = KeyboardMouse()
+    yield controls.get_inputs
+
+
+def _gesture_case(gesture):
+    def case():
+        # Two random hands, scored on fresh features every call like a new camera frame
+        landmarks = np.random.default_rng(0).random((2, 21, 3), dtype=np.float32)
+        yield lambda: gesture.score(HandFeatures(landmarks))
+    return case
+
+
+for _gesture in (GestureLeft(), GestureRight(), GestureUp(), GestureDown(),
+                 GesturePlay(), GesturePause(), GestureShop(), GestureExit(), GesturePray()):
+    benchmark(f"gesture.{type(_gesture).__name__}.score")(_gesture_case(_gesture))
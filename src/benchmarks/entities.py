@@ -0,0 +1,27 @@
+from controls import Input
+from entities.enemies import BAT, Servant
+from entities.hero import Hero, HeroConfig
+from utils.animation import Animation
+from utils.bench import benchmark
+
+_DT = 16
+
+
+@benchmark("animation.update")
+def animation_update():
+    animation = Animation(BAT.load_frames()[Servant.ServantState.IDLE])
+    animation.start()
+    yield lambda: animation.update(_DT)
+
+
+@benchmark("hero.update")
+def hero_update():
+    hero = Hero(HeroConfig(HeroConfig.Path.APPRENTICE, HeroConfig.Skin.DUDE_MONSTER, skills=[]))
+    inputs = [Input.RIGHT]
+    yield lambda: hero.update(dt=_DT, inputs=inputs)
+
+
+@benchmark("servant.fsm_step/1000")
+def servant_fsm_step():
+    machines = [BAT.create()._fsm for _ in range(1000)]
+    yield lambda: Servant.fsm_table.step(machines, dt=_DT)
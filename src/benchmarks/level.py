@@ -0,0 +1,96 @@
+import numpy as np
+import pygame
+from pymunk import Poly
+
+from controls import Input
+from controls.scripted import ScriptedControls
+from core.player import Player
+from entities.enemies import BAT
+from entities.spells.instant import SUN_STRIKE
+from level import Level
+from level.renderer import TileLayerRenderer
+from utils import load_tiled_map, unregister_atlas
+from utils.bench import benchmark
+
+_DT = 16
+_ANCHOR = "assets/levels/test_level.tmx"
+
+
+def _level() -> Level:
+    return Level(0, Player(controls=ScriptedControls([[Input.RIGHT]] * 30 + [[Input.LEFT]] * 30)))
+
+
+def _spawn_bat(level: Level, i: int) -> None:
+    bat = BAT.create(level.dynamic, level.enemies)
+    bat.body.position = (64 + (i % 28) * 64, 64 + (i // 28) % 6 * 64)
+    shape = Poly.create_box(bat.body, bat.rect.size)
+    shape.mass = 100000
+    level.bodies.register(bat, shape)
+
+
+def _spawn_swarm(level: Level, count: int) -> None:
+    # Scattered over the sky above the ground, flying right or left
+    rng = np.random.default_rng(count)
+    positions = rng.uniform((32, 32), (1888, 400), (count, 2))
+    velocities = rng.choice((-64, 64), (count, 1)) * np.array([[1, 0]])
+    level.swarm.spawn(positions, velocities)
+
+
+def _update_case(bats: int, spells: int, swarm: int = 0):
+    def case():
+        level = _level()
+        spawned = 0
+
+        def frame():
+            # Killed bats and ended spells are replaced, so that every frame does the same work
+            nonlocal spawned
+            while len(level.enemies) < bats:
+                _spawn_bat(level, spawned)
+                spawned += 1
+            if len(level.swarm) < swarm:
+                _spawn_swarm(level, swarm - len(level.swarm))
+            while len(level.spells) < spells:
+                SUN_STRIKE.create(level.dynamic, level.spells, pos=(64 + len(level.spells) * 1792 // spells, 448))
+            level.update(_DT)
+
+        try:
+            yield frame
+        finally:
+            unregister_atlas(level.atlas.name)
+    return case
+
+
+for _bats, _spells in ((10, 2), (200, 20)):
+    benchmark(f"level.update/{_bats}x{_spells}")(_update_case(_bats, _spells))
+
+# Bulk enemies go to the swarm
+benchmark("level.update/swarm/2000x20")(_update_case(0, 20, swarm=2000))
+
+
+def large_map_xml(width: int, height: int) -> str:
+    """Map of the plains tileset covered with ground but for the top rows"""
+    rows = [",".join(["0"] * width)] * 3
+    rows += [",".join(str(1 + (x + y) % 3 + 7 * (y % 3)) for x in range(width)) for y in range(height - 3)]
+    data = ",\n".join(rows)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="{width}" height="{height}" tilewidth="32" tileheight="32" infinite="0">
+ <tileset firstgid="1" name="plains" tilewidth="32" tileheight="32" tilecount="42" columns="7">
+  <image source="../gamekit/Tiles/TileSet.png" width="224" height="192"/>
+ </tileset>
+ <layer id="1" name="ground" width="{width}" height="{height}">
+  <data encoding="csv">
+{data}
+  </data>
+ </layer>
+</map>"""
+
+
+@benchmark("level.draw/large")
+def level_draw():
+    level = _level()
+    level.tiles = TileLayerRenderer(load_tiled_map(_ANCHOR, large_map_xml(96, 48)), ["ground"])
+    screen = pygame.display.get_surface()
+    try:
+        yield lambda: level.draw(screen)
+    finally:
+        unregister_atlas(level.atlas.name)
@@ -5,9 +5,30 @@ import pygame
 SOURCES_ROOT = os.path.abspath(os.path.dirname(__file__))
 PROJECT_ROOT = os.path.dirname(SOURCES_ROOT)
 ASSETS_ROOT = os.path.join(PROJECT_ROOT, 'assets')
+CACHE_ROOT = os.path.join(PROJECT_ROOT, '.cache')
+BAKED_ROOT = os.path.join(CACHE_ROOT, 'baked')
 
 FPS = 60
 G = 256
 
+# Physics runs at a fixed rate independent of the frame rate
+PHYSICS_STEP = 1 / 120
+MAX_PHYSICS_STEPS = 8
+
+# Frames taking this many milliseconds or more dump the recent log records
+HITCH_MS = 3 * 1000 // FPS
+
 RECOGNITION_THRESHOLD = 0.8
 GESTURE_EVENT = pygame.USEREVENT + 1
+
+ASSET_CACHE_BUDGET = 256 * 1024 * 1024
+
+# Asset packs are read straight out of their archives instead of being extracted on first run
+ASSET_ARCHIVES = {
+    "assets/gamekit": "assets/craftpix-891169-platformer-game-kit-pixel-art.zip",
+    "assets/melee": "assets/craftpix-net-154153-free-tiny-pixel-hero-sprites-with-melee-attacks.zip",
+    "assets/magic": "assets/craftpix-net-440623-free-pixel-magic-sprite-effects-pack.zip",
+}
+
+# Sprites pre-scaled by the bake command, see utils.bake
+BAKED_DIRS = ["assets/gamekit", "assets/magic", "assets/melee"]
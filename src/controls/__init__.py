@@ -18,4 +18,11 @@ class Controls(ABC):
         ...
 
     def get_surface(self):
-        return None
\ No newline at end of file
+        return None
+
+    def tick(self, dt: int) -> None:
+        """Called once per frame, before the game is updated with `dt`"""
+        pass
+
+    def close(self) -> None:
+        pass
\ No newline at end of file
@@ -1,6 +1,87 @@
 from abc import ABC, abstractmethod
+from enum import IntEnum
+from functools import cached_property
 import typing as tp
-from typing import NamedTuple
+
+import numpy as np
+
+
+class HandLandmark(IntEnum):
+    """Indices of the MediaPipe hand landmarks, available without importing mediapipe."""
+    WRIST = 0
+    THUMB_CMC = 1
+    THUMB_MCP = 2
+    THUMB_IP = 3
+    THUMB_TIP = 4
+    INDEX_FINGER_MCP = 5
+    INDEX_FINGER_PIP = 6
+    INDEX_FINGER_DIP = 7
+    INDEX_FINGER_TIP = 8
+    MIDDLE_FINGER_MCP = 9
+    MIDDLE_FINGER_PIP = 10
+    MIDDLE_FINGER_DIP = 11
+    MIDDLE_FINGER_TIP = 12
+    RING_FINGER_MCP = 13
+    RING_FINGER_PIP = 14
+    RING_FINGER_DIP = 15
+    RING_FINGER_TIP = 16
+    PINKY_MCP = 17
+    PINKY_PIP = 18
+    PINKY_DIP = 19
+    PINKY_TIP = 20
+
+FINGER_TIPS = [HandLandmark.THUMB_TIP, HandLandmark.INDEX_FINGER_TIP, HandLandmark.MIDDLE_FINGER_TIP,
+               HandLandmark.RING_FINGER_TIP, HandLandmark.PINKY_TIP]
+
+
+class HandFeatures:
+    """
+    Landmarks of all hands in a frame as one (hands, 21, 3) float32 array.
+
+    Features used by several gestures are computed on first access and
+    shared, so every gesture scores all hands with a few array operations.
+    """
+    landmarks: np.ndarray
+
+    def __init__(self, landmarks: np.ndarray):
+        self.landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)
+
+    @classmethod
+    def from_mediapipe(cls, multi_hand_landmarks) -> 'HandFeatures':
+        return cls(np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+            dtype=np.float32,
+        ))
+
+    def __len__(self) -> int:
+        return self.landmarks.shape[0]
+
+    @cached_property
+    def pointing(self) -> np.ndarray:
+        """(hands, 2, 3) unit vectors from index MCP to index tip and from pinky MCP to thumb tip"""
+        lm = self.landmarks
+        vectors = np.stack([
+            lm[:, HandLandmark.INDEX_FINGER_TIP] - lm[:, HandLandmark.INDEX_FINGER_MCP],
+            lm[:, HandLandmark.THUMB_TIP] - lm[:, HandLandmark.PINKY_MCP],
+        ], axis=1)
+        norms = np.linalg.norm(vectors, axis=2, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    @cached_property
+    def tip_to_wrist(self) -> np.ndarray:
+        """(hands, 5) distances from the wrist to the thumb, index, middle, ring and pinky tips"""
+        lm = self.landmarks
+        return np.linalg.norm(lm[:, FINGER_TIPS] - lm[:, HandLandmark.WRIST, None], axis=2)
+
+    @cached_property
+    def sides(self) -> tp.Optional[tp.Tuple[int, int]]:
+        """Indices of the last hand left and right of the frame center, if both are present"""
+        left = np.flatnonzero(self.landmarks[:, HandLandmark.WRIST, 0] < 0.5)
+        right = np.flatnonzero(self.landmarks[:, HandLandmark.WRIST, 0] >= 0.5)
+        if not len(left) or not len(right):
+            return None
+        return int(left[-1]), int(right[-1])
+
 
 class Gesture(ABC):
     name: str
@@ -9,13 +90,14 @@ class Gesture(ABC):
         self.name = name
 
     @abstractmethod
-    def score(self, multi_hand_landmarks: NamedTuple) -> tp.List[float]:
+    def score(self, hands: HandFeatures) -> np.ndarray:
+        """Score between 0 and 1 for every hand"""
         ...
 
 class CustomGesture(Gesture):
     features: tp.Any
 
-    def score(self, multi_hand_landmarks: NamedTuple) -> tp.List[float]:
+    def score(self, hands: HandFeatures) -> np.ndarray:
         ...
 
 class SingletonGesture(Gesture):
@@ -31,5 +113,5 @@ class GestureSequence(ABC):
     def __init__(self, name: str, k: float = 1.0) -> None:
         self.name = name
 
-    def score(self, multi_hand_landmarks_sequence: tp.List[NamedTuple]) -> tp.List[float]:
+    def score(self, hands_sequence: tp.List[HandFeatures]) -> np.ndarray:
         ...
@@ -0,0 +1,78 @@
+import time
+import threading
+import typing as tp
+
+from controls import Controls, Input
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class HotSwapControls(Controls):
+    """
+    Serves input from a fallback implementation while the preferred one is built in the background.
+
+    The preferred controls replace the fallback as soon as their constructor
+    returns. If it raises, the fallback is kept for the rest of the session.
+    Preferred controls built after `close` are closed right away.
+    """
+
+    def __init__(self, fallback: Controls, factory: tp.Callable[[], Controls]):
+        self._active = fallback
+        self._fallback = fallback
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.perf_counter()
+        self.ready_after: tp.Optional[float] = None
+
+        self._thread = threading.Thread(target=self._build, args=(factory,), name="controls-init", daemon=True)
+        self._thread.start()
+
+    def _build(self, factory: tp.Callable[[], Controls]) -> None:
+        try:
+            controls = factory()
+        except (OSError, ImportError) as e:
+            logger.info(f"Keeping {type(self._fallback).__name__}: {type(e).__name__} {e}")
+        except Exception:
+            logger.exception(f"Keeping {type(self._fallback).__name__}: building the preferred controls failed")
+        else:
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self.ready_after = time.perf_counter() - self._started
+                    self._active = controls
+            if closed:
+                logger.info(f"Closing {type(controls).__name__}, built after the controls were closed")
+                controls.close()
+            else:
+                logger.info(f"Switched to {type(controls).__name__} after {self.ready_after:.2f} s")
+        finally:
+            self._ready.set()
+
+    @property
+    def active(self) -> Controls:
+        return self._active
+
+    @property
+    def swapped(self) -> bool:
+        return self._active is not self._fallback
+
+    def wait(self, timeout: tp.Optional[float] = None) -> bool:
+        """Block until the background initialization finished, successfully or not."""
+        return self._ready.wait(timeout)
+
+    def get_inputs(self) -> tp.List[Input]:
+        return self._active.get_inputs()
+
+    def get_surface(self):
+        return self._active.get_surface()
+
+    def tick(self, dt: int) -> None:
+        self._active.tick(dt)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            active = self._active
+        active.close()
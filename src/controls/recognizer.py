@@ -1,15 +1,19 @@
+import time
+import threading
 import typing as tp
 
+import numpy as np
 import pygame
 import pygame.camera
-import mediapipe as mp
 
 from controls import Controls, Input
+from controls.gestures import HandFeatures
 from controls.gestures.movement import *
 from controls.gestures.commands import *
 from controls.gestures.spells import GesturePray
 
 from constants import RECOGNITION_THRESHOLD, GESTURE_EVENT
+from utils.trace import tracer
 
 import logging
 logger = logging.getLogger(__name__)
@@ -34,8 +38,18 @@ spells = [
 
 gestures = movement + spells
 
+class Recognition(tp.NamedTuple):
+    """Result of processing one camera frame"""
+    inputs: tp.List[Input]
+    landmarks: tp.Any
+    surface: tp.Optional[pygame.Surface]
+    timestamp: float
+    sequence: int = 0
+
+
 class Recognizer(Controls):
     def __init__(self):
+        start = time.perf_counter()
         pygame.camera.init()
 
         cam_list = pygame.camera.list_cameras()
@@ -47,15 +61,21 @@ class Recognizer(Controls):
         self.cam = pygame.camera.Camera(cam_list[0])
         self.cam.start()
         self.surface = pygame.Surface(self.cam.get_size())
-        self.processed_surface = None
 
-        # Initialize MediaPipe Hands
-        self.hands = mp.solutions.hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.6,
-            min_tracking_confidence=0.6
-        )
+        # Initialize MediaPipe Hands, importing it only now since it pulls in TensorFlow
+        try:
+            import mediapipe as mp
+            self.hands = mp.solutions.hands.Hands(
+                static_image_mode=False,
+                max_num_hands=2,
+                min_detection_confidence=0.6,
+                min_tracking_confidence=0.6
+            )
+        except Exception:
+            # Falling back to other controls, the camera must not stay on
+            self.cam.stop()
+            del self.cam
+            raise
 
         self._gesture_mapping = {
             'left': Input.LEFT,
@@ -65,14 +85,47 @@ class Recognizer(Controls):
             'pray': Input.SUN_STRIKE,
         }
 
+        # Capture and inference run on a worker thread that publishes the latest recognition
+        self._latest = Recognition([], None, None, time.perf_counter())
+        self._consumed = 0
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="recognizer", daemon=True)
+        self._worker.start()
+        logger.info(f"Recognizer ready after {time.perf_counter() - start:.2f} s")
+
 
     def __del__(self):
-        self.cam.stop()
+        # The constructor may have failed before the camera was started
+        if hasattr(self, 'cam'):
+            self.close()
+            self.cam.stop()
         pygame.camera.quit()
 
-    def get_inputs(self) -> tp.List[Input]:
-        # Load image into surface
-        if self.cam.query_image():
+    def close(self) -> None:
+        """Stop the worker thread"""
+        worker = getattr(self, '_worker', None)
+        if worker is None:
+            return
+        self._stop.set()
+        if worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout=1.0)
+
+    def _run(self) -> None:
+        sequence = 0
+        while not self._stop.is_set():
+            try:
+                with tracer.span("recognize", "recognizer"):
+                    sequence += 1
+                    self._latest = self._process()._replace(sequence=sequence)
+                    # Traced as an arrow to the frame that first reads this recognition
+                    tracer.flow("recognition", sequence, start=True)
+            except Exception:
+                logger.exception("Recognizer worker stopped")
+                return
+
+    def _process(self) -> Recognition:
+        # Blocks until the camera delivers a new frame, so frames are dropped rather than queued
+        with tracer.span("capture", "recognizer"):
             self.cam.get_image(self.surface)
 
         # Convert surface to numpy array
@@ -80,40 +133,47 @@ class Recognizer(Controls):
         y, x, c = image_rgb.shape # since we transpose the image it's now (y, x, c)
 
         # Process the image and find hands
-        results = self.hands.process(image_rgb)
+        with tracer.span("inference", "recognizer"):
+            results = self.hands.process(image_rgb)
+        timestamp = time.perf_counter()
 
-        # Draw hand landmarks and process gestures
-        self.processed_surface = None
-        if results.multi_hand_landmarks:
-            recognized = self.recognize(results.multi_hand_landmarks)
+        if not results.multi_hand_landmarks:
+            return Recognition([], None, None, timestamp)
 
-            self.processed_surface = pygame.surfarray.make_surface(np.transpose(image_rgb, (1, 0, 2)))
+        # Gather all landmarks into one array so every gesture scores all hands at once
+        hands = HandFeatures.from_mediapipe(results.multi_hand_landmarks)
+        recognized = self.recognize(hands)
 
-            for handslms in results.multi_hand_landmarks:
-                for lm in handslms.landmark:
-                    # print(id, lm)
-                    lmx = int(lm.x * x)
-                    lmy = int(lm.y * y)
+        processed_surface = pygame.surfarray.make_surface(np.transpose(image_rgb, (1, 0, 2)))
 
-                    pygame.draw.circle(self.processed_surface, (0, 255, 0), (lmx, lmy), 5)
+        # Draw hand landmarks
+        for lmx, lmy in (hands.landmarks[:, :, :2].reshape(-1, 2) * (x, y)).astype(int).tolist():
+            pygame.draw.circle(processed_surface, (0, 255, 0), (lmx, lmy), 5)
 
+        inputs = list(map(lambda k: self._gesture_mapping[k], recognized))
+        return Recognition(inputs, hands.landmarks, processed_surface, timestamp)
 
-            return list(map(lambda k: self._gesture_mapping[k], recognized))
+    @property
+    def latest(self) -> Recognition:
+        return self._latest
 
-        return []
+    def get_inputs(self) -> tp.List[Input]:
+        latest = self._latest
+        if latest.sequence != self._consumed:
+            self._consumed = latest.sequence
+            tracer.flow("recognition", latest.sequence, start=False)
+        return latest.inputs
 
     def get_surface(self):
-        return self.processed_surface
+        return self._latest.surface
 
-    def recognize(self, multi_hand_landmarks):
-        best_score = [RECOGNITION_THRESHOLD] * len(multi_hand_landmarks)
-        best_match = [None] * len(multi_hand_landmarks)
+    def recognize(self, hands: HandFeatures) -> tp.Set[str]:
+        if not len(hands):
+            return set()
 
-        for gesture in gestures:
-            scores = gesture.score(multi_hand_landmarks)
-            for i, score in enumerate(scores):
-                if score > best_score[i]:
-                    best_score[i] = score
-                    best_match[i] = gesture.name
+        # (gestures, hands) score matrix, the best gesture of each hand wins if it clears the threshold
+        scores = np.stack([gesture.score(hands) for gesture in gestures])
+        best = scores.argmax(axis=0)
+        best_score = scores[best, np.arange(len(hands))]
 
-        return set(best_match) - {None}
\ No newline at end of file
+        return {gestures[i].name for i, score in zip(best, best_score) if score > RECOGNITION_THRESHOLD}
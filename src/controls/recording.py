@@ -0,0 +1,116 @@
+import struct
+import typing as tp
+
+from controls import Controls, Input
+
+import logging
+logger = logging.getLogger(__name__)
+
+# File header: magic and format version
+_HEADER = struct.Struct("<4sH")
+_MAGIC = b"FHIN"
+_VERSION = 2
+
+# Run of identical frames: number of frames, frame time in milliseconds and a bitmask of the held inputs.
+# Frame times get 32 bits, as a frame can last minutes when the game is paused in a debugger or the machine sleeps.
+_RUN = struct.Struct("<HIH")
+_MAX_RUN = 0xFFFF
+
+
+def _mask(inputs: tp.Iterable[Input]) -> int:
+    mask = 0
+    for i in inputs:
+        mask |= 1 << (i.value - 1)
+    return mask
+
+
+def _inputs(mask: int) -> tp.List[Input]:
+    return [i for i in Input if mask & (1 << (i.value - 1))]
+
+
+class RecordingControls(Controls):
+    """
+    Passes through the inputs of other controls and logs them with the frame time they were read in.
+
+    Every `get_inputs` call is one logged frame, with the dt of the latest
+    `tick`. Consecutive identical frames are stored as one run of 8 bytes, so
+    an hour of play usually takes a few kilobytes.
+    """
+
+    def __init__(self, controls: Controls, path: str):
+        self._controls = controls
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+        self._dt = 0
+        self._run: tp.Optional[tp.List[int]] = None
+        self.frames = 0
+
+    def tick(self, dt: int) -> None:
+        self._dt = dt
+        self._controls.tick(dt)
+
+    def get_inputs(self) -> tp.List[Input]:
+        inputs = self._controls.get_inputs()
+        mask = _mask(inputs)
+        self.frames += 1
+
+        run = self._run
+        if run is not None and run[1] == self._dt and run[2] == mask and run[0] < _MAX_RUN:
+            run[0] += 1
+        else:
+            self._write_run()
+            self._run = [1, self._dt, mask]
+        return inputs
+
+    def get_surface(self):
+        return self._controls.get_surface()
+
+    def _write_run(self) -> None:
+        if self._run is not None:
+            self._file.write(_RUN.pack(*self._run))
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._write_run()
+            self._run = None
+            self._file.close()
+            logger.info(f"Recorded {self.frames} frames of input")
+        self._controls.close()
+
+
+class ReplayControls(Controls):
+    """Feeds back a log written by `RecordingControls`, frame by frame"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not an input recording of version {_VERSION}")
+
+        self._runs = [run for run in _RUN.iter_unpack(data[_HEADER.size:])]
+        self._run = 0
+        self._left = self._runs[0][0] if self._runs else 0
+        self.frames = sum(run[0] for run in self._runs)
+
+    @property
+    def finished(self) -> bool:
+        return self._run >= len(self._runs)
+
+    @property
+    def next_dt(self) -> int:
+        """Frame time of the frame whose inputs are read next"""
+        return self._runs[self._run][1]
+
+    def get_inputs(self) -> tp.List[Input]:
+        if self.finished:
+            return []
+
+        inputs = _inputs(self._runs[self._run][2])
+        self._left -= 1
+        if not self._left:
+            self._run += 1
+            if not self.finished:
+                self._left = self._runs[self._run][0]
+        return inputs
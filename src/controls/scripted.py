@@ -0,0 +1,64 @@
+import typing as tp
+
+from controls import Controls, Input
+
+
+class ScriptedControls(Controls):
+    """
+    Replays a fixed list of per-frame inputs, one entry per `get_inputs` call.
+
+    The level asks for inputs once per update, so entry `i` is what the player
+    holds during frame `i`. The script starts over when it runs out if `repeat`
+    is set, otherwise no input is reported from then on.
+    """
+
+    def __init__(self, frames: tp.Sequence[tp.Sequence[Input]], repeat: bool = True):
+        self._frames = [list(inputs) for inputs in frames]
+        self._repeat = repeat
+        self.frame = 0
+
+    @classmethod
+    def timeline(
+        cls,
+        events: tp.Sequence[tp.Tuple[int, tp.Sequence[Input]]],
+        duration: int,
+        dt: int,
+        repeat: bool = True,
+    ) -> 'ScriptedControls':
+        """
+        Build a script from `(start, inputs)` pairs in milliseconds, each held until the next one starts.
+
+        `duration` is the length of the whole script and `dt` the frame time it will be played at.
+        """
+        frames = []
+        events = sorted(events, key=lambda event: event[0])
+        current: tp.Sequence[Input] = []
+        for t in range(0, duration, dt):
+            while events and events[0][0] <= t:
+                current = events.pop(0)[1]
+            frames.append(current)
+        return cls(frames, repeat)
+
+    def get_inputs(self) -> tp.List[Input]:
+        index = self.frame
+        self.frame += 1
+        if index >= len(self._frames):
+            if not self._repeat or not self._frames:
+                return []
+            index %= len(self._frames)
+        return list(self._frames[index])
+
+
+def patrol(dt: int) -> ScriptedControls:
+    """Walk back and forth and cast Sun Strike on every turn, exercising most of the level code"""
+    return ScriptedControls.timeline(
+        [
+            (0, [Input.RIGHT]),
+            (2000, [Input.SUN_STRIKE]),
+            (2000 + dt, [Input.LEFT]),
+            (4000, [Input.SUN_STRIKE]),
+            (4000 + dt, []),
+        ],
+        duration=5000,
+        dt=dt,
+    )
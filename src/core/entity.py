@@ -1,12 +1,18 @@
 import typing as tp
+import logging
+from dataclasses import dataclass
 
-from pymunk import Body
+from pymunk import Body, Shape, Space
+from pygame import Rect
 from pygame.sprite import Sprite
 
-from core.fsm import FiniteStateMachine, State
+from controls import Input
+from core.fsm import FiniteStateMachine, CompiledFSM, State
+
+logger = logging.getLogger(__name__)
 
 class Entity(Sprite):
-    _fsm: tp.Optional[FiniteStateMachine]
+    _fsm: tp.Optional[tp.Union[FiniteStateMachine, CompiledFSM]]
 
     def __init__(self, *groups, name='entity') -> None:
         super().__init__(*groups)
@@ -23,20 +29,25 @@ class Entity(Sprite):
         return self.rect.center
 
     @property
-    def fsm(self) -> tp.Optional[FiniteStateMachine]:
+    def fsm(self) -> tp.Optional[tp.Union[FiniteStateMachine, CompiledFSM]]:
         return self._fsm
 
     @property
     def flip(self):
         return self._flip
 
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
-        self._fsm.update(*args, **kwargs)
-    
+    def render_rect(self, alpha: float) -> Rect:
+        """Where to draw the sprite when the frame is ``alpha`` of a physics step past the last one"""
+        return self.rect
+
+    def update(self, dt: int, inputs: tp.Sequence[Input] = ()) -> None:
+        # The transitions receive the frame as keywords, packed only here
+        self._fsm.update(dt=dt, inputs=inputs)
+
     def kill(self):
         super().kill()
-        self._fsm.state = State.DEAD
+        if self._fsm is not None:
+            self._fsm.state = State.DEAD
 
 
 class PhysicalEntity(Entity):
@@ -44,16 +55,30 @@ class PhysicalEntity(Entity):
     def __init__(self, *groups, name='physical entity'):
         super().__init__(*groups, name=name)
         self.body = Body()
+        self.previous_position = self.body.position
+        self.registry: tp.Optional['BodyRegistry'] = None
+
+    def save_position(self):
+        """Remember the body position before a physics step, to interpolate from"""
+        self.previous_position = self.body.position
+
+    def render_rect(self, alpha: float) -> Rect:
+        return self.rect.copy().move_to(center=self.previous_position.interpolate_to(self.body.position, alpha))
 
-    def _physics_update(self, *args, **kwargs):
+    def kill(self):
+        super().kill()
+        if self.registry is not None:
+            self.registry.release(self)
+
+    def _physics_update(self, inputs: tp.Sequence[Input]) -> None:
         pass
 
-    def update(self, *args, **kwargs):
+    def update(self, dt: int, inputs: tp.Sequence[Input] = ()) -> None:
         # Physics update
-        self._physics_update(*args, **kwargs)
+        self._physics_update(inputs)
 
         # FSM update
-        super().update(*args, **kwargs)
+        super().update(dt, inputs)
 
         # Visual update
         self.rect.center = self.body.position
@@ -63,4 +88,80 @@ class LivingEntity(PhysicalEntity):
     _atk: int
 
     def __init__(self, *groups, name='living entity'):
-        super().__init__(*groups, name=name)
\ No newline at end of file
+        super().__init__(*groups, name=name)
+
+@dataclass(frozen=True)
+class BodyStats:
+    live: int
+    pending_add: int
+    pending_remove: int
+    added: int
+    reclaimed: int
+
+
+class BodyRegistry:
+    """
+    Owns the bodies and shapes of physical entities in a space.
+
+    Registering and releasing only queue the change, `flush` applies all of
+    them with one `space.add` and one `space.remove` call. Call it between
+    steps, never from inside one, so that the space is not modified while
+    it is being simulated.
+    """
+    _entries: tp.Dict[PhysicalEntity, tp.Tuple[Shape, ...]]
+
+    def __init__(self, space: Space):
+        self.space = space
+        self._entries = {}
+        self._to_add: tp.List[PhysicalEntity] = []
+        self._to_remove: tp.List[tp.Tuple[Body, tp.Tuple[Shape, ...]]] = []
+        self._added = 0
+        self._reclaimed = 0
+
+    def __iter__(self) -> tp.Iterator[PhysicalEntity]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entity: PhysicalEntity) -> bool:
+        return entity in self._entries
+
+    def register(self, entity: PhysicalEntity, *shapes: Shape) -> None:
+        """Queue the entity body and its shapes for addition to the space"""
+        entity.registry = self
+        self._entries[entity] = shapes
+        self._to_add.append(entity)
+
+    def release(self, entity: PhysicalEntity) -> None:
+        """Queue the entity body and its shapes for removal, a no-op if they are already gone"""
+        shapes = self._entries.pop(entity, None)
+        if shapes is None:
+            return
+        entity.registry = None
+        if entity in self._to_add:
+            # Never made it into the space
+            self._to_add.remove(entity)
+            return
+        self._to_remove.append((entity.body, shapes))
+
+    def flush(self) -> None:
+        if self._to_remove:
+            self.space.remove(*(obj for body, shapes in self._to_remove for obj in (body, *shapes)))
+            self._reclaimed += len(self._to_remove)
+            logger.debug(f"Removed {len(self._to_remove)} bodies, {len(self._entries)} live")
+            self._to_remove.clear()
+
+        if self._to_add:
+            self.space.add(*(obj for entity in self._to_add for obj in (entity.body, *self._entries[entity])))
+            self._added += len(self._to_add)
+            self._to_add.clear()
+
+    def stats(self) -> BodyStats:
+        return BodyStats(
+            live=len(self._entries),
+            pending_add=len(self._to_add),
+            pending_remove=len(self._to_remove),
+            added=self._added,
+            reclaimed=self._reclaimed,
+        )
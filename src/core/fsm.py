@@ -33,3 +33,91 @@ class SingletonFSM(FiniteStateMachine):
         if not hasattr(cls, 'instance'):
             cls.instance = super().__new__(cls)
         return cls.instance
+
+
+class FSMTable(Generic[T]):
+    """
+    Transition table shared by every entity of a class, compiled to integer state codes.
+
+    Transitions name methods of the owner instead of holding bound methods, so
+    the table is resolved once per owner class and each entity only stores its
+    current and previous codes (see `CompiledFSM`).
+    """
+    __slots__ = ('states', 'methods', 'codes', 'decode', '_handlers')
+
+    def __init__(self, states: tp.Type[T], methods: tp.Dict[T, str]):
+        self.states = states
+        self.methods = methods
+        self.decode: tp.Tuple[T, ...] = (states.DEAD, states.INIT, *states)
+        self.codes: tp.Dict[T, int] = {state: code for code, state in enumerate(self.decode)}
+        self._handlers: tp.Dict[type, tp.Tuple[tp.Callable[..., T], ...]] = {}
+
+    def handlers(self, owner_type: type) -> tp.Tuple[tp.Callable[..., T], ...]:
+        """Unbound transition functions of `owner_type`, indexed by state code"""
+        handlers = self._handlers.get(owner_type)
+        if handlers is None:
+            handlers = tuple(self._resolve(owner_type, state) for state in self.decode)
+            self._handlers[owner_type] = handlers
+        return handlers
+
+    def _resolve(self, owner_type: type, state: T) -> tp.Callable[..., T]:
+        if state not in self.methods:
+            def missing(*args, **kwargs):
+                raise KeyError(state)
+            return missing
+
+        handler = getattr(owner_type, self.methods[state])
+        if not callable(handler):
+            raise TypeError(f"Transition from {state} of {owner_type.__name__} is not callable")
+        return handler
+
+    def bind(self, owner) -> 'CompiledFSM[T]':
+        return CompiledFSM(self, owner)
+
+    def step(self, machines: tp.Iterable['CompiledFSM[T]'], *args, **kwargs) -> None:
+        """Advance many machines of this table in one call"""
+        codes = self.codes
+        for fsm in machines:
+            code = fsm.code
+            fsm.previous_code = code
+            fsm.code = codes[fsm.handlers[code](fsm.owner, *args, **kwargs)]
+
+
+class CompiledFSM(Generic[T]):
+    """Per entity state of an `FSMTable`, exposing the `FiniteStateMachine` interface"""
+    __slots__ = ('table', 'owner', 'handlers', 'code', 'previous_code')
+
+    def __init__(self, table: FSMTable[T], owner):
+        self.table = table
+        self.owner = owner
+        self.handlers = table.handlers(type(owner))
+        self.code = self.previous_code = table.codes[table.states.INIT]
+
+    @property
+    def states(self) -> tp.Type[T]:
+        return self.table.states
+
+    @property
+    def transitions(self) -> tp.Dict[T, tp.Callable[..., T]]:
+        return {state: getattr(self.owner, method) for state, method in self.table.methods.items()}
+
+    @property
+    def state(self) -> T:
+        return self.table.decode[self.code]
+
+    @state.setter
+    def state(self, state: T) -> None:
+        self.code = self.table.codes[state]
+
+    @property
+    def previous_state(self) -> T:
+        return self.table.decode[self.previous_code]
+
+    @previous_state.setter
+    def previous_state(self, state: T) -> None:
+        self.previous_code = self.table.codes[state]
+
+    def update(self, *args, **kwargs) -> None:
+        code = self.code
+        self.previous_code = code
+        self.code = self.table.codes[self.handlers[code](self.owner, *args, **kwargs)]
@@ -1,31 +1,64 @@
+import time
 import logging
+import typing as tp
 
 import pygame
 
-from constants import FPS
+from constants import FPS, HITCH_MS
 
+from controls.recording import RecordingControls
 from core.player import Player
 
 from scenes import SceneManager
 from scenes.main_menu import MainMenuScene
 from scenes.game_scene import GameScene
 
+from ui.profiler import ProfilerOverlay
+
 from utils import load_image
+from utils.log import LogBackend
+from utils.preload import Preloader
+from utils.profiler import profiler
+from utils.trace import tracer
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(format='%(asctime)s - %(filename)s - %(levelname)s - %(message)s', filename="game.log", level=logging.DEBUG)
 
 class Game:
-    def __init__(self, title: str, width: int, height: int):
+    def __init__(self, title: str, width: int, height: int, record: tp.Optional[str] = None, trace: tp.Optional[str] = None):
         super().__init__()
 
         # Setup
         self.title = title
         self.width = width
         self.height = height
+        self.record = record
+        self.trace = trace
 
     def run(self):
+        # Log files are written by a background thread, messages logged every frame are throttled
+        self.log = LogBackend("game.log").start()
+        self.log.throttle.limit("core.entity", rate=1)
+        self.log.throttle.limit("core.timestep", rate=1)
+        self.log.throttle.sample("utils.cache", every=100)
+
+        # Whatever happens from here on, the queued log records are written before leaving
+        self.player = None
+        self.preloader = None
+        try:
+            self._setup()
+            self._loop()
+        except Exception:
+            logger.exception("Game crashed")
+            raise
+        finally:
+            self._close()
+
+    def _setup(self):
+        if self.trace:
+            tracer.open(self.trace)
         logger.info("Game launched")
+        self._launched = time.perf_counter()
+        self.first_frame_after = None
 
         # pygame setup
         pygame.init()
@@ -33,21 +66,24 @@ class Game:
         pygame.display.set_caption("Flow Heroes")
         pygame.display.set_icon(load_image("assets/gamekit/2 512x512/2_2.png"))
 
-        # Initialize player
-        self.player = Player()
-
-        # UI setup
-        self.manager = SceneManager(self.screen)
-        main_menu_scene = MainMenuScene(self.manager)
-        game_scene = GameScene(self.manager, self.player)
-        self.manager.add_scene("main_menu", main_menu_scene)
-        self.manager.add_scene("game", game_scene)
+        # Initialize player, logging the inputs for replays if requested
+        controls = None
+        if self.record:
+            controls = RecordingControls(Player.default_controls(), self.record)
+        self.player = Player(controls=controls)
+
+        # Scenes are built when first set, once their assets were decoded in the background
+        self.preloader = Preloader()
+        self.manager = SceneManager(self.screen, self.preloader, keep_alive=1)
+        self.manager.add_scene("main_menu", lambda: MainMenuScene(self.manager), MainMenuScene.manifest())
+        self.manager.add_scene(
+            "game", lambda: GameScene(self.manager, self.player), GameScene.manifest(self.player)
+        )
         self.manager.set_scene("main_menu")
 
-
-        # Run main loop
-        self._loop()
-
+        # F3 shows per stage frame timings
+        self.profiler_overlay = ProfilerOverlay(profiler)
+        self.profiler_overlay.setup()
 
     def _loop(self):
         """Main game loop."""
@@ -55,24 +91,49 @@ class Game:
         running = True
         while running:
             dt = clock.tick(FPS)
+            if dt >= HITCH_MS and self.first_frame_after is not None and self.log.dump(f"{dt} ms frame"):
+                logger.warning(f"{dt} ms frame, recent log records dumped to {self.log.hitch_path}")
 
             # poll for events
             # pygame.QUIT event means the user clicked X to close the window
-            events = pygame.event.get(pygame.QUIT)
+            events = pygame.event.get((pygame.QUIT, pygame.KEYDOWN))
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                     continue
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler_overlay.toggle()
 
             # handle events and update
+            self.player.controls.tick(dt)
             self.manager.handle_events()
-            self.manager.update(dt)
+            with profiler.scope("update"):
+                self.manager.update(dt)
 
             # draw and flip() the display to put everything on screen
-            self.manager.draw()
-            surface = self.player.controls.get_surface()
-            if surface is not None:
-                self.screen.blit(pygame.transform.scale(surface, (self.width / 3, self.height / 3)))
-            pygame.display.flip()
-
-        pygame.quit()
+            with profiler.scope("draw"):
+                self.manager.draw()
+            with profiler.scope("preview"):
+                surface = self.player.controls.get_surface()
+                if surface is not None:
+                    self.screen.blit(pygame.transform.scale(surface, (self.width / 3, self.height / 3)))
+            self.profiler_overlay.draw(self.screen)
+            with profiler.scope("flip"):
+                pygame.display.flip()
+            profiler.end_frame()
+
+            if self.first_frame_after is None:
+                self.first_frame_after = time.perf_counter() - self._launched
+                logger.info(f"First frame after {self.first_frame_after:.2f} s")
+
+    def _close(self):
+        """Release what was set up, however far setting up got"""
+        try:
+            if self.player is not None:
+                self.player.controls.close()
+            if self.preloader is not None:
+                self.preloader.shutdown()
+            pygame.quit()
+        finally:
+            tracer.close()
+            self.log.stop()
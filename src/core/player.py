@@ -1,6 +1,7 @@
 import typing as tp
 
 from controls import Controls
+from controls.hotswap import HotSwapControls
 from controls.recognizer import Recognizer
 from controls.standard import KeyboardMouse
 
@@ -12,7 +13,12 @@ class Player:
     _controls: Controls
     _hero_config: HeroConfig
 
-    def __init__(self, name: str = "player", hero_config: tp.Optional[HeroConfig] = None):
+    def __init__(
+        self,
+        name: str = "player",
+        hero_config: tp.Optional[HeroConfig] = None,
+        controls: tp.Optional[Controls] = None,
+    ):
         self._name = name
         if hero_config:
             self._hero_config = hero_config
@@ -23,11 +29,12 @@ class Player:
                 skills=["Sun Strike"]
             )
 
-        try:
-            self._controls = Recognizer()
-            # raise OSError()
-        except OSError:
-            self._controls = KeyboardMouse()
+        self._controls = controls or Player.default_controls()
+
+    @staticmethod
+    def default_controls() -> Controls:
+        # Keyboard and mouse serve input until the camera and hand model are ready
+        return HotSwapControls(KeyboardMouse(), Recognizer)
 
     def get_inputs(self):
         return self._controls.get_inputs()
@@ -0,0 +1,120 @@
+import os
+import time
+import logging
+import typing as tp
+from dataclasses import dataclass
+
+import pygame
+
+from constants import FPS
+from controls import Controls
+from controls.recording import ReplayControls
+from core.player import Player
+from utils import unregister_atlas
+from utils.profiler import profiler
+from scenes import SceneManager
+from scenes.game_scene import GameScene
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    frames: int
+    simulated_seconds: float
+    drawn: bool
+    wall_seconds: float
+    slowest_frame: float
+
+    @property
+    def speed(self) -> float:
+        """Simulated seconds per wall clock second"""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else float('inf')
+
+    def __str__(self) -> str:
+        return (
+            f"{self.frames} frames ({self.simulated_seconds:.1f} s simulated"
+            f"{', drawn' if self.drawn else ''}) in {self.wall_seconds:.2f} s: "
+            f"{self.speed:.1f}x real time, slowest frame {self.slowest_frame * 1000:.1f} ms"
+        )
+
+
+class Simulation:
+    """
+    Runs the game scene without a window, a camera or a frame rate limit.
+
+    Uses SDL's dummy video and audio drivers unless others were requested
+    through the environment, and plays the given scripted controls. Every
+    frame advances the game by the same `dt`, as fast as the machine allows.
+    """
+
+    def __init__(
+        self,
+        controls: Controls,
+        level: int = 1,
+        dt: int = 1000 // FPS,
+        draw: bool = True,
+        size: tp.Tuple[int, int] = (576 * 2, 324 * 2),
+    ):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        self.screen = pygame.display.set_mode(size)
+
+        self.dt = dt
+        self.draw = draw
+        self.player = Player(controls=controls)
+        self.manager = SceneManager(self.screen)
+        self.scene = GameScene(self.manager, self.player, level)
+        self.manager.add_scene("game", self.scene)
+        self.manager.set_scene("game")
+
+    @property
+    def level(self):
+        return self.scene.level
+
+    def run(self, frames: int) -> SimulationReport:
+        return self.run_frame_times(self.dt for _ in range(frames))
+
+    def replay(self) -> SimulationReport:
+        """Run a recorded session with its own frame times, until the recording ends"""
+        controls = self.player.controls
+        if not isinstance(controls, ReplayControls):
+            raise TypeError("Replaying needs the simulation to be driven by ReplayControls")
+
+        def frame_times():
+            while not controls.finished:
+                yield controls.next_dt
+
+        return self.run_frame_times(frame_times())
+
+    def run_frame_times(self, frame_times: tp.Iterable[int]) -> SimulationReport:
+        """Run one frame per given frame time, in milliseconds"""
+        frames, simulated, slowest = 0, 0, 0.0
+        start = time.perf_counter()
+        for dt in frame_times:
+            frame_start = time.perf_counter()
+
+            # Keep SDL responsive, nothing reads the events
+            pygame.event.pump()
+            self.player.controls.tick(dt)
+            with profiler.scope("update"):
+                self.manager.update(dt)
+            if self.draw:
+                with profiler.scope("draw"):
+                    self.manager.draw()
+            profiler.end_frame()
+
+            frames += 1
+            simulated += dt
+            slowest = max(slowest, time.perf_counter() - frame_start)
+
+        report = SimulationReport(frames, simulated / 1000, self.draw, time.perf_counter() - start, slowest)
+        logger.info(f"Simulated {report}")
+        return report
+
+    def close(self) -> None:
+        # Leave the process as it was found, so that several simulations can run one after the other
+        unregister_atlas(self.level.atlas.name)
+        self.player.controls.close()
+        pygame.quit()
@@ -0,0 +1,45 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frame times rarely add up to an exact multiple of the step in floating point
+_EPSILON = 1e-9
+
+
+class FixedTimestep:
+    """
+    Turns variable frame times into a whole number of fixed simulation steps.
+
+    Leftover time is carried over to the next frame and exposed as ``alpha``,
+    the fraction of a step that rendering should interpolate by. After a
+    hitch at most ``max_steps`` steps are run and the rest of the backlog is
+    dropped, so one slow frame cannot trigger a spiral of ever longer ones.
+    """
+
+    def __init__(self, step: float, max_steps: int):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def advance(self, dt: float) -> int:
+        """Add ``dt`` seconds and return the number of steps to simulate"""
+        self.accumulator += dt
+        steps = min(self._whole_steps(), self.max_steps)
+        self.accumulator = max(0.0, self.accumulator - steps * self.step)
+
+        if self._whole_steps():
+            backlog = self._whole_steps() * self.step
+            self.dropped += backlog
+            self.accumulator = max(0.0, self.accumulator - backlog)
+            logger.debug(f"Dropped {backlog * 1000:.0f} ms of simulation after {steps} catch-up steps")
+
+        return steps
+
+    def _whole_steps(self) -> int:
+        return int(self.accumulator / self.step + _EPSILON)
+
+    @property
+    def alpha(self) -> float:
+        """How far the current frame is between the last two simulation states"""
+        return self.accumulator / self.step
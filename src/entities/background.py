@@ -3,7 +3,9 @@ from core.entity import Entity
 from utils import load_image
 
 class Background(Entity):
+    IMAGE_PATH = "assets/gamekit/Background/Background.png"
+
     def __init__(self, *groups, name='background'):
         super().__init__(*groups, name=name)
-        self.image = load_image("assets/gamekit/Background/Background.png")
+        self.image = load_image(Background.IMAGE_PATH)
         self.rect = self.image.get_rect()
@@ -1,12 +1,15 @@
 import pathlib
-from dataclasses import dataclass
+import typing as tp
+from dataclasses import dataclass, field
 from enum import auto
 
-from core.fsm import FiniteStateMachine, State
+from core.fsm import FSMTable, State
 from core.entity import LivingEntity
 
+from entities.enemies import swarm
+from entities.enemies.swarm import Swarm
 from utils import load_image
-from utils.animation import Animation
+from utils.animation import Animation, FrameSequence
 
 
 class Enemy(LivingEntity):
@@ -26,44 +29,62 @@ class Servant(Enemy):
         IDLE = auto()
         WALK = auto()
 
-    class FSM(FiniteStateMachine):
-        def __init__(self, servant: 'Servant'):
-            super().__init__(
-                Servant.ServantState,
-                {
-                    Servant.ServantState.INIT: servant._state_init,
-                    Servant.ServantState.IDLE: servant._state_idle,
-                    Servant.ServantState.DEAD: servant._state_dead,
-                    Servant.ServantState.HURT: servant._state_hurt,
-                    Servant.ServantState.DEATH: servant._state_death,
-                }
-            )
+    fsm_table = FSMTable(ServantState, {
+        ServantState.INIT: '_state_init',
+        ServantState.IDLE: '_state_idle',
+        ServantState.DEAD: '_state_dead',
+        ServantState.HURT: '_state_hurt',
+        ServantState.DEATH: '_state_death',
+    })
 
-    def __init__(self, image_dir: str, hp: int, atk: int, *groups):
+    def __init__(self, image_dir: str, hp: int, atk: int, *groups, frames=None):
         super().__init__(image_dir, hp, atk, *groups)
-        self._fsm = Servant.FSM(self)
-
-        _load = lambda x: load_image(pathlib.Path(image_dir, x))
-        self.surfaces = {
-            Servant.ServantState.INIT: _load(f"{self.name}.png"),
-            Servant.ServantState.IDLE: _load(f"{self.name}_Idle.png"),
-            Servant.ServantState.HURT: _load(f"{self.name}_Hurt.png"),
-            Servant.ServantState.DEATH: _load(f"{self.name}_Death.png"),
-        }
-        self.image = self.surfaces[Servant.ServantState.INIT]
+        self._fsm = Servant.fsm_table.bind(self)
+
+        self.frames = frames if frames is not None else Servant.load_frames(image_dir)
+        self.image = self.frames[Servant.ServantState.INIT][0]
         self.rect = self.image.get_rect()
         self.animation = None
 
+    @staticmethod
+    def sheet_paths(image_dir: str) -> tp.Dict['Servant.ServantState', pathlib.Path]:
+        name = image_dir.split()[-1]
+        _path = lambda x: pathlib.Path(image_dir, x)
+        return {
+            Servant.ServantState.INIT: _path(f"{name}.png"),
+            Servant.ServantState.IDLE: _path(f"{name}_Idle.png"),
+            Servant.ServantState.HURT: _path(f"{name}_Hurt.png"),
+            Servant.ServantState.DEATH: _path(f"{name}_Death.png"),
+        }
+
+    @staticmethod
+    def load_frames(image_dir: str) -> tp.Dict['Servant.ServantState', FrameSequence]:
+        return {state: FrameSequence(load_image(path)) for state, path in Servant.sheet_paths(image_dir).items()}
+
+    @staticmethod
+    def update_all(servants: tp.Sequence['Servant'], dt: int) -> None:
+        """Same as updating each servant, with their state machines stepped in one batch"""
+        Servant.fsm_table.step([servant.fsm for servant in servants], dt=dt, inputs=())
+        for servant in servants:
+            servant.rect.center = servant.body.position
+
+    def hurt(self, dmg: int) -> None:
+        """Take damage and play the hurt animation, dying afterwards if out of hp"""
+        if self.fsm.state in (Servant.ServantState.DEATH, Servant.ServantState.DEAD):
+            return
+        self._hp -= dmg
+        self.fsm.state = self._enter(Servant.ServantState.HURT, repeat=False)
+
+    def _enter(self, state: 'Servant.ServantState', repeat: bool = True) -> 'Servant.ServantState':
+        # Transitions see previous_state equal to state, so each animation is started by the change to its state
+        self.animation = Animation(self.frames[state], repeat=repeat)
+        self.image = self.animation.start()
+        return state
+
     def _state_init(self, *args, **kwargs):
-        self.animation = Animation(self.surfaces[Servant.ServantState.IDLE])
-        return Servant.ServantState.IDLE
+        return self._enter(Servant.ServantState.IDLE)
 
     def _state_idle(self, *args, **kwargs):
-        if self.fsm.state != self.fsm.previous_state:
-            self.animation = Animation(self.surfaces[self.fsm.state])
-            self.image = self.animation.start()
-            return Servant.ServantState.IDLE
-
         self.image = self.animation.update(kwargs['dt'])
         return Servant.ServantState.IDLE
 
@@ -71,30 +92,21 @@ class Servant(Enemy):
         return Servant.ServantState.DEAD
 
     def _state_hurt(self, *args, **kwargs):
-        if self.fsm.state != self.fsm.previous_state:
-            self.animation = Animation(self.surfaces[self.fsm.state], repeat=False)
-            self.image = self.animation.start()
-            return Servant.ServantState.HURT
-
         self.image = self.animation.update(kwargs['dt'])
         if not self.animation.ended:
             return Servant.ServantState.HURT
 
         if self._hp > 0:
-            return Servant.ServantState.IDLE
-        return Servant.ServantState.DEATH
+            return self._enter(Servant.ServantState.IDLE)
+        return self._enter(Servant.ServantState.DEATH, repeat=False)
 
     def _state_death(self, *args, **kwargs):
-        if self.fsm.state != self.fsm.previous_state:
-            self.animation = Animation(self.surfaces[self.fsm.state], repeat=False)
-            self.image = self.animation.start()
-            return Servant.ServantState.DEATH
-
         self.image = self.animation.update(kwargs['dt'])
 
         if self.animation.ended:
             self.kill()
             return Servant.ServantState.DEAD
+        return Servant.ServantState.DEATH
 
 class Warrior(Enemy):
     """Regular enemy."""
@@ -113,13 +125,38 @@ class ServantFactory:
     image_dir: str
     hp: int
     atk: int
+    frames: tp.Optional[tp.Dict[Servant.ServantState, FrameSequence]] = field(default=None, init=False)
+
+    def sheet_paths(self) -> tp.List[pathlib.Path]:
+        return list(Servant.sheet_paths(self.image_dir).values())
+
+    def load_frames(self) -> tp.Dict[Servant.ServantState, FrameSequence]:
+        if self.frames is None:
+            self.frames = Servant.load_frames(self.image_dir)
+        return self.frames
 
     def create(self, *groups):
+        self.load_frames()
         return Servant(
             self.image_dir,
             self.hp,
             self.atk,
             *groups,
+            frames=self.frames,
+        )
+
+    def create_swarm(self, capacity: int = 256) -> Swarm:
+        """An empty swarm of these servants, sharing their frames"""
+        frames = self.load_frames()
+        return Swarm(
+            {
+                swarm.IDLE: frames[Servant.ServantState.IDLE],
+                swarm.HURT: frames[Servant.ServantState.HURT],
+                swarm.DEATH: frames[Servant.ServantState.DEATH],
+            },
+            self.hp,
+            self.atk,
+            capacity,
         )
 
 BAT = ServantFactory("assets/gamekit/1 Bat", 15, 5)
\ No newline at end of file
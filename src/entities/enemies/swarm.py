@@ -0,0 +1,195 @@
+import math
+import typing as tp
+import logging
+
+import numpy as np
+from pygame import Surface
+from pygame.sprite import Sprite
+
+from constants import FPS
+from utils.animation import FrameSequence
+
+logger = logging.getLogger(__name__)
+
+# Integer state codes, shared by every member of a swarm
+DEAD = 0
+IDLE = 1
+HURT = 2
+DEATH = 3
+
+
+class Swarm:
+    """
+    Homogeneous enemies stored as a struct of arrays instead of one sprite each.
+
+    Members follow the servant life cycle: they idle in a loop, play the hurt
+    animation once when hit, and play the death animation once when out of hp.
+    All of them are updated with a handful of array operations per frame and
+    drawn with a single ``Surface.fblits`` call.
+
+    Members fly, they do not take part in the physics simulation. They only
+    stop moving along an axis when a step would take them into one of the
+    `obstacles`, rects given as (left, top, right, bottom) rows.
+    """
+    positions: np.ndarray
+    velocities: np.ndarray
+    hp: np.ndarray
+    states: np.ndarray
+    millis: np.ndarray
+    obstacles: np.ndarray
+
+    def __init__(
+        self,
+        frames: tp.Dict[int, FrameSequence],
+        hp: int,
+        atk: int,
+        capacity: int = 256,
+        fpf: int = FPS // 4,
+    ):
+        self.max_hp = hp
+        self.atk = atk
+        self._fpf = fpf
+
+        # One flat frame list, indexed by the first frame of each state plus the animation frame
+        self._frames: tp.List[Surface] = []
+        self._first_frame = np.zeros(DEATH + 1, dtype=np.int32)
+        self._frame_count = np.ones(DEATH + 1, dtype=np.int32)
+        for state, sequence in frames.items():
+            self._first_frame[state] = len(self._frames)
+            self._frame_count[state] = len(sequence)
+            self._frames.extend(sequence)
+        self.size = np.array(frames[IDLE][0].get_size())
+
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.states = np.full(capacity, DEAD, dtype=np.int8)
+        self.millis = np.zeros(capacity, dtype=np.int32)
+        self.obstacles = np.zeros((0, 4))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.states))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.states)
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.states != DEAD
+
+    def spawn(self, positions, velocities=None) -> np.ndarray:
+        """Add members at `positions` and return their indices"""
+        positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+        free = np.flatnonzero(self.states == DEAD)
+        if len(free) < len(positions):
+            self._grow(len(positions) - len(free))
+            free = np.flatnonzero(self.states == DEAD)
+
+        indices = free[:len(positions)]
+        self.positions[indices] = positions
+        self.velocities[indices] = 0 if velocities is None else velocities
+        self.hp[indices] = self.max_hp
+        self.states[indices] = IDLE
+        self.millis[indices] = 0
+        return indices
+
+    def hit(self, indices, dmg: int) -> None:
+        """Damage living members, which then play their hurt animation"""
+        indices = np.asarray(indices)
+        indices = indices[(self.states[indices] == IDLE) | (self.states[indices] == HURT)]
+        self.hp[indices] -= dmg
+        self.states[indices] = HURT
+        self.millis[indices] = 0
+
+    def collide(self, sprites: tp.Sequence[Sprite]) -> tp.Iterator[tp.Tuple[Sprite, tp.List[int]]]:
+        """Pairs of each sprite and the indices of the living members its rect overlaps, for overlapping ones"""
+        indices = np.flatnonzero(self.alive)
+        if not len(indices) or not sprites:
+            return
+
+        rects = np.array([(s.rect.left, s.rect.top, s.rect.right, s.rect.bottom) for s in sprites])
+        overlaps = self._overlaps(self.positions[indices], rects).T
+        for i in np.flatnonzero(overlaps.any(axis=1)).tolist():
+            yield sprites[i], indices[overlaps[i]].tolist()
+
+    def nearest(self, point: tp.Tuple[float, float], max_distance: float = math.inf) -> tp.Optional[int]:
+        """Living member whose rect is closest to `point`, if closer than `max_distance`"""
+        indices = np.flatnonzero(self.alive)
+        if not len(indices):
+            return None
+
+        gap = np.maximum(np.abs(self.positions[indices] - point) - self.size / 2, 0)
+        distances = np.hypot(gap[:, 0], gap[:, 1])
+        best = int(np.argmin(distances))
+        if distances[best] >= max_distance:
+            return None
+        return int(indices[best])
+
+    def midbottom(self, index: int) -> tp.Tuple[float, float]:
+        x, y = self.positions[index]
+        return float(x), float(y + self.size[1] / 2)
+
+    def update(self, dt: int) -> None:
+        alive = self.alive
+        moving = np.flatnonzero(alive & self.velocities.any(axis=1))
+        if len(moving):
+            self._move(moving, dt / 1000)
+        self.millis[alive] += dt
+
+        # Animations last one second: idling loops, hurt and death play once
+        ended = alive & (self.millis >= 1000)
+        idle = ended & (self.states == IDLE)
+        self.millis[idle] %= 1000
+
+        died = ended & (self.states == DEATH)
+        self.states[died] = DEAD
+
+        hurt = ended & (self.states == HURT)
+        self.states[hurt] = np.where(self.hp[hurt] > 0, IDLE, DEATH)
+        self.millis[hurt] = 0
+
+    def frame_indices(self, indices: np.ndarray) -> np.ndarray:
+        states = self.states[indices]
+        frame = (FPS * self.millis[indices]) // (self._fpf * 1000)
+        return self._first_frame[states] + np.minimum(frame, self._frame_count[states] - 1)
+
+    def draw(self, surface: Surface, offset=(0, 0)) -> None:
+        # Only members overlapping the surface are blitted
+        topleft = self.positions - self.size / 2 + offset
+        visible = self.alive & (topleft > -self.size).all(axis=1) & (topleft < surface.get_size()).all(axis=1)
+        indices = np.flatnonzero(visible)
+        if not len(indices):
+            return
+
+        topleft = topleft[indices].astype(np.int32)
+        frames = self._frames
+        surface.fblits([(frames[i], p) for i, p in zip(self.frame_indices(indices).tolist(), topleft.tolist())])
+
+    def _overlaps(self, positions: np.ndarray, rects: np.ndarray) -> np.ndarray:
+        # (members, rects) matrix of whether the rect of a member centered at each position overlaps each rect
+        low = positions - self.size / 2
+        high = positions + self.size / 2
+        rects = np.atleast_2d(rects)
+        return (
+            (low[:, None, 0] < rects[None, :, 2]) & (high[:, None, 0] > rects[None, :, 0])
+            & (low[:, None, 1] < rects[None, :, 3]) & (high[:, None, 1] > rects[None, :, 1])
+        )
+
+    def _move(self, indices: np.ndarray, seconds: float) -> None:
+        # Each axis is moved on its own, so that members blocked along one keep sliding along the other
+        for axis in (0, 1):
+            moved = self.positions[indices]
+            moved[:, axis] += self.velocities[indices, axis] * seconds
+            blocked = self._overlaps(moved, self.obstacles).any(axis=1)
+            self.positions[indices[~blocked], axis] = moved[~blocked, axis]
+            self.velocities[indices[blocked], axis] = 0
+
+    def _grow(self, at_least: int) -> None:
+        extra = max(at_least, self.capacity)
+        logger.debug(f"Growing swarm from {self.capacity} to {self.capacity + extra} members")
+        self.positions = np.concatenate([self.positions, np.zeros((extra, 2))])
+        self.velocities = np.concatenate([self.velocities, np.zeros((extra, 2))])
+        self.hp = np.concatenate([self.hp, np.zeros(extra, dtype=self.hp.dtype)])
+        self.states = np.concatenate([self.states, np.full(extra, DEAD, dtype=self.states.dtype)])
+        self.millis = np.concatenate([self.millis, np.zeros(extra, dtype=self.millis.dtype)])
@@ -8,9 +8,9 @@ import pygame.event
 
 from controls import Input
 from core.entity import LivingEntity
-from core.fsm import State, FiniteStateMachine
+from core.fsm import State, FSMTable
 from utils import load_image
-from utils.animation import Animation
+from utils.animation import Animation, FrameSequence
 
 logger = logging.getLogger(__name__)
 
@@ -47,18 +47,13 @@ class Hero(LivingEntity):
         WALK = auto()
         WALK_ATTACK = auto()
 
-    class HeroFSM(FiniteStateMachine):
-        def __init__(self, hero: 'Hero'):
-            super().__init__(
-                Hero.HeroState,
-                {
-                    Hero.HeroState.INIT: hero._state_init,
-                    Hero.HeroState.IDLE: hero._state_idle,
-                    Hero.HeroState.DEAD: hero._state_dead,
-                    Hero.HeroState.WALK: hero._state_walk,
-                    Hero.HeroState.JUMP: hero._state_jump,
-                }
-            )
+    fsm_table = FSMTable(HeroState, {
+        HeroState.INIT: '_state_init',
+        HeroState.IDLE: '_state_idle',
+        HeroState.DEAD: '_state_dead',
+        HeroState.WALK: '_state_walk',
+        HeroState.JUMP: '_state_jump',
+    })
 
     def __init__(self, hero_config: HeroConfig, *groups):
         image_dir = hero_config.hero_skin.value
@@ -66,32 +61,41 @@ class Hero(LivingEntity):
 
         super().__init__(*groups, name=name)
 
-        self._fsm = Hero.HeroFSM(self)
-
-        self.surfaces = {
-            Hero.HeroState.INIT: load_image(os.path.join(image_dir, f"{name}.png")),
-            Hero.HeroState.ATTACK1: load_image(os.path.join(image_dir, f"{name}_Attack1_4.png")),
-            Hero.HeroState.ATTACK2: load_image(os.path.join(image_dir, f"{name}_Attack2_6.png")),
-            Hero.HeroState.CLIMB: load_image(os.path.join(image_dir, f"{name}_Climb_4.png")),
-            Hero.HeroState.DEATH: load_image(os.path.join(image_dir, f"{name}_Death_8.png")),
-            Hero.HeroState.HURT: load_image(os.path.join(image_dir, f"{name}_Hurt_4.png")),
-            Hero.HeroState.IDLE: load_image(os.path.join(image_dir, f"{name}_Idle_4.png")),
-            Hero.HeroState.JUMP: load_image(os.path.join(image_dir, f"{name}_Jump_8.png")),
-            Hero.HeroState.PUSH: load_image(os.path.join(image_dir, f"{name}_Push_6.png")),
-            Hero.HeroState.RUN: load_image(os.path.join(image_dir, f"{name}_Run_6.png")),
-            Hero.HeroState.THROW: load_image(os.path.join(image_dir, f"{name}_Throw_4.png")),
-            Hero.HeroState.WALK_ATTACK: load_image(os.path.join(image_dir, f"{name}_Walk+Attack_6.png")),
-            Hero.HeroState.WALK: load_image(os.path.join(image_dir, f"{name}_Walk_6.png")),
+        self._fsm = Hero.fsm_table.bind(self)
+
+        self.frames = {
+            state: FrameSequence(load_image(path)) for state, path in Hero.sheet_paths(hero_config).items()
         }
-        self.image = self.surfaces[Hero.HeroState.INIT]
+        self.image = self.frames[Hero.HeroState.INIT][0]
         self.rect = self.image.get_rect()
         self.animation = None
 
-    def _physics_update(self, *args, **kwargs):
+    @staticmethod
+    def sheet_paths(hero_config: HeroConfig) -> tp.Dict['Hero.HeroState', str]:
+        image_dir = hero_config.hero_skin.value
+        name = image_dir.split()[-1]
+        _path = lambda x: os.path.join(image_dir, x)
+        return {
+            Hero.HeroState.INIT: _path(f"{name}.png"),
+            Hero.HeroState.ATTACK1: _path(f"{name}_Attack1_4.png"),
+            Hero.HeroState.ATTACK2: _path(f"{name}_Attack2_6.png"),
+            Hero.HeroState.CLIMB: _path(f"{name}_Climb_4.png"),
+            Hero.HeroState.DEATH: _path(f"{name}_Death_8.png"),
+            Hero.HeroState.HURT: _path(f"{name}_Hurt_4.png"),
+            Hero.HeroState.IDLE: _path(f"{name}_Idle_4.png"),
+            Hero.HeroState.JUMP: _path(f"{name}_Jump_8.png"),
+            Hero.HeroState.PUSH: _path(f"{name}_Push_6.png"),
+            Hero.HeroState.RUN: _path(f"{name}_Run_6.png"),
+            Hero.HeroState.THROW: _path(f"{name}_Throw_4.png"),
+            Hero.HeroState.WALK_ATTACK: _path(f"{name}_Walk+Attack_6.png"),
+            Hero.HeroState.WALK: _path(f"{name}_Walk_6.png"),
+        }
+
+    def _physics_update(self, inputs: tp.Sequence[Input]) -> None:
         velocity_x, velocity_y = 0, self.body.velocity[1]
-        if Input.RIGHT in kwargs['inputs']:
+        if Input.RIGHT in inputs:
             velocity_x = 128
-        elif Input.LEFT in kwargs['inputs']:
+        elif Input.LEFT in inputs:
             velocity_x = -128
 
         # if Input.UP in kwargs['inputs'] and self._fsm.state != Hero.HeroState.JUMP:
@@ -101,16 +105,15 @@ class Hero(LivingEntity):
         self.body.velocity = velocity_x, velocity_y
 
 
-    def update(self, *args, **kwargs):
+    def update(self, dt: int, inputs: tp.Sequence[Input] = ()) -> None:
         old_state = self._fsm.state
-        super().update(*args, **kwargs)
+        super().update(dt, inputs)
 
         if old_state == self._fsm.state:
-            self.image = self.animation.update(kwargs['dt'])
+            self.image = self.animation.update(dt, self._flip)
         else:
-            self.animation = Animation(self.surfaces[self._fsm.state])
-            self.image = self.animation.start()
-        self.image = pygame.transform.flip(self.image, self._flip, False)
+            self.animation = Animation(self.frames[self._fsm.state])
+            self.image = self.animation.start(self._flip)
 
     def process(self):
         state = Hero.HeroState.IDLE
@@ -1,44 +1,73 @@
+import typing as tp
 from abc import abstractmethod
 from enum import auto
 
 from pygame import Vector2
 
-from core.fsm import State, FiniteStateMachine
+from controls import Input
+from core.fsm import State, FSMTable
 from core.entity import Entity
 
 from utils.animation import Animation
 
+if tp.TYPE_CHECKING:
+    from entities.spells.pool import SpellPool
+
 
 class Spell(Entity):
     class SpellState(State):
         ACTIVE = auto()
 
-    class FSM(FiniteStateMachine):
-        def __init__(self, spell: 'Spell'):
-            super().__init__(
-                Spell.SpellState,
-                {
-                    Spell.SpellState.DEAD: spell._state_dead,
-                    Spell.SpellState.INIT: spell._state_init,
-                    Spell.SpellState.ACTIVE: spell._state_active,
-                }
-            )
-
-    def __init__(self, animation: Animation, *groups, name: str = "spell", dmg: int = 10, pos: Vector2 = (0, 0)):
-        super().__init__(*groups, name=name)
-        self._fsm = Spell.FSM(self)
+    fsm_table = FSMTable(SpellState, {
+        SpellState.DEAD: '_state_dead',
+        SpellState.INIT: '_state_init',
+        SpellState.ACTIVE: '_state_active',
+    })
+
+    def __init__(self,
+        animation: Animation,
+        *groups,
+        name: str = "spell",
+        dmg: int = 10,
+        pos: Vector2 = (0, 0),
+        pool: tp.Optional['SpellPool'] = None
+    ):
+        super().__init__(name=name)
+        self._fsm = Spell.fsm_table.bind(self)
         self._animation = animation
         self._dmg = dmg
+        self._pool = pool
+        self.spawn(*groups, pos=pos)
+
+    def spawn(self, *groups, pos: Vector2 = (0, 0)) -> None:
+        """Bring the spell (back) to life at `pos`, restarting its state machine and animation"""
+        self._fsm.state = self._fsm.previous_state = Spell.SpellState.INIT
+        self._hit = set()
         self.image = self._animation.start()
         self.rect = self.image.get_rect(midbottom=pos)
+        self.add(*groups)
+
+    def kill(self):
+        # Only a live spell goes back to its pool, so killing it twice cannot hand it out twice
+        alive = self.alive()
+        super().kill()
+        if alive and self._pool is not None:
+            self._pool.release(self)
 
     @property
     def dmg(self):
         return self._dmg
 
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
-        self.image = self._animation.update(kwargs['dt'])
+    def hit(self, target) -> bool:
+        """Whether the spell damages `target` now, each target is only damaged once per cast"""
+        if not self.alive() or target in self._hit:
+            return False
+        self._hit.add(target)
+        return True
+
+    def update(self, dt: int, inputs: tp.Sequence[Input] = ()) -> None:
+        super().update(dt, inputs)
+        self.image = self._animation.update(dt)
 
     @abstractmethod
     def _state_init(self, *args, **kwargs):
@@ -67,8 +96,10 @@ class InstantSpell(Spell):
 
 class TrickSpell(Spell):
     def _state_init(self, *args, **kwargs):
-        # TODO wait for collision
-        return self.SpellState.ACTIVE
+        # Lies in wait until the level reports a first collision
+        if self._hit:
+            return self.SpellState.ACTIVE
+        return self.SpellState.INIT
 
     def _state_dead(self, *args, **kwargs):
         return self.SpellState.DEAD
@@ -83,14 +114,27 @@ class ProjectileSpell(Spell):
         name: str = "projectile_spell",
         dmg: int = 10,
         pos: Vector2 = (0, 0),
-        direction: Vector2 = Vector2(0, 0)
+        direction: Vector2 = Vector2(0, 0),
+        pool: tp.Optional['SpellPool'] = None
     ):
-        super().__init__(animation, *groups, name=name, dmg=dmg, pos=pos)
         self._direction = direction
+        super().__init__(animation, *groups, name=name, dmg=dmg, pos=pos, pool=pool)
+
+    def spawn(self, *groups, pos: Vector2 = (0, 0), direction: tp.Optional[Vector2] = None) -> None:
+        if direction is not None:
+            self._direction = direction
+        super().spawn(*groups, pos=pos)
+
+    def update(self, dt: int, inputs: tp.Sequence[Input] = ()) -> None:
+        super().update(dt, inputs)
+        self.rect.move_ip(self._direction[0] * dt, self._direction[1] * dt)
 
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
-        self.rect.move_ip(self._direction[0] * kwargs['dt'], self._direction[1] * kwargs['dt'])
+    def hit(self, target) -> bool:
+        # A projectile is spent on the first target it reaches
+        if not super().hit(target):
+            return False
+        self.kill()
+        return True
 
     def _state_init(self, *args, **kwargs):
         return self.SpellState.ACTIVE
@@ -99,7 +143,7 @@ class ProjectileSpell(Spell):
         return self.SpellState.DEAD
 
     def _state_active(self, *args, **kwargs):
-        # TODO wait for collision
+        # Collisions are resolved by the level, which kills the projectile on hit
         return self.SpellState.ACTIVE
 
 
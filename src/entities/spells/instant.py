@@ -1,31 +1,35 @@
-from dataclasses import dataclass, field, InitVar
-
-from pygame import Surface
+import typing as tp
+from dataclasses import dataclass, field
 
 from entities.spells import InstantSpell
+from entities.spells.pool import SpellPool
 
 from utils import load_image
-from utils.animation import Animation
+from utils.animation import Animation, FrameSequence
 
 
 @dataclass
 class InstantSpellFactory:
-    image_path: InitVar[str]
-    surface: Surface = field(init=False)
+    image_path: str
     name: str = "instant_spell"
     dmg: int = 10
+    frames: tp.Optional[FrameSequence] = field(default=None, init=False)
+    pool: SpellPool[InstantSpell] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.pool = SpellPool(self._build)
 
-    def __post_init__(self, image_path: str):
-        self.surface = load_image(image_path)
+    def _build(self, pool: SpellPool[InstantSpell]) -> InstantSpell:
+        # Frames are sliced on first use, so that a level atlas can provide the sheet
+        if self.frames is None:
+            self.frames = FrameSequence(load_image(self.image_path))
+        return InstantSpell(Animation(self.frames, repeat=False), name=self.name, dmg=self.dmg, pool=pool)
 
     def create(self, *groups, pos=(0, 0)):
-        return InstantSpell(
-            Animation(self.surface.copy(), repeat=False),
-            *groups,
-            name=self.name,
-            dmg=self.dmg,
-            pos=pos
-        )
+        # Dead spells are recycled, only their position and state are reset
+        spell = self.pool.acquire()
+        spell.spawn(*groups, pos=pos)
+        return spell
 
 
 SUN_STRIKE = InstantSpellFactory("assets/gamekit/4 Sun strike/Sun-strike.png")
\ No newline at end of file
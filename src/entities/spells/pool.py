@@ -0,0 +1,56 @@
+import typing as tp
+from dataclasses import dataclass
+
+if tp.TYPE_CHECKING:
+    from entities.spells import Spell
+
+S = tp.TypeVar('S', bound='Spell')
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    created: int
+    reused: int
+    released: int
+    free: int
+
+    @property
+    def hit_rate(self) -> float:
+        acquired = self.created + self.reused
+        return self.reused / acquired if acquired else 0.0
+
+
+class SpellPool(tp.Generic[S]):
+    """Free list of dead spells that are handed out again instead of building new ones."""
+    _free: tp.List[S]
+
+    def __init__(self, build: tp.Callable[['SpellPool[S]'], S]):
+        self._build = build
+        self._free = []
+        self._created = 0
+        self._reused = 0
+        self._released = 0
+
+    def acquire(self) -> S:
+        """Return a dead spell, building a new one only when none is free."""
+        if self._free:
+            self._reused += 1
+            return self._free.pop()
+
+        self._created += 1
+        return self._build(self)
+
+    def release(self, spell: S) -> None:
+        self._released += 1
+        self._free.append(spell)
+
+    def clear(self) -> None:
+        self._free.clear()
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            created=self._created,
+            reused=self._reused,
+            released=self._released,
+            free=len(self._free),
+        )
@@ -1,32 +1,35 @@
-from dataclasses import dataclass, field, InitVar
-
-from pygame import Surface
+import typing as tp
+from dataclasses import dataclass, field
 
 from entities.spells import ProjectileSpell
+from entities.spells.pool import SpellPool
 
 from utils import load_image
-from utils.animation import Animation
+from utils.animation import Animation, FrameSequence
 
 
 @dataclass
 class ProjectileSpellFactory:
-    image_path: InitVar[str]
-    surface: Surface = field(init=False)
+    image_path: str
     name: str = "projectile_spell"
     dmg: int = 10
+    frames: tp.Optional[FrameSequence] = field(default=None, init=False)
+    pool: SpellPool[ProjectileSpell] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.pool = SpellPool(self._build)
 
-    def __post_init__(self, image_path: str):
-        self.surface = load_image(image_path)
+    def _build(self, pool: SpellPool[ProjectileSpell]) -> ProjectileSpell:
+        # Frames are sliced on first use, so that a level atlas can provide the sheet
+        if self.frames is None:
+            self.frames = FrameSequence(load_image(self.image_path))
+        return ProjectileSpell(Animation(self.frames, repeat=False), name=self.name, dmg=self.dmg, pool=pool)
 
     def create(self, *groups, pos=(0, 0), direction=(1,0)):
-        return ProjectileSpell(
-            Animation(self.surface.copy(), repeat=False),
-            *groups,
-            name=self.name,
-            dmg=self.dmg,
-            pos=pos,
-            direction=direction
-        )
+        # Dead spells are recycled, only their position and state are reset
+        spell = self.pool.acquire()
+        spell.spawn(*groups, pos=pos, direction=direction)
+        return spell
 
 
 FIREBALL = ProjectileSpellFactory("assets/gamekit/10 Fire ball/Fire-ball.png")
\ No newline at end of file
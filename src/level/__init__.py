@@ -1,76 +1,168 @@
+import math
 import pathlib
+import typing as tp
 
+import numpy as np
 from pygame import Surface
 from pygame.sprite import Group
 import pymunk.pygame_util
-from pymunk import Space, Poly, Body
+from pymunk import Space, Poly
 
 from controls import Input
+from core.entity import BodyRegistry
 from core.player import Player
+from core.timestep import FixedTimestep
 
-from entities.enemies import BAT
+from entities.enemies import BAT, Servant
 from entities.hero import Hero
-from entities.tile import Tile
 from entities.spells.instant import SUN_STRIKE
+from level.bundle import load_level
+from level.renderer import TileLayerRenderer
+from level.geometry import StaticGeometry
 
-from utils import load_tiled_map
-from constants import G
+from utils import register_atlas
+from utils.atlas import build_atlas
+from utils.preload import AssetManifest
+from utils.profiler import profiler
+from utils.spatial import SpatialHash, collide, rect_distance
+from constants import G, PHYSICS_STEP, MAX_PHYSICS_STEPS
 
 _BASE_DIR = "assets/levels"
 _levels = ["test_level.tmx"]
-_load = lambda n: load_tiled_map(pathlib.Path(_BASE_DIR, _levels[n]))
+_load = lambda n: load_level(pathlib.Path(_BASE_DIR, _levels[n]))
 
 class Level:
     def __init__(self, n: int, player: Player):
-        # Load map
-        tiled_map = _load(n)
-        self.tiled_map = tiled_map
+        # Load the compiled map
+        bundle = _load(n)
+        self.bundle = bundle
         self.player = player
 
+        # Pack the sprite sheets used by the level entities into an atlas, unless preloading did already
+        self.atlas = Level._build_atlas(n, player)
+        register_atlas(self.atlas)
+
         # Setup physics
         self.space = Space()
         self.space.gravity = 0, G
         pymunk.pygame_util.positive_y_is_up = False
+        self.timestep = FixedTimestep(PHYSICS_STEP, MAX_PHYSICS_STEPS)
+        self.bodies = BodyRegistry(self.space)
 
-        # Static objects group
-        self.static = Group()
+        # Static tile layers are baked once and drawn chunk by chunk
+        self.tiles = TileLayerRenderer.from_bundle(bundle, ["ground"])
 
-        for x, y, surf in tiled_map.get_layer_by_name("ground").tiles():
-            tile = Tile.create_tile(x * 64, y * 64, surf, self.static)
-            tile.body.body_type = Body.STATIC
-            tile.body.position = tile.rect.center
-            shape = Poly.create_box(tile.body, tile.rect.size)
-            self.space.add(tile.body, shape)
+        # Static collision geometry, merged into as few shapes as possible when the level was compiled
+        self.geometry = StaticGeometry(
+            self.space, bundle.geometry["ground"].tolist(), self.tiles.tile_width, self.tiles.tile_height, "ground"
+        )
 
         # Dynamic object group
         self.dynamic = Group()
 
-        hero_meta = tiled_map.get_object_by_name("hero")
+        hero_x, hero_y = bundle.spawn("hero")
         hero = Hero(player.hero_config, self.dynamic)
-        hero.body.position = (hero_meta.x * 2, hero_meta.y * 2)
+        self.hero = hero
+        hero.body.position = (hero_x * 2, hero_y * 2)
         shape = Poly.create_box(hero.body, hero.rect.size)
         shape.mass = 10
-        self.space.add(hero.body, shape)
+        self.bodies.register(hero, shape)
 
         self.enemies = Group()
-        for enemy in tiled_map.get_layer_by_name("enemies"):
+        self.spells = Group()
+        for x, y in bundle.spawns("enemies").tolist():
             bat = BAT.create(self.dynamic, self.enemies)
-            bat.body.position = (enemy.x * 2, enemy.y * 2)
+            bat.body.position = (x * 2, y * 2)
             shape = Poly.create_box(bat.body, bat.rect.size)
             shape.mass = 100000
-            self.space.add(bat.body, shape)
+            self.bodies.register(bat, shape)
+
+        # Enemies indexed by position, for targeting and hit detection
+        self.enemy_index = SpatialHash()
+        self.enemy_index.sync(self.enemies)
+
+        # Large groups of enemies are simulated in bulk rather than as sprites
+        self.swarm = BAT.create_swarm()
+        self.swarm.obstacles = np.array(self.geometry.bounds, dtype=np.float64).reshape(-1, 4)
+        self.swarm.spawn(bundle.spawns("swarm") * 2)
+
+        # Nothing has moved yet, so there is nothing to interpolate from
+        self.bodies.flush()
+        for entity in self.bodies:
+            entity.save_position()
+
+    @staticmethod
+    def _sheet_paths(player: Player):
+        return [*Hero.sheet_paths(player.hero_config).values(), *BAT.sheet_paths(), SUN_STRIKE.image_path]
+
+    @staticmethod
+    def _build_atlas(n: int, player: Player):
+        return build_atlas(f"level_{n}", Level._sheet_paths(player))
+
+    @staticmethod
+    def manifest(n: int, player: Player) -> AssetManifest:
+        """Atlas of the sprite sheets of level `n`, and compiling it if its bundle is outdated"""
+        return AssetManifest(
+            tasks=(
+                (f"atlas_level_{n}", lambda: Level._build_atlas(n, player)),
+                (f"level_{n}", lambda: _load(n)),
+            ),
+        )
 
     def draw(self, surface: Surface):
-        self.static.draw(surface)
-        self.dynamic.draw(surface)
+        with profiler.scope("tiles"):
+            self.tiles.draw(surface)
+
+        # Physical entities are drawn between their last two physics states
+        with profiler.scope("sprites"):
+            alpha = self.timestep.alpha
+            surface.fblits([(sprite.image, sprite.render_rect(alpha)) for sprite in self.dynamic])
+            self.swarm.draw(surface)
 
     def update(self, dt: int) -> None:
-        self.space.step(dt / 1000)
+        with profiler.scope("physics"):
+            for _ in range(self.timestep.advance(dt / 1000)):
+                for entity in self.bodies:
+                    entity.save_position()
+                self.space.step(self.timestep.step)
 
-        player_inputs = self.player.get_inputs()
+        with profiler.scope("inputs"):
+            player_inputs = self.player.get_inputs()
 
         if Input.SUN_STRIKE in player_inputs:
-            SUN_STRIKE.create(self.dynamic, pos=self.enemies.sprites()[0].rect.midbottom)
-
-        self.dynamic.update(dt=dt, inputs=player_inputs)
-
+            target = self._nearest_enemy(self.hero.rect.center)
+            if target is not None:
+                SUN_STRIKE.create(self.dynamic, self.spells, pos=target)
+
+        with profiler.scope("entities"):
+            self.hero.update(dt, player_inputs)
+            self.spells.update(dt)
+            Servant.update_all(self.enemies.sprites(), dt)
+        with profiler.scope("swarm"):
+            self.swarm.update(dt)
+
+        # Spells damage the enemies they overlap
+        with profiler.scope("collisions"):
+            self.enemy_index.sync(self.enemies)
+            for spell, targets in collide(self.spells, self.enemy_index):
+                for enemy in targets:
+                    if spell.hit(enemy):
+                        enemy.hurt(spell.dmg)
+
+            # Swarm members are told apart by their slot
+            for spell, members in self.swarm.collide(self.spells.sprites()):
+                members = [i for i in members if spell.hit((self.swarm, i))]
+                if members:
+                    self.swarm.hit(members, spell.dmg)
+
+        # Bodies of entities spawned or killed this frame enter or leave the space between steps
+        self.bodies.flush()
+
+    def _nearest_enemy(self, point: tp.Tuple[float, float]) -> tp.Optional[tp.Tuple[float, float]]:
+        """Bottom middle of the enemy closest to `point`, a sprite or a swarm member"""
+        enemy = self.enemy_index.nearest(point)
+        distance = math.inf if enemy is None else rect_distance(enemy.rect, point)
+        member = self.swarm.nearest(point, distance)
+        if member is not None:
+            return self.swarm.midbottom(member)
+        return None if enemy is None else enemy.rect.midbottom
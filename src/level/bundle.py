@@ -0,0 +1,249 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import pathlib
+import logging
+import typing as tp
+from xml.etree import ElementTree
+
+import numpy as np
+import pytmx
+
+from constants import CACHE_ROOT, PROJECT_ROOT
+from level.geometry import merge_tiles
+from utils import load_tiles
+from utils.vfs import asset_fs
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = os.path.join(CACHE_ROOT, "levels")
+_VERSION = 1
+
+# Magic, format version and length of the JSON header that follows
+_PREAMBLE = struct.Struct("<4sII")
+_MAGIC = b"FHLV"
+_ALIGNMENT = 16
+
+# Tileset image, rect within it (None for whole images), flip flags, colorkey and pixelalpha of a tile
+TileRef = tp.Tuple[str, tp.Optional[tp.Tuple[int, int, int, int]], tp.Optional[tp.Tuple[bool, bool, bool]], tp.Optional[str], bool]
+
+
+class LevelBundle:
+    """
+    A level compiled from a Tiled map, read straight from a memory-mapped file.
+
+    Tile layers are grids of indices into `tiles`, 0 being empty. Their solid
+    tiles are already merged into `geometry` rectangles. Objects keep only
+    their layer, name and position.
+    """
+    layers: tp.Dict[str, np.ndarray]
+    geometry: tp.Dict[str, np.ndarray]
+    tiles: tp.List[TileRef]
+
+    def __init__(self, header: dict, arrays: tp.Dict[str, np.ndarray]):
+        self.width = header["width"]
+        self.height = header["height"]
+        self.tilewidth = header["tilewidth"]
+        self.tileheight = header["tileheight"]
+        self.tiles = [None] + [tuple(tuple(v) if isinstance(v, list) else v for v in ref) for ref in header["tiles"]]
+        self.objects = [tuple(o) for o in header["objects"]]
+        self.layers = {name: arrays[f"layer/{name}"] for name in header["layers"]}
+        self.geometry = {name: arrays[f"geometry/{name}"] for name in header["layers"]}
+        self._positions = arrays["objects"]
+
+    def tile_surfaces(self) -> tp.List:
+        """Surfaces of every tile, indexed like the layer grids"""
+        return [None] + load_tiles(self.tiles[1:])
+
+    def spawn(self, name: str) -> tp.Tuple[float, float]:
+        """Position of the first object called `name`"""
+        for i, (_, object_name) in enumerate(self.objects):
+            if object_name == name:
+                return tuple(self._positions[i].tolist())
+        raise KeyError(name)
+
+    def spawns(self, layer: str) -> np.ndarray:
+        """(objects, 2) positions of the objects of an object layer"""
+        return self._positions[[i for i, (object_layer, _) in enumerate(self.objects) if object_layer == layer]]
+
+
+def _describe_loader(filename, colorkey, **kwargs):
+    # Records where every tile comes from instead of loading it
+    path = pathlib.Path(os.path.relpath(os.path.normpath(filename), PROJECT_ROOT)).as_posix()
+    pixelalpha = kwargs.get("pixelalpha", True)
+
+    def load(rect=None, flags=None):
+        return path, rect, tuple(flags) if flags and any(flags) else None, colorkey, pixelalpha
+
+    return load
+
+
+def _dependencies(tiled_map: pytmx.TiledMap, path: str, root: ElementTree.Element) -> tp.List[str]:
+    # The map, its external tilesets and every image they use, relative to the project
+    directory = pathlib.Path(path).parent
+    sources = [element.get("source") for element in root.iter("tileset")]
+    sources += [tileset.source for tileset in tiled_map.tilesets]
+    sources += [props.get("source") for props in tiled_map.tile_properties.values()]
+    dependencies = {path} | {
+        pathlib.Path(os.path.normpath(directory / source)).as_posix() for source in sources if source
+    }
+    return sorted(d for d in dependencies if asset_fs.exists(d))
+
+
+def _digest(dependencies: tp.Iterable[str]) -> str:
+    sources = [(path, *asset_fs.signature(path)) for path in dependencies]
+    return hashlib.sha1(json.dumps([_VERSION, sources]).encode()).hexdigest()
+
+
+def compile_level(path, destination: str) -> None:
+    """Compile the Tiled map at `path` into a level bundle file at `destination`"""
+    path = pathlib.Path(path).as_posix()
+    tiled_map = pytmx.TiledMap(image_loader=_describe_loader)
+    tiled_map.filename = str(pathlib.Path(PROJECT_ROOT, path))
+    root = ElementTree.fromstring(asset_fs.read(path))
+    tiled_map.parse_xml(root)
+
+    # Only the tiles that are placed end up in the bundle, renumbered from 1
+    refs: tp.List[TileRef] = []
+    indices: tp.Dict[TileRef, int] = {}
+    arrays = {}
+    layer_names = []
+    for layer in tiled_map.visible_tile_layers:
+        layer = tiled_map.layers[layer]
+        grid = np.zeros((tiled_map.height, tiled_map.width), dtype=np.uint16)
+        for x, y, gid in layer.iter_data():
+            if gid:
+                # Tilesets sharing an image share its tiles
+                ref = tiled_map.images[gid]
+                if ref not in indices:
+                    refs.append(ref)
+                    indices[ref] = len(refs)
+                grid[y, x] = indices[ref]
+        layer_names.append(layer.name)
+        arrays[f"layer/{layer.name}"] = grid
+        arrays[f"geometry/{layer.name}"] = np.array(merge_tiles(grid != 0), dtype=np.int32).reshape(-1, 4)
+
+    objects = [(group.name, obj.name) for group in tiled_map.objectgroups for obj in group]
+    arrays["objects"] = np.array(
+        [(obj.x, obj.y) for group in tiled_map.objectgroups for obj in group], dtype=np.float32
+    ).reshape(-1, 2)
+
+    dependencies = _dependencies(tiled_map, path, root)
+    header = {
+        "digest": _digest(dependencies),
+        "dependencies": dependencies,
+        "width": tiled_map.width,
+        "height": tiled_map.height,
+        "tilewidth": tiled_map.tilewidth,
+        "tileheight": tiled_map.tileheight,
+        "tiles": refs,
+        "layers": layer_names,
+        "objects": objects,
+        "arrays": {},
+    }
+    _write(destination, header, arrays)
+
+
+def _align(offset: int) -> int:
+    return -offset % _ALIGNMENT
+
+
+def _write(destination: str, header: dict, arrays: tp.Dict[str, np.ndarray]) -> None:
+    # Arrays follow the header, at aligned offsets relative to the end of it
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = [array.dtype.str, list(array.shape), offset]
+        offset += array.nbytes + _align(array.nbytes)
+    encoded = json.dumps(header).encode()
+    encoded += b" " * _align(_PREAMBLE.size + len(encoded))
+
+    temporary = f"{destination}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(encoded)))
+        f.write(encoded)
+        for array in arrays.values():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data)
+            f.write(b"\0" * _align(len(data)))
+    os.replace(temporary, destination)
+
+
+def _read_header(path: str) -> dict:
+    # Reads the header without mapping the file, so that stale bundles are never left mapped
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path} is truncated")
+        magic, version, length = _PREAMBLE.unpack(preamble)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a level bundle of version {_VERSION}")
+        return json.loads(f.read(length))
+
+
+def read_bundle(path: str) -> tp.Tuple[dict, tp.Dict[str, np.ndarray]]:
+    """Memory-map a bundle file and return its header and read-only views of its arrays"""
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(data) < _PREAMBLE.size:
+        raise ValueError(f"{path} is truncated")
+    magic, version, length = _PREAMBLE.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a level bundle of version {_VERSION}")
+    header = json.loads(data[_PREAMBLE.size:_PREAMBLE.size + length])
+
+    start = _PREAMBLE.size + length
+    arrays = {}
+    for name, (dtype, shape, offset) in header["arrays"].items():
+        arrays[name] = np.frombuffer(data, np.dtype(dtype), int(np.prod(shape)), start + offset).reshape(shape)
+    return header, arrays
+
+
+def load_level(path) -> LevelBundle:
+    """
+    Load the level compiled from the Tiled map at `path`, compiling it first if needed.
+
+    Bundles are cached under CACHE_ROOT and recompiled once the map or any
+    tileset it uses changed. Each compilation is written to a file of its own,
+    named after the digest of its sources: the previous bundle may still be
+    mapped, by a live `Level`, and mapped files cannot be replaced on Windows.
+    Outdated bundles are removed once nothing maps them anymore.
+    """
+    path = pathlib.Path(path).as_posix()
+    name = path.replace('/', '_')
+
+    for candidate in _bundles(name):
+        try:
+            header = _read_header(candidate)
+            if header["digest"] == _digest(header["dependencies"]):
+                return LevelBundle(*read_bundle(candidate))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    compiled = os.path.join(_CACHE_DIR, f"{name}.compiled")
+    compile_level(path, compiled)
+    destination = os.path.join(_CACHE_DIR, f"{name}.{_read_header(compiled)['digest'][:16]}.lvl")
+    os.replace(compiled, destination)
+
+    for outdated in _bundles(name):
+        if outdated != destination:
+            try:
+                os.remove(outdated)
+            except OSError:
+                logger.debug(f"Keeping {outdated}, still in use")
+
+    header, arrays = read_bundle(destination)
+    logger.info(f"Compiled level {path} ({len(header['tiles'])} tiles, {len(header['objects'])} objects)")
+    return LevelBundle(header, arrays)
+
+
+def _bundles(name: str) -> tp.List[str]:
+    # Compiled bundles of the map called `name`, newest first
+    try:
+        files = [os.path.join(_CACHE_DIR, f) for f in os.listdir(_CACHE_DIR) if f.startswith(f"{name}.") and f.endswith(".lvl")]
+    except FileNotFoundError:
+        return []
+    return sorted(files, key=os.path.getmtime, reverse=True)
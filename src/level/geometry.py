@@ -0,0 +1,73 @@
+import typing as tp
+import logging
+
+from pymunk import Space, Poly
+
+logger = logging.getLogger(__name__)
+
+TileRect = tp.Tuple[int, int, int, int]
+
+
+def merge_tiles(solid: tp.Sequence[tp.Sequence[bool]]) -> tp.List[TileRect]:
+    """
+    Greedily cover the solid cells of a grid with maximal rectangles.
+
+    Each rectangle is grown to the right as far as the row allows and then
+    downwards while every cell of the next row span is still solid.
+
+    Args:
+        solid: Row-major grid, truthy where a tile blocks movement
+
+    Returns:
+        tp.List[TileRect]: Rectangles as (x, y, width, height) in tiles
+    """
+    height = len(solid)
+    width = len(solid[0]) if height else 0
+    covered = [[False] * width for _ in range(height)]
+    rects = []
+
+    for y in range(height):
+        for x in range(width):
+            if not solid[y][x] or covered[y][x]:
+                continue
+
+            w = 1
+            while x + w < width and solid[y][x + w] and not covered[y][x + w]:
+                w += 1
+
+            h = 1
+            while y + h < height and all(solid[y + h][i] and not covered[y + h][i] for i in range(x, x + w)):
+                h += 1
+
+            for j in range(y, y + h):
+                for i in range(x, x + w):
+                    covered[j][i] = True
+            rects.append((x, y, w, h))
+
+    return rects
+
+
+class StaticGeometry:
+    """Merged collision shapes of a tile layer, attached to the space's static body."""
+    shapes: tp.List[Poly]
+    bounds: tp.List[tp.Tuple[int, int, int, int]]
+
+    def __init__(self, space: Space, rects: tp.Iterable[TileRect], tile_width: int, tile_height: int, name: str = ""):
+        self.shapes = []
+        # (left, top, right, bottom) in pixels of every shape, for what is not simulated by the space
+        self.bounds = []
+        tiles = 0
+        for x, y, w, h in rects:
+            left, top = x * tile_width, y * tile_height
+            right, bottom = left + w * tile_width, top + h * tile_height
+            self.shapes.append(Poly(space.static_body, [(left, top), (right, top), (right, bottom), (left, bottom)]))
+            self.bounds.append((left, top, right, bottom))
+            tiles += w * h
+        space.add(*self.shapes)
+
+        self.tile_count = tiles
+        logger.info(f"Layer '{name}': {tiles} solid tiles merged into {self.shape_count} shapes")
+
+    @property
+    def shape_count(self) -> int:
+        return len(self.shapes)
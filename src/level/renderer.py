@@ -0,0 +1,64 @@
+import typing as tp
+
+import pygame
+from pygame import Rect, Surface
+from pygame.transform import scale2x
+
+CHUNK_TILES = 16
+
+
+class TileLayerRenderer:
+    """Bakes static tile layers into chunk surfaces and blits only the visible ones."""
+    _chunks: tp.Dict[tp.Tuple[int, int], Surface]
+
+    def __init__(self, tiled_map, layer_names: tp.Iterable[str], chunk_tiles: int = CHUNK_TILES):
+        self.tile_width = tiled_map.tilewidth * 2
+        self.tile_height = tiled_map.tileheight * 2
+        self.chunk_width = self.tile_width * chunk_tiles
+        self.chunk_height = self.tile_height * chunk_tiles
+        self._chunk_tiles = chunk_tiles
+        self._chunks = {}
+
+        for name in layer_names:
+            self._bake(tiled_map.get_layer_by_name(name).tiles())
+
+    @classmethod
+    def from_bundle(cls, bundle, layer_names: tp.Iterable[str], chunk_tiles: int = CHUNK_TILES) -> 'TileLayerRenderer':
+        """Bake the layers of a compiled level, see `level.bundle`"""
+        renderer = cls(bundle, (), chunk_tiles)
+        tiles = bundle.tile_surfaces()
+        for name in layer_names:
+            grid = bundle.layers[name]
+            renderer._bake((x, y, tiles[grid[y, x]]) for y, x in zip(*grid.nonzero()))
+        return renderer
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._chunks)
+
+    def _chunk(self, cx: int, cy: int) -> Surface:
+        chunk = self._chunks.get((cx, cy))
+        if chunk is None:
+            chunk = Surface((self.chunk_width, self.chunk_height), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                chunk = chunk.convert_alpha()
+            self._chunks[(cx, cy)] = chunk
+        return chunk
+
+    def _bake(self, tiles: tp.Iterable[tp.Tuple[int, int, Surface]]) -> None:
+        for x, y, surf in tiles:
+            cx, tx = divmod(x, self._chunk_tiles)
+            cy, ty = divmod(y, self._chunk_tiles)
+            self._chunk(cx, cy).blit(scale2x(surf), (tx * self.tile_width, ty * self.tile_height))
+
+    def draw(self, surface: Surface, offset: tp.Tuple[int, int] = (0, 0)) -> None:
+        """Blit the chunks that intersect the viewport; `offset` is the viewport's top-left in world space."""
+        view = Rect(offset, surface.get_size())
+        chunks = self._chunks
+        blits = []
+        for cy in range(view.top // self.chunk_height, (view.bottom - 1) // self.chunk_height + 1):
+            for cx in range(view.left // self.chunk_width, (view.right - 1) // self.chunk_width + 1):
+                chunk = chunks.get((cx, cy))
+                if chunk is not None:
+                    blits.append((chunk, (cx * self.chunk_width - view.left, cy * self.chunk_height - view.top)))
+        surface.blits(blits, doreturn=False)
@@ -1,12 +1,17 @@
 import abc
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional, Tuple, Union
 
 import pygame
 
 from ui import UIElement
+from utils.preload import AssetManifest, Preloader, Progress
 
 class Scene(abc.ABC):
     """Abstract base class for all game scenes"""
+    # Scenes likely to be set next, their assets are preloaded once this one is set up
+    likely_next: Tuple[str, ...] = ()
+
     def __init__(self, manager: 'SceneManager'):
         self.manager = manager
         self.ui_elements: List[UIElement] = []
@@ -21,6 +26,10 @@ class Scene(abc.ABC):
         """Clean up scene resources"""
         pass
 
+    def release(self) -> None:
+        """Free the heavy resources of the scene, it is torn down and not used anymore"""
+        pass
+
     def handle_events(self, events: List[pygame.event.Event]) -> None:
         """Process all events"""
         for event in events:
@@ -39,35 +48,108 @@ class Scene(abc.ABC):
             element.draw(surface)
 
 
+@dataclass
+class _Registration:
+    factory: Optional[Callable[[], Scene]]
+    manifest: AssetManifest
+    cache: bool
+    progress: Optional[Progress] = None
+
+
 class SceneManager:
-    """Manages transitions between different game scenes"""
-    def __init__(self, screen: pygame.Surface):
+    """
+    Manages transitions between different game scenes.
+
+    Scenes are added built, or as factories building them when first set.
+    Once left, scenes built by a factory stay built while they are among the
+    `keep_alive` last left ones, unless added with `cache=False`. Otherwise
+    they are released, and built again when set next.
+
+    The assets listed in the manifests of scenes are loaded by `preloader`,
+    either ahead of time by `prefetch` or when the scene is set, in which
+    case a loading scene is shown until they are in.
+    """
+    def __init__(self, screen: pygame.Surface, preloader: Optional[Preloader] = None, keep_alive: int = 1):
         self.screen = screen
+        self.preloader = preloader
+        self.keep_alive = keep_alive
         self.scenes: Dict[str, Scene] = {}
         self.current_scene: Optional[Scene] = None
         self.current_scene_name: Optional[str] = None
         self.player_data = {
             "balance": 1000  # Initial balance
         }
-
-    def add_scene(self, name: str, scene: Scene) -> None:
-        """Add a scene to the manager"""
-        self.scenes[name] = scene
+        self._registrations: Dict[str, _Registration] = {}
+        # Names of the scenes left and still built, most recently left first
+        self._left: List[str] = []
+
+    def add_scene(self, name: str, scene: Union[Scene, Callable[[], Scene]],
+                  manifest: Optional[AssetManifest] = None, cache: bool = True) -> None:
+        """Add a scene, or a factory building it on its first `set_scene`, to the manager"""
+        if isinstance(scene, Scene):
+            self.scenes[name] = scene
+            scene = None
+        self._registrations[name] = _Registration(scene, manifest or AssetManifest(), cache)
+
+    def prefetch(self, name: str) -> Progress:
+        """Start preloading the assets of a scene in the background, if not started yet"""
+        registration = self._registrations[name]
+        if registration.progress is None:
+            registration.progress = Progress([])
+            if self.preloader is not None:
+                registration.progress = self.preloader.load(registration.manifest)
+        return registration.progress
 
     def set_scene(self, name: str) -> None:
         """Change to a different scene"""
-        if name not in self.scenes:
+        if name not in self._registrations:
             raise ValueError(f"Scene '{name}' not found")
 
+        scene = self.scenes.get(name)
+        if scene is None:
+            progress = self.prefetch(name)
+            if progress.done:
+                scene = self.scenes[name] = self._registrations[name].factory()
+            else:
+                # Imported only now, as the loading scene is a scene itself
+                from scenes.loading_scene import LoadingScene
+                scene = LoadingScene(self, progress, name)
+
+        # Not left anymore, so that leaving the current scene does not release it
+        if name in self._left:
+            self._left.remove(name)
+
         # Teardown current scene if exists
         if self.current_scene:
             self.current_scene.teardown()
+            if self.current_scene_name != name and self.scenes.get(self.current_scene_name) is self.current_scene:
+                self._leave(self.current_scene_name)
 
         # Setup new scene
-        self.current_scene = self.scenes[name]
+        self.current_scene = scene
         self.current_scene_name = name
         self.current_scene.setup()
 
+        for likely in self.current_scene.likely_next:
+            if likely in self._registrations:
+                self.prefetch(likely)
+
+    def _leave(self, name: str) -> None:
+        # Scenes added built cannot be built again, they are always kept
+        if self._registrations[name].factory is None:
+            return
+        self._left.insert(0, name)
+        if not self._registrations[name].cache:
+            self._release(name)
+        for old in self._left[self.keep_alive:]:
+            self._release(old)
+
+    def _release(self, name: str) -> None:
+        self._left.remove(name)
+        self.scenes.pop(name).release()
+        # Its assets may be evicted meanwhile, the next prefetch checks them again
+        self._registrations[name].progress = None
+
     def handle_events(self) -> None:
         """Delegate event handling to current scene"""
 
@@ -8,6 +8,9 @@ from scenes import Scene
 
 from entities.background import Background
 from level.__init__ import Level
+from utils import unregister_atlas
+from utils.preload import AssetManifest
+from utils.profiler import profiler
 
 
 class BalanceDisplay:
@@ -102,6 +105,10 @@ class GameScene(Scene):
         self.pause_overlay = PauseOverlay()
         self.is_paused = False
 
+    @staticmethod
+    def manifest(player: Player, level = 1) -> AssetManifest:
+        return AssetManifest(images=(Background.IMAGE_PATH,)) + Level.manifest(level - 1, player)
+
     def setup(self) -> None:
         """Initialize the game scene resources"""
         pygame.font.init()
@@ -115,6 +122,10 @@ class GameScene(Scene):
         # Save current balance to manager
         self.manager.player_data["balance"] = self.balance_display.balance
 
+    def release(self) -> None:
+        """Drop the level sprite atlas, the level itself goes with the scene"""
+        unregister_atlas(self.level.atlas.name)
+
     def handle_events(self, events: List[pygame.event.Event]) -> None:
         """Process all events"""
         super().handle_events(events)
@@ -152,10 +163,11 @@ class GameScene(Scene):
         self.level.draw(surface)
 
         # Draw UI elements
-        super().draw(surface)
-        self.balance_display.draw(surface)
-        self.level_display.draw(surface)
-
-        # Draw pause overlay if paused
-        if self.is_paused:
-            self.pause_overlay.draw(surface)
+        with profiler.scope("ui"):
+            super().draw(surface)
+            self.balance_display.draw(surface)
+            self.level_display.draw(surface)
+
+            # Draw pause overlay if paused
+            if self.is_paused:
+                self.pause_overlay.draw(surface)
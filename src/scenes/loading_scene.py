@@ -0,0 +1,46 @@
+import pygame
+
+from scenes import Scene, SceneManager
+from utils.preload import Progress
+
+
+class LoadingScene(Scene):
+    """Shows the progress of preloading, then sets the scene that needed it"""
+    def __init__(self, manager: SceneManager, progress: Progress, target: str):
+        super().__init__(manager)
+        self.progress = progress
+        self.target = target
+        self.bg_color = (20, 20, 30)
+        self.bar_color = (255, 255, 255)
+        self.font = None
+
+    def setup(self) -> None:
+        """Setup the font of the loading text, the default one as it needs no loading"""
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 32)
+
+    def teardown(self) -> None:
+        """Clean up scene resources"""
+        self.font = None
+
+    def update(self, dt: float) -> None:
+        """Switch to the target scene once everything is loaded"""
+        if self.progress.done:
+            self.manager.set_scene(self.target)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Draw the loading text and progress bar"""
+        surface.fill(self.bg_color)
+        if not self.font:
+            return
+
+        width, height = surface.get_size()
+        text = self.font.render("Loading...", True, self.bar_color)
+        surface.blit(text, text.get_rect(centerx=width // 2, bottom=height // 2 - 10))
+
+        bar = pygame.Rect(0, 0, width // 2, 16)
+        bar.midtop = (width // 2, height // 2 + 10)
+        pygame.draw.rect(surface, self.bar_color, bar, width=2)
+        filled = bar.inflate(-6, -6)
+        filled.width = int(filled.width * self.progress.fraction)
+        pygame.draw.rect(surface, self.bar_color, filled)
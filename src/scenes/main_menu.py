@@ -2,15 +2,20 @@ import pygame
 from pygame.sprite import Group
 
 from entities.background import Background
-from ui import Button, BalanceBar
-from ui.icons import RIGHT_ICON, STORE_ICON
+from ui import Button, BalanceBar, icons
 
 from scenes import Scene, SceneManager
-from utils import load_image, load_font
+from utils import load_font, register_atlas
+from utils.preload import AssetManifest
+
+_FONT = "assets/gamekit/Font/Planes_ValMore.ttf"
 
 
 class MainMenuScene(Scene):
     """Main menu scene with buttons and balance display"""
+    # Gameplay assets stream in while the player is in the menu
+    likely_next = ("game",)
+
     def __init__(self, manager: SceneManager):
         super().__init__(manager)
         self.bg_color = (20, 20, 30)
@@ -19,6 +24,10 @@ class MainMenuScene(Scene):
         self.balance_font = None
         self.icons = {}  # Store icons for buttons
 
+    @staticmethod
+    def manifest() -> AssetManifest:
+        return AssetManifest(images=(Background.IMAGE_PATH,), tasks=(("atlas_ui", icons.build_atlas),))
+
     def setup(self) -> None:
         """Initialize main menu resources"""
         screen_width, screen_height = self.manager.screen.get_size()
@@ -30,23 +39,23 @@ class MainMenuScene(Scene):
 
         # Load fonts (you would replace these with your custom font paths)
         try:
-            self.title_font = load_font("assets/gamekit/Font/Planes_ValMore.ttf", 48)  # Use custom font here
-            self.button_font = load_font("assets/gamekit/Font/Planes_ValMore.ttf", 32)  # Use custom font here
-            self.balance_font = load_font("assets/gamekit/Font/Planes_ValMore.ttf", 20)  # Use custom font here
+            self.title_font = load_font(_FONT, 48)  # Use custom font here
+            self.button_font = load_font(_FONT, 32)  # Use custom font here
+            self.balance_font = load_font(_FONT, 20)  # Use custom font here
         except:
             # Fallback to default font if custom fonts fail to load
             self.title_font = pygame.font.SysFont("Arial", 72)
             self.button_font = pygame.font.SysFont("Arial", 48)
             self.balance_font = pygame.font.SysFont("Arial", 36)
 
-        # Load icons (placeholders - replace with your actual icon loading)
-        icon_size = (32, 32)
+        # Icons come from the UI atlas, packed by the preloader
+        register_atlas(icons.build_atlas())
         self.icons = {
-            'play': RIGHT_ICON,
-            'store': STORE_ICON,
-            'settings': load_image("assets/gamekit/3 Icons/Icons_39.png"),
-            'exit': load_image("assets/gamekit/3 Icons/Icons_50.png"),
-            'coin': load_image("assets/gamekit/3 Icons/Icons_61.png"),
+            'play': icons.RIGHT_ICON,
+            'store': icons.STORE_ICON,
+            'settings': icons.SETTINGS_ICON,
+            'exit': icons.QUIT_ICON,
+            'coin': icons.COIN_ICON,
         }
 
         # Calculate button positions
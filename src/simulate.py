@@ -0,0 +1,43 @@
+import argparse
+import logging
+
+from constants import ASSET_ARCHIVES, FPS
+from controls.recording import ReplayControls
+from controls.scripted import patrol
+from core.simulation import Simulation
+from utils.profiler import profiler
+from utils.trace import tracer
+from utils.vfs import asset_fs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a level headless as fast as possible and report the speed.")
+    parser.add_argument("--seconds", type=float, default=60, help="simulated time to run for")
+    parser.add_argument("--dt", type=int, default=1000 // FPS, help="fixed frame time in milliseconds")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--no-draw", action="store_true", help="only update, skip rendering")
+    parser.add_argument("--replay", metavar="PATH", help="play back inputs recorded with main.py --record")
+    parser.add_argument("--profile", action="store_true", help="print per stage frame timings")
+    parser.add_argument("--trace", metavar="PATH", help="stream a timeline of every frame to PATH, for chrome://tracing or Perfetto")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(filename)s - %(levelname)s - %(message)s', level=logging.WARNING)
+    asset_fs.mount_all(ASSET_ARCHIVES)
+
+    profiler.enabled = args.profile
+    if args.trace:
+        tracer.open(args.trace)
+    controls = ReplayControls(args.replay) if args.replay else patrol(args.dt)
+    simulation = Simulation(controls, level=args.level, dt=args.dt, draw=not args.no_draw)
+    try:
+        if args.replay:
+            print(simulation.replay())
+        else:
+            print(simulation.run(int(args.seconds * 1000 / args.dt)))
+        if args.profile:
+            print(f"{'stage':<12}{'p50':>8}{'p95':>8}{'p99':>8}  ms")
+            for name in profiler.names:
+                print(f"{name:<12}" + "".join(f"{value:8.2f}" for value in profiler.percentiles(name)))
+    finally:
+        simulation.close()
+        tracer.close()
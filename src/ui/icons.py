@@ -1,17 +1,34 @@
 import os
 
 from utils import load_image
+from utils.atlas import Atlas, build_atlas as _build_atlas
 
 _BASE_DIR = "assets/gamekit/3 Icons"
-_load = lambda x : load_image(os.path.join(_BASE_DIR, x))
-
-HOME_ICON       = _load("Icons_01.png")
-INFO_ICON       = _load("Icons_04.png")
-RIGHT_ICON      = _load("Icons_25.png")
-LEFT_ICON       = _load("Icons_26.png")
-STORE_ICON      = _load("Icons_32.png")
-SETTINGS_ICON   = _load("Icons_39.png")
-QUIT_ICON       = _load("Icons_50.png")
-COIN_ICON       = _load("Icons_61.png")
-SWORD_ICON      = _load("Icons_63.png")
-SPELL_ICON      = _load("Icons_64.png")
\ No newline at end of file
+
+ICON_PATHS = [os.path.join(_BASE_DIR, f"Icons_{i:02}.png") for i in range(1, 65)]
+
+_ICONS = {
+    "HOME_ICON":        "Icons_01.png",
+    "INFO_ICON":        "Icons_04.png",
+    "RIGHT_ICON":       "Icons_25.png",
+    "LEFT_ICON":        "Icons_26.png",
+    "STORE_ICON":       "Icons_32.png",
+    "SETTINGS_ICON":    "Icons_39.png",
+    "QUIT_ICON":        "Icons_50.png",
+    "COIN_ICON":        "Icons_61.png",
+    "SWORD_ICON":       "Icons_63.png",
+    "SPELL_ICON":       "Icons_64.png",
+}
+
+
+def build_atlas() -> Atlas:
+    """Atlas of every icon, to register before the icons are used"""
+    return _build_atlas("ui", ICON_PATHS, page_size=512)
+
+
+def __getattr__(name):
+    # Icons are looked up when used rather than on import, so that they come from the UI atlas once it is registered
+    try:
+        return load_image(os.path.join(_BASE_DIR, _ICONS[name]))
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,75 @@
+import typing as tp
+
+import numpy as np
+import pygame
+
+from constants import FPS
+from utils.profiler import Profiler
+
+
+class ProfilerOverlay:
+    """F3 style overlay with percentiles of every profiled stage and a frame time graph"""
+    def __init__(self, profiler: Profiler, refresh: int = 15, graph_size: tp.Tuple[int, int] = (240, 60)):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.graph_size = graph_size
+        self.position = (10, 10)
+        self.font = None
+        self._table: tp.Optional[pygame.Surface] = None
+        self._frames = 0
+
+    def setup(self) -> None:
+        """Setup font for the overlay"""
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 18)
+
+    def toggle(self) -> None:
+        """Turn profiling and the overlay on or off"""
+        self.profiler.enabled = not self.profiler.enabled
+        self._table = None
+
+    def _render_table(self) -> pygame.Surface:
+        rows = [("stage", "p50", "p95", "p99")]
+        for name in self.profiler.names:
+            rows.append((name, *(f"{value:.2f}" for value in self.profiler.percentiles(name))))
+
+        widths = (110, 50, 50, 50)
+        line_height = self.font.get_linesize()
+        table = pygame.Surface((sum(widths), line_height * len(rows)), pygame.SRCALPHA)
+        table.fill((0, 0, 0, 160))
+        for row, cells in enumerate(rows):
+            x = 0
+            for cell, width in zip(cells, widths):
+                table.blit(self.font.render(cell, True, (255, 255, 255)), (x + 4, row * line_height))
+                x += width
+        return table
+
+    def _draw_graph(self, surface: pygame.Surface, topleft: tp.Tuple[int, int]) -> None:
+        width, height = self.graph_size
+        graph = pygame.Rect(topleft, self.graph_size)
+        surface.fill((0, 0, 0), graph)
+
+        # Three frame budgets fit vertically, the line marks one
+        scale = height / (3000 / FPS)
+        budget = graph.bottom - int(1000 / FPS * scale)
+        pygame.draw.line(surface, (0, 160, 0), (graph.left, budget), (graph.right - 1, budget))
+
+        timings = self.profiler.timings()[-width:]
+        if len(timings) > 1:
+            xs = graph.right - len(timings) + np.arange(len(timings))
+            ys = graph.bottom - 1 - np.minimum(timings * scale, height - 1)
+            pygame.draw.lines(surface, (255, 200, 0), False, np.stack([xs, ys], axis=1).tolist())
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Draw the overlay if profiling is enabled"""
+        if not self.profiler.enabled or self.font is None:
+            return
+
+        # Text is re-rendered only every few frames, it is the expensive part
+        if self._table is None or self._frames % self.refresh == 0:
+            self._table = self._render_table()
+        self._frames += 1
+
+        x, y = self.position
+        surface.blit(self._table, (x, y))
+        self._draw_graph(surface, (x, y + self._table.get_height() + 4))
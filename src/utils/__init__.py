@@ -1,19 +1,133 @@
 import pathlib
+from xml.etree import ElementTree
 
+import pygame.display
 import pygame.image
 import pygame.transform
-import pytmx.util_pygame
+import pytmx
+from pytmx.util_pygame import handle_transformation, smart_convert
 
-from constants import PROJECT_ROOT
+from constants import PROJECT_ROOT, ASSET_CACHE_BUDGET
+from utils.cache import AssetCache, CacheStats
+from utils.trace import tracer
+from utils.vfs import asset_fs
+
+# Decoded assets are shared between callers and must not be modified in place
+assets = AssetCache(ASSET_CACHE_BUDGET)
+
+# Registered sprite atlases take precedence over loading individual files
+_atlases = []
+
+def _key(path) -> str:
+    return pathlib.Path(path).as_posix()
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+def _decode_image(path, convert: bool) -> pygame.Surface:
+    # Images loaded before the display existed are converted instead of decoded again
+    with tracer.span(_key(path), "asset", track="assets"):
+        image = assets.pop(("image", _key(path), False))
+        if image is None:
+            image = pygame.transform.scale2x(pygame.image.load(asset_fs.source(path), pathlib.Path(path).name))
+        return image.convert_alpha() if convert else image
+
+def register_atlas(atlas) -> None:
+    _atlases[:] = [a for a in _atlases if a.name != atlas.name] + [atlas]
+
+def unregister_atlas(name: str) -> None:
+    _atlases[:] = [a for a in _atlases if a.name != name]
+
+def forget_image(path) -> None:
+    assets.pop(("image", _key(path), False))
+    assets.pop(("image", _key(path), True))
 
 def load_image(path):
-    return pygame.transform.scale2x(pygame.image.load(pathlib.Path(PROJECT_ROOT, path)))
+    for atlas in _atlases:
+        if path in atlas:
+            return atlas.image(path)
+
+    convert = pygame.display.get_surface() is not None
+    return assets.get(("image", _key(path), convert), lambda: _decode_image(path, convert), _surface_bytes)
+
+def preload_image(path) -> None:
+    """
+    Decode the image at `path` into the cache, if it is not there already.
+
+    Safe to call from any thread: decoding happens outside of the cache lock,
+    so loads on the main thread do not wait for it.
+    """
+    if any(path in atlas for atlas in _atlases):
+        return
+    convert = pygame.display.get_surface() is not None
+    key = ("image", _key(path), convert)
+    if key not in assets:
+        image = _decode_image(path, convert)
+        assets.put(key, image, _surface_bytes(image))
+
+def _traced(path, load):
+    # Asset loads get a track of their own in traces
+    def traced():
+        with tracer.span(_key(path), "asset", track="assets"):
+            return load()
+    return traced
 
 def load_font(path, size):
-    return pygame.font.Font(pathlib.Path(PROJECT_ROOT, path), size)
+    return assets.get(
+        ("font", _key(path), size),
+        _traced(path, lambda: pygame.font.Font(asset_fs.source(path), size)),
+        lambda _: asset_fs.signature(path)[1],
+    )
 
 def load_sound(path):
-    return pygame.mixer.Sound(pathlib.Path(PROJECT_ROOT, path))
+    return assets.get(
+        ("sound", _key(path)),
+        _traced(path, lambda: pygame.mixer.Sound(asset_fs.source(path))),
+        lambda sound: len(sound.get_raw()),
+    )
+
+def cache_stats() -> CacheStats:
+    return assets.stats()
+
+def _tile(image, rect, flags, colorkey, pixelalpha):
+    tile = image.subsurface(rect) if rect else image.copy()
+    if flags:
+        tile = handle_transformation(tile, flags)
+    return smart_convert(tile, colorkey, pixelalpha)
+
+def _tiled_image_loader(filename, colorkey, **kwargs):
+    # Same as pytmx.util_pygame.pygame_image_loader, but reads through the asset filesystem
+    if colorkey:
+        colorkey = pygame.Color(f"#{colorkey}")
+    pixelalpha = kwargs.get("pixelalpha", True)
+    image = pygame.image.load(asset_fs.source(filename), pathlib.Path(filename).name)
+
+    def load(rect=None, flags=None):
+        return _tile(image, rect, flags, colorkey, pixelalpha)
+
+    return load
+
+def load_tiles(refs):
+    """
+    Build tile surfaces from (image path, rect, flags, colorkey, pixelalpha) references, as recorded by a Tiled map.
+
+    Every image is read once however many tiles it provides.
+    """
+    images = {}
+    tiles = []
+    for path, rect, flags, colorkey, pixelalpha in refs:
+        image = images.get(path)
+        if image is None:
+            with tracer.span(_key(path), "asset", track="assets"):
+                image = images[path] = pygame.image.load(asset_fs.source(path), pathlib.Path(path).name)
+        flags = pytmx.TileFlags(*flags) if flags else None
+        tiles.append(_tile(image, rect, flags, pygame.Color(f"#{colorkey}") if colorkey else None, pixelalpha))
+    return tiles
 
-def load_tiled_map(path):
-    return pytmx.util_pygame.load_pygame(str(pathlib.Path(PROJECT_ROOT, path)))
\ No newline at end of file
+def load_tiled_map(path, xml=None):
+    # Generated maps are given as `xml`, `path` still anchors the tilesets they reference
+    with tracer.span(_key(path), "asset", track="assets"):
+        tiled_map = pytmx.TiledMap(image_loader=_tiled_image_loader)
+        tiled_map.filename = str(pathlib.Path(PROJECT_ROOT, path))
+        tiled_map.parse_xml(ElementTree.fromstring(asset_fs.read(path) if xml is None else xml))
+        return tiled_map
@@ -1,18 +1,50 @@
+import typing as tp
+
 from pygame import Surface
+from pygame.transform import flip
 
 from constants import FPS
 
+
+class FrameSequence:
+    """Immutable frames of a horizontal sprite sheet and their mirrored versions, sliced once."""
+    __slots__ = ('_frames', '_flipped', '_size')
+
+    def __init__(self, sheet: Surface, size: tp.Optional[int] = None):
+        size = size or sheet.height
+        frames = tuple(sheet.subsurface(i * size, 0, size, size) for i in range(sheet.width // size))
+        self._frames = frames
+        self._flipped = tuple(flip(frame, True, False) for frame in frames)
+        self._size = size
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, item) -> Surface:
+        return self._frames[item]
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def flipped(self) -> tp.Tuple[Surface, ...]:
+        return self._flipped
+
+
 class Animation:
-    _surf: Surface
+    _frames: FrameSequence
     _size: int
     _fpf: int
     _millis: int
     _repeat: bool
     _ended: bool
 
-    def __init__(self, surf: Surface, fpf: int = FPS // 4, repeat: bool = True):
-        self._surf = surf
-        self._size = self._surf.height
+    def __init__(self, frames: tp.Union[FrameSequence, Surface], fpf: int = FPS // 4, repeat: bool = True):
+        if isinstance(frames, Surface):
+            frames = FrameSequence(frames)
+        self._frames = frames
+        self._size = frames.size
 
         self._fpf = fpf
         self._millis = 0
@@ -29,15 +61,19 @@ class Animation:
         return self._loop
 
     def __getitem__(self, item):
-        return self._surf.subsurface(
-            item * self._size, 0, self._size, self._size
-        )
+        return self._frames[item]
 
-    def start(self) -> Surface:
+    def _frame(self, flipped: bool) -> Surface:
+        index = (FPS * self._millis) // (self._fpf * 1000)
+        return self._frames.flipped[index] if flipped else self._frames[index]
+
+    def start(self, flipped: bool = False) -> Surface:
         self._millis = 0
-        return self[0]
+        self._ended = False
+        self._loop = 0
+        return self._frame(flipped)
 
-    def update(self, dt) -> Surface:
+    def update(self, dt, flipped: bool = False) -> Surface:
         self._millis += dt
         if self._millis >= 1000:
             if self._repeat:
@@ -46,4 +82,4 @@ class Animation:
             else:
                 self._ended = True
                 self._millis = 999
-        return self[(FPS * self._millis) // (self._fpf * 1000)]
+        return self._frame(flipped)
@@ -0,0 +1,207 @@
+import os
+import json
+import hashlib
+import pathlib
+import logging
+import typing as tp
+
+import pygame
+from pygame import Surface
+
+from constants import CACHE_ROOT
+from utils import assets, load_image, forget_image, _surface_bytes
+from utils.vfs import asset_fs
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = os.path.join(CACHE_ROOT, "atlas")
+_VERSION = 1
+
+
+class AtlasRegion(tp.NamedTuple):
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class _Skyline:
+    """Bottom-left skyline bin packer for a single page."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.nodes = [[0, 0, width]]  # x, y, width of each skyline segment
+
+    def insert(self, width: int, height: int) -> tp.Optional[tp.Tuple[int, int]]:
+        best = None
+        for i, (x, _, _) in enumerate(self.nodes):
+            y = self._fit(i, width, height)
+            if y is not None and (best is None or (y + height, x) < (best[0] + height, best[1])):
+                best = (y, x, i)
+
+        if best is None:
+            return None
+
+        y, x, i = best
+        self._place(i, x, y + height, width)
+        return x, y
+
+    def _fit(self, i: int, width: int, height: int) -> tp.Optional[int]:
+        if self.nodes[i][0] + width > self.width:
+            return None
+
+        y, remaining = 0, width
+        while remaining > 0:
+            y = max(y, self.nodes[i][1])
+            if y + height > self.height:
+                return None
+            remaining -= self.nodes[i][2]
+            i += 1
+        return y
+
+    def _place(self, i: int, x: int, y: int, width: int) -> None:
+        self.nodes.insert(i, [x, y, width])
+
+        # Shrink or drop the segments now covered by the new one
+        j = i + 1
+        while j < len(self.nodes):
+            prev, node = self.nodes[j - 1], self.nodes[j]
+            overlap = prev[0] + prev[2] - node[0]
+            if overlap <= 0:
+                break
+            node[0] += overlap
+            node[2] -= overlap
+            if node[2] > 0:
+                break
+            del self.nodes[j]
+
+        # Merge neighbouring segments of the same height
+        j = 0
+        while j < len(self.nodes) - 1:
+            if self.nodes[j][1] == self.nodes[j + 1][1]:
+                self.nodes[j][2] += self.nodes.pop(j + 1)[2]
+            else:
+                j += 1
+
+
+def pack(sizes: tp.Dict[str, tp.Tuple[int, int]], page_size: int, padding: int = 1) -> tp.Dict[str, AtlasRegion]:
+    """
+    Lay out rectangles on as few square pages as possible.
+
+    Args:
+        sizes: Width and height of every rectangle by key
+        page_size: Side of a page in pixels
+        padding: Gap kept to the right of and below every rectangle
+
+    Returns:
+        tp.Dict[str, AtlasRegion]: Placement of every rectangle
+    """
+    pages: tp.List[_Skyline] = []
+    regions = {}
+
+    for key in sorted(sizes, key=lambda k: (sizes[k][1], sizes[k][0]), reverse=True):
+        width, height = sizes[key]
+        if width + padding > page_size or height + padding > page_size:
+            raise ValueError(f"'{key}' ({width}x{height}) does not fit on a {page_size}x{page_size} atlas page")
+
+        for page, skyline in enumerate(pages):
+            pos = skyline.insert(width + padding, height + padding)
+            if pos is not None:
+                break
+        else:
+            pages.append(_Skyline(page_size, page_size))
+            page, pos = len(pages) - 1, pages[-1].insert(width + padding, height + padding)
+
+        regions[key] = AtlasRegion(page, pos[0], pos[1], width, height)
+
+    return regions
+
+
+class Atlas:
+    """Sprite sheets packed into a few large page surfaces."""
+    pages: tp.List[Surface]
+    regions: tp.Dict[str, AtlasRegion]
+
+    def __init__(self, name: str, pages: tp.List[Surface], regions: tp.Dict[str, AtlasRegion]):
+        self.name = name
+        self.pages = pages
+        self.regions = regions
+        self._images = {
+            key: pages[region.page].subsurface(region.x, region.y, region.width, region.height)
+            for key, region in regions.items()
+        }
+
+    def __contains__(self, path) -> bool:
+        return pathlib.Path(path).as_posix() in self._images
+
+    def image(self, path) -> Surface:
+        return self._images[pathlib.Path(path).as_posix()]
+
+
+def _digest(paths: tp.List[str], page_size: int, padding: int) -> str:
+    sources = [(path, *asset_fs.signature(path)) for path in paths]
+    return hashlib.sha1(json.dumps([_VERSION, page_size, padding, sources]).encode()).hexdigest()
+
+
+def _load_page(path: str) -> Surface:
+    page = pygame.image.load(path)
+    return page.convert_alpha() if pygame.display.get_surface() is not None else page
+
+
+def build_atlas(name: str, paths: tp.Iterable, page_size: int = 2048, padding: int = 1) -> Atlas:
+    """
+    Pack the images at `paths` (as returned by load_image) into an atlas.
+
+    The layout and page images are cached under CACHE_ROOT and reused
+    as long as none of the source files changed. Built atlases are kept in
+    the asset cache as well, so that building one ahead of time on another
+    thread, eg. by a preload task, saves the caller from doing it.
+    """
+    paths = sorted({pathlib.Path(path).as_posix() for path in paths})
+    digest = _digest(paths, page_size, padding)
+    convert = pygame.display.get_surface() is not None
+    return assets.get(
+        ("atlas", name, digest, convert),
+        lambda: _build(name, paths, digest, page_size, padding),
+        lambda atlas: sum(_surface_bytes(page) for page in atlas.pages),
+    )
+
+
+def _build(name: str, paths: tp.List[str], digest: str, page_size: int, padding: int) -> Atlas:
+    layout_path = os.path.join(_CACHE_DIR, f"{name}.json")
+    page_path = lambda n: os.path.join(_CACHE_DIR, f"{name}_{n}.png")
+
+    try:
+        with open(layout_path) as f:
+            layout = json.load(f)
+        if layout["digest"] == digest:
+            pages = [_load_page(page_path(n)) for n in range(layout["pages"])]
+            regions = {key: AtlasRegion(*region) for key, region in layout["regions"].items()}
+            logger.info(f"Loaded atlas '{name}' from cache ({len(pages)} pages)")
+            return Atlas(name, pages, regions)
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+
+    images = {path: load_image(path) for path in paths}
+    regions = pack({path: image.get_size() for path, image in images.items()}, page_size, padding)
+
+    pages = [Surface((page_size, page_size), pygame.SRCALPHA) for _ in range(max((r.page for r in regions.values()), default=-1) + 1)]
+    for path, region in regions.items():
+        pages[region.page].blit(images[path], (region.x, region.y))
+        forget_image(path)
+    if pygame.display.get_surface() is not None:
+        pages = [page.convert_alpha() for page in pages]
+
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        for n, page in enumerate(pages):
+            pygame.image.save(page, page_path(n))
+        with open(layout_path, "w") as f:
+            json.dump({"digest": digest, "pages": len(pages), "regions": regions}, f)
+    except OSError as e:
+        logger.warning(f"Cannot cache atlas '{name}': {e}")
+
+    logger.info(f"Packed {len(regions)} images into atlas '{name}' ({len(pages)} pages)")
+    return Atlas(name, pages, regions)
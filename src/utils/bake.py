@@ -0,0 +1,147 @@
+import os
+import re
+import json
+import hashlib
+import pathlib
+import logging
+import typing as tp
+from dataclasses import dataclass, asdict
+
+import pygame
+import pygame.image
+import pygame.surfarray
+import pygame.transform
+
+from utils.vfs import asset_fs, AssetFS
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 2
+MANIFEST = "manifest.json"
+
+# Frame count at the end of sprite sheet names, as in Dude_Monster_Run_6.png. Plenty of single images end the same way,
+# like Frame_tile_33.png, so the count is only trusted for strips of that many square frames.
+_FRAMES = re.compile(r"_(\d+)\.png$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class BakedImage:
+    baked: str
+    signature: tp.Tuple[int, int]
+    sha1: str
+    size: tp.Tuple[int, int]
+    trim: tp.Tuple[int, int, int, int]
+    # Color, or palette index of 8 bit images, as palettes may hold the key color more than once
+    colorkey: tp.Optional[tp.Union[int, tp.Tuple[int, int, int, int]]]
+    frames: int
+    frame_size: tp.Tuple[int, int]
+
+
+def frame_count(path: str, size: tp.Tuple[int, int]) -> int:
+    """Frames of a horizontal sheet as its name says, 1 for images that are not sheets of square frames"""
+    match = _FRAMES.search(path)
+    if match is None:
+        return 1
+    frames = int(match.group(1))
+    width, height = size
+    return frames if frames and width == frames * height else 1
+
+
+def _colorkey(image: pygame.Surface, keyed: pygame.Surface) -> tp.Optional[tp.Union[int, tp.Tuple[int, int, int, int]]]:
+    colorkey = image.get_colorkey()
+    if colorkey is None or image.get_bitsize() != 8:
+        return tuple(colorkey) if colorkey else None
+    # The index of the pixels the colorkey makes transparent, rather than the first one of that color
+    indices = pygame.surfarray.array2d(image)[pygame.surfarray.array_alpha(keyed) == 0]
+    return int(indices[0]) if len(indices) else image.map_rgb(colorkey)
+
+
+def bake_image(path: str, output: str, fs: AssetFS = asset_fs) -> BakedImage:
+    """Scale the image at `path` the way `load_image` does, crop its transparent border and save it as a PNG"""
+    data = fs.read(path)
+    image = pygame.transform.scale2x(pygame.image.load(fs.source(path), pathlib.Path(path).name))
+    # Bounding rects of colorkeyed images compare colors, taking other indices of the key color for transparent
+    keyed = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    keyed.blit(image, (0, 0))
+    trim = keyed.get_bounding_rect()
+    if trim.width == 0:
+        trim = pygame.Rect(0, 0, 1, 1)
+
+    baked = pathlib.Path(path).with_suffix(".png").as_posix()
+    destination = os.path.join(output, baked)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    pygame.image.save(image.subsurface(trim), destination)
+
+    frames = frame_count(path, image.get_size())
+    return BakedImage(
+        baked=baked,
+        signature=tuple(fs.signature(path)),
+        sha1=hashlib.sha1(data).hexdigest(),
+        size=image.get_size(),
+        trim=tuple(trim),
+        colorkey=_colorkey(image, keyed),
+        frames=frames,
+        frame_size=(image.get_width() // frames, image.get_height()),
+    )
+
+
+def bake(directories: tp.Iterable[str], output: str, force: bool = False, fs: AssetFS = asset_fs) -> tp.Dict[str, BakedImage]:
+    """
+    Bake every PNG under `directories` into `output` and write its manifest.
+
+    Images whose source did not change since the last bake are skipped
+    unless `force` is set. Returns the manifest, by source path.
+    """
+    previous = {} if force else BakedAssets(output).entries
+    manifest = {}
+    baked = 0
+    for directory in directories:
+        for path in fs.walk(directory):
+            # Skipping the resource forks macOS leaves in archives
+            if not path.lower().endswith(".png") or "/__MACOSX/" in path:
+                continue
+            entry = previous.get(path)
+            if entry is None or entry.signature != tuple(fs.signature(path)) \
+                    or not os.path.exists(os.path.join(output, entry.baked)):
+                try:
+                    entry = bake_image(path, output, fs)
+                except pygame.error as e:
+                    logger.warning(f"Cannot bake {path}: {e}")
+                    continue
+                baked += 1
+            manifest[path] = entry
+
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, MANIFEST), "w") as f:
+        json.dump({"version": _VERSION, "images": {path: asdict(entry) for path, entry in manifest.items()}}, f)
+    logger.info(f"Baked {baked} of {len(manifest)} images into {output}")
+    return manifest
+
+
+class BakedAssets:
+    """
+    Manifest written by `bake`, read so that the next bake skips unchanged images.
+
+    The manifest is read on first use. A missing or outdated manifest has no
+    entries, everything is then baked again.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._entries: tp.Optional[tp.Dict[str, BakedImage]] = None
+
+    @property
+    def entries(self) -> tp.Dict[str, BakedImage]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(os.path.join(self.root, MANIFEST)) as f:
+                    manifest = json.load(f)
+                if manifest["version"] == _VERSION:
+                    self._entries = {
+                        path: BakedImage(**{k: tuple(v) if isinstance(v, list) else v for k, v in entry.items()})
+                        for path, entry in manifest["images"].items()
+                    }
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        return self._entries
@@ -0,0 +1,124 @@
+import json
+import time
+import platform
+import statistics
+import typing as tp
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Benchmark cases by name: generators that set up, yield the operation to time, then clean up
+_cases: tp.Dict[str, tp.Callable[[], tp.ContextManager[tp.Callable[[], tp.Any]]]] = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark case.
+
+    The decorated generator function prepares whatever the operation needs,
+    yields the operation as a callable taking no arguments and cleans up once
+    resumed. Only calls of the yielded callable are timed.
+    """
+    def register(case: tp.Callable[[], tp.Iterator[tp.Callable[[], tp.Any]]]):
+        if name in _cases:
+            raise ValueError(f"Benchmark '{name}' is already registered")
+        _cases[name] = contextmanager(case)
+        return case
+    return register
+
+
+def cases() -> tp.List[str]:
+    return list(_cases)
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    median: float
+    best: float
+    iterations: int
+    rounds: int
+
+    def __str__(self) -> str:
+        return f"{self.name:<32}{self.median * 1e6:12.2f} us{self.best * 1e6:12.2f} us  ({self.rounds} x {self.iterations})"
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: tp.Optional[float]
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Current best time over the baseline one, above 1 is slower"""
+        return self.current / self.baseline if self.baseline else float('nan')
+
+    def regressed(self, threshold: float) -> bool:
+        return self.baseline is not None and self.ratio > 1 + threshold
+
+    def __str__(self) -> str:
+        if self.baseline is None:
+            return f"{self.name:<32}{'new':>10}"
+        return f"{self.name:<32}{(self.ratio - 1) * 100:+9.1f}%"
+
+
+def measure(op: tp.Callable[[], tp.Any], rounds: int = 7, round_time: float = 0.02) -> tp.Tuple[float, float, int]:
+    """
+    Time `op`, returning the median and best time per call in seconds and the calls per round.
+
+    The calls per round double until a round takes `round_time`, so that the
+    timer resolution is negligible even for microsecond operations.
+    """
+    op()
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            op()
+        if time.perf_counter() - start >= round_time:
+            break
+        iterations *= 2
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            op()
+        times.append((time.perf_counter() - start) / iterations)
+    return statistics.median(times), min(times), iterations
+
+
+def run(names: tp.Optional[tp.Iterable[str]] = None, rounds: int = 7, round_time: float = 0.02) -> tp.List[Result]:
+    results = []
+    for name in (cases() if names is None else names):
+        with _cases[name]() as op:
+            median, best, iterations = measure(op, rounds, round_time)
+        result = Result(name, median, best, iterations, rounds)
+        logger.info(f"Benchmarked {result}")
+        results.append(result)
+    return results
+
+
+def compare(results: tp.Iterable[Result], baseline: tp.Dict[str, Result]) -> tp.List[Comparison]:
+    # Best times are compared, they are the least disturbed by whatever else the machine is doing
+    return [
+        Comparison(r.name, baseline[r.name].best if r.name in baseline else None, r.best)
+        for r in results
+    ]
+
+
+def save(results: tp.Iterable[Result], path: str) -> None:
+    data = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpu": platform.processor()},
+        "results": {r.name: asdict(r) for r in results},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load(path: str) -> tp.Dict[str, Result]:
+    with open(path) as f:
+        return {name: Result(**result) for name, result in json.load(f)["results"].items()}
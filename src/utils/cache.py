@@ -0,0 +1,120 @@
+import typing as tp
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+T = tp.TypeVar('T')
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    resident_bytes: int
+    budget: int
+
+
+class AssetCache:
+    """
+    Keyed LRU cache of decoded assets bounded by their approximate size in bytes.
+
+    Assets are loaded outside of the lock, so that a slow load only holds up
+    the callers waiting for that same key.
+    """
+    _entries: tp.OrderedDict[tp.Hashable, tp.Tuple[tp.Any, int]]
+    _loading: tp.Dict[tp.Hashable, threading.Event]
+
+    def __init__(self, budget: int):
+        self._budget = budget
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._resident = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: tp.Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: tp.Hashable, load: tp.Callable[[], T], size: tp.Callable[[T], int]) -> T:
+        """Return the cached asset for `key`, calling `load` and measuring it with `size` on a miss."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[0]
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    self._misses += 1
+                    loading = self._loading[key] = threading.Event()
+                    break
+
+            # Another caller is loading it, look again once it is done
+            loading.wait()
+
+        try:
+            asset = load()
+            nbytes = size(asset)
+            with self._lock:
+                # An asset put meanwhile wins, so that every caller shares one
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return entry[0]
+                self._insert(key, asset, nbytes)
+                return asset
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+
+    def put(self, key: tp.Hashable, asset: tp.Any, nbytes: int) -> bool:
+        """Cache an asset loaded elsewhere, unless `key` got loaded meanwhile. Returns whether it was added."""
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._insert(key, asset, nbytes)
+            return True
+
+    def pop(self, key: tp.Hashable) -> tp.Optional[tp.Any]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._resident -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._resident = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                resident_bytes=self._resident,
+                budget=self._budget,
+            )
+
+    def _insert(self, key: tp.Hashable, asset: tp.Any, nbytes: int) -> None:
+        self._entries[key] = (asset, nbytes)
+        self._resident += nbytes
+
+        # Evict least recently used entries, but always keep the one just loaded
+        while self._resident > self._budget and len(self._entries) > 1:
+            old_key, (_, old_bytes) = self._entries.popitem(last=False)
+            self._resident -= old_bytes
+            self._evictions += 1
+            logger.debug(f"Evicted {old_key} ({old_bytes} bytes) from asset cache")
@@ -0,0 +1,205 @@
+import time
+import queue
+import logging
+import typing as tp
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+FORMAT = '%(asctime)s - %(filename)s - %(levelname)s - %(message)s'
+
+
+class _Limit:
+    """Token bucket of one logger, refilled at `rate` records per second up to `burst`"""
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'suppressed')
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            self.suppressed += 1
+            return False
+        self.tokens -= 1
+        return True
+
+
+class _Sample:
+    """Lets through one record in `every`"""
+    __slots__ = ('every', 'count')
+
+    def __init__(self, every: int):
+        self.every = every
+        self.count = 0
+
+    def allow(self) -> bool:
+        self.count += 1
+        return (self.count - 1) % self.every == 0
+
+
+class ThrottleFilter(logging.Filter):
+    """
+    Rate limits or samples the records of chosen loggers and their children.
+
+    Records of other loggers always pass. The first record let through after
+    some were dropped mentions how many, so that the log shows the gap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._rules: tp.Dict[str, tp.Union[_Limit, _Sample]] = {}
+        self._resolved: tp.Dict[str, tp.Optional[tp.Union[_Limit, _Sample]]] = {}
+
+    def limit(self, name: str, rate: float, burst: int = 1) -> None:
+        self._rules[name] = _Limit(rate, burst)
+        self._resolved.clear()
+
+    def sample(self, name: str, every: int) -> None:
+        self._rules[name] = _Sample(every)
+        self._resolved.clear()
+
+    def _rule(self, name: str) -> tp.Optional[tp.Union[_Limit, _Sample]]:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        # Closest configured ancestor, as logger levels are inherited
+        rule, parent = None, name
+        while parent:
+            rule = self._rules.get(parent)
+            if rule is not None:
+                break
+            parent = parent.rpartition('.')[0]
+        self._resolved[name] = rule
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rule = self._rule(record.name)
+        if rule is None:
+            return True
+        if not rule.allow():
+            return False
+
+        if isinstance(rule, _Sample) and rule.every > 1:
+            record.msg = f"{record.msg} (1 in {rule.every} logged)"
+        elif isinstance(rule, _Limit) and rule.suppressed:
+            record.msg = f"{record.msg} ({rule.suppressed} similar suppressed)"
+            rule.suppressed = 0
+        return True
+
+
+class _RingQueueHandler(QueueHandler):
+    """Keeps every record in a ring before filtering, then queues the ones that pass"""
+
+    def __init__(self, records: queue.SimpleQueue, ring: tp.Deque[logging.LogRecord]):
+        super().__init__(records)
+        self.ring = ring
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        self.ring.append(record)
+        return super().handle(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The writer thread is in the same process, it formats the record itself
+        return record
+
+
+class _DumpHandler(logging.Handler):
+    """Writes the rings handed over by `LogBackend.dump`, and nothing else"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.setFormatter(logging.Formatter(FORMAT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        records = getattr(record, 'ring', None)
+        if records is None:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"--- {record.getMessage()}: last {len(records)} records ---\n")
+            for r in records:
+                f.write(self.format(r) + "\n")
+
+
+class _NotADump(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not hasattr(record, 'ring')
+
+
+class LogBackend:
+    """
+    Logging that never writes to disk on the calling thread.
+
+    Records are kept in a ring of the latest `ring_size`, throttled by
+    `throttle` and passed through an unbounded `queue.SimpleQueue` to a
+    writer thread. The writer formats them into `path`, rotated once it
+    reaches `max_bytes`. `dump` hands a copy of the ring to the writer, to
+    append to the hitch log regardless of throttling and file level.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        level: int = logging.DEBUG,
+        max_bytes: int = 4 * 1024 * 1024,
+        backups: int = 3,
+        ring_size: int = 2000,
+        dump_interval: float = 5.0,
+    ):
+        self.level = level
+        self.dump_interval = dump_interval
+        self.ring: tp.Deque[logging.LogRecord] = deque(maxlen=ring_size)
+        self.throttle = ThrottleFilter()
+
+        self._queue = queue.SimpleQueue()
+        self._handler = _RingQueueHandler(self._queue, self.ring)
+        self._handler.addFilter(self.throttle)
+
+        file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        file_handler.setFormatter(logging.Formatter(FORMAT))
+        file_handler.addFilter(_NotADump())
+        self.hitch_path = f"{path.rsplit('.', 1)[0]}.hitch.log"
+        self._listener = QueueListener(self._queue, file_handler, _DumpHandler(self.hitch_path))
+        self._last_dump = float('-inf')
+        self._started = False
+
+    def start(self) -> 'LogBackend':
+        """Route the records of every logger through this backend"""
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self._handler)
+        self._listener.start()
+        self._started = True
+        return self
+
+    def stop(self) -> None:
+        """Detach from the root logger and wait for the writer to flush everything queued"""
+        logging.getLogger().removeHandler(self._handler)
+        if self._started:
+            self._listener.stop()
+            self._started = False
+        for handler in self._listener.handlers:
+            handler.close()
+
+    def dump(self, reason: str) -> bool:
+        """
+        Append the ring to the hitch log, unless another dump happened less than `dump_interval` seconds ago.
+
+        Returns whether the ring was dumped.
+        """
+        now = time.monotonic()
+        if now - self._last_dump < self.dump_interval:
+            return False
+        self._last_dump = now
+
+        record = logging.LogRecord(__name__, logging.WARNING, __file__, 0, reason, None, None)
+        record.ring = list(self.ring)
+        self._queue.put_nowait(record)
+        return True
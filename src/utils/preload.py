@@ -0,0 +1,100 @@
+import threading
+import typing as tp
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from utils import preload_image
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """
+    Assets a scene needs before it can be built without waiting on disk.
+
+    `tasks` are any other preparation that is safe to run off the main
+    thread, eg. compiling a level, each under a name identifying it. Fonts
+    are not listed: FreeType is not thread safe, they are small enough to
+    be loaded where they are used.
+    """
+    images: tp.Tuple[str, ...] = ()
+    tasks: tp.Tuple[tp.Tuple[str, tp.Callable[[], tp.Any]], ...] = ()
+
+    def __add__(self, other: 'AssetManifest') -> 'AssetManifest':
+        return AssetManifest(self.images + other.images, self.tasks + other.tasks)
+
+
+class Progress:
+    """Completion of the loads started for one manifest"""
+
+    def __init__(self, futures: tp.List[Future]):
+        self._futures = futures
+
+    @property
+    def total(self) -> int:
+        return len(self._futures)
+
+    @property
+    def completed(self) -> int:
+        return sum(future.done() for future in self._futures)
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self._futures else 1.0
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    @property
+    def failed(self) -> int:
+        return sum(future.done() and not future.cancelled() and future.exception() is not None for future in self._futures)
+
+    def wait(self, timeout: tp.Optional[float] = None) -> bool:
+        """Block until every load finished, returning False if `timeout` seconds passed first"""
+        _, pending = wait(self._futures, timeout)
+        return not pending
+
+
+class Preloader:
+    """
+    Decodes assets into the asset cache on a pool of worker threads.
+
+    Manifests listing an asset that is being loaded share that load. Loads
+    that finished run again, which only checks the cache for assets still
+    there, so that evicted ones are loaded anew. A load that fails is logged and
+    otherwise ignored, the asset is then loaded, and fails, where it is used.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="preload")
+        self._futures: tp.Dict[tp.Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def load(self, manifest: AssetManifest) -> Progress:
+        """Start loading everything `manifest` lists, in order"""
+        loads = [(("image", str(path)), preload_image, (path,)) for path in manifest.images]
+        loads += [(("task", name), task, ()) for name, task in manifest.tasks]
+
+        futures = []
+        with self._lock:
+            for key, load, args in loads:
+                future = self._futures.get(key)
+                if future is None or future.done():
+                    future = self._futures[key] = self._executor.submit(self._run, key, load, *args)
+                futures.append(future)
+        return Progress(futures)
+
+    @staticmethod
+    def _run(key, load, *args) -> None:
+        try:
+            load(*args)
+        except Exception:
+            logger.exception(f"Preloading {key} failed")
+            raise
+
+    def shutdown(self) -> None:
+        """Drop pending loads and wait for the running ones"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,111 @@
+import time
+import typing as tp
+from contextlib import nullcontext
+
+import numpy as np
+
+from utils.trace import tracer
+
+# Returned by disabled profilers, entering it does nothing
+_DISABLED = nullcontext()
+
+
+class _Scope:
+    __slots__ = ('_totals', '_name', '_start')
+
+    def __init__(self, totals: tp.Optional[tp.Dict[str, float]], name: str):
+        self._totals = totals
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        if self._totals is not None:
+            self._totals[self._name] = self._totals.get(self._name, 0.0) + (end - self._start) / 1e9
+        tracer.complete(self._name, self._start, end, "frame")
+
+
+class Profiler:
+    """
+    Per frame timings of named scopes, kept in ring buffers of the last `history` frames.
+
+    Wrap a stage in ``with profiler.scope("name"):`` and call `end_frame` once
+    per frame. A scope entered several times in a frame accounts for its total.
+    Scopes are also streamed to `utils.trace.tracer` while it is active,
+    whether the profiler is enabled or not. Otherwise, while disabled, `scope`
+    hands out a shared no-op context manager and nothing is recorded.
+    """
+    FRAME = "frame"
+
+    def __init__(self, history: int = 240):
+        self.history = history
+        self._enabled = False
+        self._rings: tp.Dict[str, np.ndarray] = {}
+        self._totals: tp.Dict[str, float] = {}
+        self._frames = 0
+        self._frame_start = time.perf_counter_ns()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        if enabled and not self._enabled:
+            self.reset()
+        self._enabled = enabled
+
+    def reset(self) -> None:
+        self._rings.clear()
+        self._totals.clear()
+        self._frames = 0
+        self._frame_start = time.perf_counter_ns()
+
+    def scope(self, name: str) -> tp.ContextManager:
+        if self._enabled:
+            return _Scope(self._totals, name)
+        if tracer.active:
+            return _Scope(None, name)
+        return _DISABLED
+
+    def end_frame(self) -> None:
+        now = time.perf_counter_ns()
+        tracer.complete(Profiler.FRAME, self._frame_start, now, "frame")
+        if self._enabled:
+            self._totals[Profiler.FRAME] = (now - self._frame_start) / 1e9
+            i = self._frames % self.history
+            for name in self._totals:
+                if name not in self._rings:
+                    # Frames from before the scope first ran are unknown rather than free
+                    self._rings[name] = np.full(self.history, np.nan)
+            for name, ring in self._rings.items():
+                ring[i] = self._totals.get(name, 0.0)
+            self._totals.clear()
+            self._frames += 1
+        self._frame_start = now
+
+    @property
+    def names(self) -> tp.List[str]:
+        """Scopes recorded so far, in the order they first ran"""
+        return list(self._rings)
+
+    def percentiles(self, name: str, q: tp.Sequence[float] = (50, 95, 99)) -> np.ndarray:
+        """Percentiles of the recorded timings of a scope, in milliseconds"""
+        ring = self._rings.get(name)
+        if ring is None or np.isnan(ring).all():
+            return np.full(len(q), np.nan)
+        return np.nanpercentile(ring, q) * 1000
+
+    def timings(self, name: str = FRAME) -> np.ndarray:
+        """Recorded timings of a scope in milliseconds, oldest first"""
+        ring = self._rings.get(name)
+        if ring is None:
+            return np.empty(0)
+        ordered = np.roll(ring, -(self._frames % self.history)) * 1000
+        return ordered[~np.isnan(ordered)]
+
+
+profiler = Profiler()
@@ -0,0 +1,185 @@
+import math
+import typing as tp
+
+from pygame import Rect
+
+T = tp.TypeVar('T', bound=tp.Hashable)
+
+Cell = tp.Tuple[int, int]
+CellRange = tp.Tuple[int, int, int, int]
+
+
+def rect_distance(rect: Rect, point: tp.Tuple[float, float]) -> float:
+    """Distance from `point` to the closest point of `rect`, 0 if inside"""
+    x, y = point
+    dx = max(rect.left - x, 0, x - rect.right)
+    dy = max(rect.top - y, 0, y - rect.bottom)
+    return math.hypot(dx, dy)
+
+
+class SpatialHash(tp.Generic[T]):
+    """
+    Uniform grid of square cells mapping each cell to the items whose rect overlaps it.
+
+    Items are re-bucketed only when their rect moves to a different range of
+    cells, so keeping the grid in sync with moving sprites is cheap. Queries
+    look at the few cells around their area instead of every item.
+    """
+    _cells: tp.Dict[Cell, tp.Set[T]]
+    _items: tp.Dict[T, tp.Tuple[Rect, CellRange]]
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._items = {}
+        # Grows but never shrinks, only used to bound the nearest neighbour search
+        self._bounds: tp.Optional[CellRange] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._items
+
+    def _cell_range(self, rect: Rect) -> CellRange:
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size if rect.width else rect.left // size,
+            (rect.bottom - 1) // size if rect.height else rect.top // size,
+        )
+
+    def insert(self, item: T, rect: Rect) -> None:
+        """Add `item` covering `rect`, or move it there if it is already indexed"""
+        cells = self._cell_range(rect)
+        entry = self._items.get(item)
+        if entry is not None:
+            if entry[1] == cells:
+                self._items[item] = (Rect(rect), cells)
+                return
+            self._unlink(item, entry[1])
+
+        self._items[item] = (Rect(rect), cells)
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(item)
+
+        if self._bounds is None:
+            self._bounds = cells
+        else:
+            bx0, by0, bx1, by1 = self._bounds
+            self._bounds = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+
+    update = insert
+
+    def remove(self, item: T) -> None:
+        entry = self._items.pop(item, None)
+        if entry is not None:
+            self._unlink(item, entry[1])
+
+    def _unlink(self, item: T, cells: CellRange) -> None:
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells[cx, cy]
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cx, cy]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._items.clear()
+        self._bounds = None
+
+    def sync(self, sprites: tp.Iterable[T]) -> None:
+        """Make the index match `sprites` and their current rects, touching only what changed"""
+        seen = set()
+        for sprite in sprites:
+            seen.add(sprite)
+            self.insert(sprite, sprite.rect)
+        for item in [item for item in self._items if item not in seen]:
+            self.remove(item)
+
+    def rect(self, item: T) -> Rect:
+        return self._items[item][0]
+
+    def _candidates(self, cells: CellRange) -> tp.Set[T]:
+        found = set()
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    found |= bucket
+        return found
+
+    def query_rect(self, rect: Rect) -> tp.List[T]:
+        """Items whose rect overlaps `rect`"""
+        rect = Rect(rect)
+        return [item for item in self._candidates(self._cell_range(rect)) if rect.colliderect(self._items[item][0])]
+
+    def query_radius(self, point: tp.Tuple[float, float], radius: float) -> tp.List[T]:
+        """Items whose rect is within `radius` of `point`"""
+        x, y = point
+        size = self.cell_size
+        cells = (
+            math.floor((x - radius) / size),
+            math.floor((y - radius) / size),
+            math.floor((x + radius) / size),
+            math.floor((y + radius) / size),
+        )
+        return [item for item in self._candidates(cells) if rect_distance(self._items[item][0], point) <= radius]
+
+    def nearest(
+        self,
+        point: tp.Tuple[float, float],
+        max_distance: float = math.inf,
+        exclude: tp.Container[T] = (),
+    ) -> tp.Optional[T]:
+        """Item whose rect is closest to `point`, searching rings of cells outwards"""
+        if self._bounds is None:
+            return None
+
+        size = self.cell_size
+        px, py = math.floor(point[0] / size), math.floor(point[1] / size)
+        bx0, by0, bx1, by1 = self._bounds
+        max_ring = max(px - bx0, bx1 - px, py - by0, by1 - py, 0)
+
+        best, best_distance = None, max_distance
+        seen = set()
+        for ring in range(max_ring + 1):
+            # Anything not found yet lies in an outer ring, at least this far away
+            if best_distance <= (ring - 1) * size:
+                break
+
+            for cell in self._ring(px, py, ring):
+                for item in self._cells.get(cell, ()):
+                    if item in seen or item in exclude:
+                        continue
+                    seen.add(item)
+                    distance = rect_distance(self._items[item][0], point)
+                    if distance < best_distance or (best is None and distance <= best_distance):
+                        best, best_distance = item, distance
+        return best
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> tp.Iterator[Cell]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield x, cy - ring
+            yield x, cy + ring
+        for y in range(cy - ring + 1, cy + ring):
+            yield cx - ring, y
+            yield cx + ring, y
+
+
+def collide(sprites: tp.Iterable[T], index: SpatialHash) -> tp.Iterator[tp.Tuple[T, tp.List]]:
+    """Pairs of each sprite with the indexed items overlapping its rect, skipping sprites without any"""
+    for sprite in sprites:
+        hits = index.query_rect(sprite.rect)
+        if hits:
+            yield sprite, hits
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import threading
+import typing as tp
+from contextlib import nullcontext
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Returned by inactive tracers, entering it does nothing
+_INACTIVE = nullcontext()
+
+
+class _Span:
+    __slots__ = ('_tracer', '_name', '_cat', '_track', '_start')
+
+    def __init__(self, tracer: 'Tracer', name: str, cat: str, track: tp.Optional[str]):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._track = track
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._tracer.complete(self._name, self._start, time.perf_counter_ns(), self._cat, self._track)
+
+
+class Tracer:
+    """
+    Streams trace events to a JSON file that loads in chrome://tracing and Perfetto.
+
+    Events are written as they happen, from any thread, each on the track of
+    the thread that emitted it. Events given a `track` name go to a separate
+    track per name and thread instead, so that for example asset loads do not
+    hide the frame scopes they happen in. Timestamps are `time.perf_counter_ns`
+    values, relative to when the trace was opened.
+    """
+
+    def __init__(self):
+        self._file: tp.Optional[tp.TextIO] = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._origin = 0
+        self._tracks: tp.Dict[tp.Tuple[int, tp.Optional[str]], int] = {}
+        self._events = 0
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    def open(self, path: str) -> None:
+        self.close()
+        self._file = open(path, "w")
+        self._file.write("[\n")
+        self._origin = time.perf_counter_ns()
+        self._tracks.clear()
+        self._events = 0
+        self._write({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "Flow Heroes"}})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write("\n]\n")
+            self._file.close()
+            self._file = None
+        logger.info(f"Traced {self._events} events")
+
+    def span(self, name: str, cat: str = "", track: tp.Optional[str] = None) -> tp.ContextManager:
+        """Context manager recording its duration as a complete event"""
+        if self._file is None:
+            return _INACTIVE
+        return _Span(self, name, cat, track)
+
+    def complete(self, name: str, start_ns: int, end_ns: int, cat: str = "", track: tp.Optional[str] = None, **args) -> None:
+        """Record an event that ran from `start_ns` to `end_ns`, in `time.perf_counter_ns` units"""
+        if self._file is None:
+            return
+        # Spans that started before the trace did are cut at its beginning
+        start_ns = max(start_ns, self._origin)
+        event = {
+            "name": name, "cat": cat, "ph": "X", "pid": self._pid, "tid": self._tid(track),
+            "ts": (start_ns - self._origin) / 1000, "dur": (end_ns - start_ns) / 1000,
+        }
+        if args:
+            event["args"] = args
+        self._write(event)
+
+    def flow(self, name: str, flow_id: int, start: bool, cat: str = "flow") -> None:
+        """
+        Start or end an arrow between two events on any tracks, eg. from producing an input to using it.
+
+        Both ends must be emitted while the events they bind to are running.
+        """
+        if self._file is None:
+            return
+        event = {
+            "name": name, "cat": cat, "ph": "s" if start else "f", "id": flow_id, "pid": self._pid,
+            "tid": self._tid(None), "ts": (time.perf_counter_ns() - self._origin) / 1000,
+        }
+        if not start:
+            event["bp"] = "e"
+        self._write(event)
+
+    def _tid(self, track: tp.Optional[str]) -> int:
+        thread = threading.current_thread()
+        key = (thread.ident, track)
+        tid = self._tracks.get(key)
+        if tid is None:
+            with self._lock:
+                tid = self._tracks.setdefault(key, len(self._tracks) + 1)
+            name = thread.name if track is None else f"{track} ({thread.name})"
+            self._write({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}})
+        return tid
+
+    def _write(self, event: dict) -> None:
+        line = json.dumps(event, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            if self._events:
+                self._file.write(",\n")
+            self._file.write(line)
+            self._events += 1
+
+
+tracer = Tracer()
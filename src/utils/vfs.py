@@ -0,0 +1,154 @@
+import io
+import os
+import json
+import logging
+import threading
+import typing as tp
+import zipfile
+
+from constants import PROJECT_ROOT, CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = os.path.join(CACHE_ROOT, "vfs")
+
+# Archive, chain of nested archive names, member name, CRC and size of an archived file
+_Entry = tp.Tuple[str, tp.Tuple[str, ...], str, int, int]
+
+
+class AssetFS:
+    """
+    Read-only view of the project files that also serves files straight out of (nested) zip archives.
+
+    Files on disk take precedence over archive members. Archives are laid out as
+    if extracted recursively into the mount point: every member of the archive
+    and of the archives nested inside it appears directly under it.
+    """
+    _index: tp.Dict[str, _Entry]
+    _archives: tp.Dict[tp.Tuple[str, ...], zipfile.ZipFile]
+
+    def __init__(self, root: str = PROJECT_ROOT, cache_dir: str = _CACHE_DIR):
+        self._root = root
+        self._cache_dir = cache_dir
+        self._index = {}
+        self._archives = {}
+        self._lock = threading.RLock()
+
+    def mount_all(self, archives: tp.Dict[str, str]) -> None:
+        """Mount every archive of a `{mount_point: archive}` mapping that exists"""
+        for mount_point, archive in archives.items():
+            if os.path.exists(os.path.join(self._root, archive)):
+                self.mount(archive, mount_point)
+
+    def _normalize(self, path) -> str:
+        path = os.path.normpath(os.path.join(self._root, path))
+        return os.path.relpath(path, self._root).replace(os.sep, "/")
+
+    def mount(self, archive: str, mount_point: str) -> int:
+        """Index `archive` under `mount_point` and return the number of files it provides."""
+        archive = self._normalize(archive)
+        mount_point = self._normalize(mount_point)
+        stat = os.stat(os.path.join(self._root, archive))
+        signature = [stat.st_mtime_ns, stat.st_size, mount_point]
+        cache_path = os.path.join(self._cache_dir, archive.replace("/", "_") + ".json")
+
+        members = None
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if cached["signature"] == signature:
+                members = {
+                    path: (archive, tuple(chain), member, crc, size)
+                    for path, (chain, member, crc, size) in cached["members"].items()
+                }
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if members is None:
+            members = {}
+            with self._lock:
+                self._index_archive(archive, (), mount_point, members)
+            try:
+                os.makedirs(self._cache_dir, exist_ok=True)
+                with open(cache_path, "w") as f:
+                    json.dump({
+                        "signature": signature,
+                        "members": {path: entry[1:] for path, entry in members.items()},
+                    }, f)
+            except OSError as e:
+                logger.warning(f"Cannot cache index of {archive}: {e}")
+
+        self._index.update(members)
+        logger.info(f"Mounted {archive} at {mount_point} ({len(members)} files)")
+        return len(members)
+
+    def _index_archive(self, archive: str, chain: tp.Tuple[str, ...], mount_point: str, members: tp.Dict[str, _Entry]):
+        zip_file = self._open_archive(archive, chain)
+        for info in zip_file.infolist():
+            if info.is_dir():
+                continue
+            if info.filename.lower().endswith(".zip"):
+                self._index_archive(archive, chain + (info.filename,), mount_point, members)
+            else:
+                members.setdefault(f"{mount_point}/{info.filename}", (archive, chain, info.filename, info.CRC, info.file_size))
+
+    def _open_archive(self, archive: str, chain: tp.Tuple[str, ...]) -> zipfile.ZipFile:
+        key = (archive,) + chain
+        zip_file = self._archives.get(key)
+        if zip_file is None:
+            if chain:
+                parent = self._open_archive(archive, chain[:-1])
+                zip_file = zipfile.ZipFile(io.BytesIO(parent.read(chain[-1])))
+            else:
+                zip_file = zipfile.ZipFile(os.path.join(self._root, archive))
+            self._archives[key] = zip_file
+        return zip_file
+
+    def exists(self, path) -> bool:
+        path = self._normalize(path)
+        return path in self._index or os.path.isfile(os.path.join(self._root, path))
+
+    def walk(self, directory) -> tp.List[str]:
+        """Every file under `directory`, on disk or in an archive, as project relative paths"""
+        directory = self._normalize(directory)
+        files = {path for path in self._index if path.startswith(directory + "/")}
+        for root, _, names in os.walk(os.path.join(self._root, directory)):
+            files.update(self._normalize(os.path.join(root, name)) for name in names)
+        return sorted(files)
+
+    def read(self, path) -> bytes:
+        path = self._normalize(path)
+        real_path = os.path.join(self._root, path)
+        if os.path.isfile(real_path):
+            with open(real_path, "rb") as f:
+                return f.read()
+
+        entry = self._index.get(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        archive, chain, member, _, _ = entry
+        with self._lock:
+            return self._open_archive(archive, chain).read(member)
+
+    def source(self, path) -> tp.Union[str, tp.BinaryIO]:
+        """Return a path on disk if the file is there, or an in-memory file read from its archive."""
+        real_path = os.path.join(self._root, self._normalize(path))
+        if os.path.isfile(real_path):
+            return real_path
+        return io.BytesIO(self.read(path))
+
+    def signature(self, path) -> tp.Tuple[int, int]:
+        """Modification time (CRC for archive members) and size of a file, to detect changes to cached derivatives."""
+        path = self._normalize(path)
+        real_path = os.path.join(self._root, path)
+        if os.path.isfile(real_path):
+            stat = os.stat(real_path)
+            return stat.st_mtime_ns, stat.st_size
+
+        entry = self._index.get(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry[3], entry[4]
+
+
+asset_fs = AssetFS()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from controls.gestures import HandFeatures, HandLandmark as L
+from controls.gestures.movement import GestureLeft, GestureRight, GestureUp, GestureDown
+from controls.gestures.spells import GesturePray
+
+
+def pointing_hand(direction, wrist=(0.5, 0.5)):
+    """A hand with the index finger and the thumb pointing along the given 2D direction"""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, :2] = wrist
+    hand[L.INDEX_FINGER_TIP, :2] += np.array(direction) * 0.1
+    hand[L.THUMB_TIP, :2] += np.array(direction) * 0.1
+    return hand
+
+
+def praying_hand():
+    """A flat hand with every finger extended straight up from the wrist"""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = 0.5
+    hand[L.WRIST, 1] = 0.9
+    hand[L.THUMB_MCP:L.THUMB_TIP + 1, 1] = np.linspace(0.7, 0.4, 3)
+    for mcp in (L.INDEX_FINGER_MCP, L.MIDDLE_FINGER_MCP, L.RING_FINGER_MCP, L.PINKY_MCP):
+        hand[mcp:mcp + 4, 1] = np.linspace(0.7, 0.4, 4)
+    return hand
+
+
+class TestHandFeatures(unittest.TestCase):
+    def test_shapes(self):
+        hands = HandFeatures(np.random.rand(3, 21, 3))
+        self.assertEqual(len(hands), 3)
+        self.assertEqual(hands.pointing.shape, (3, 2, 3))
+        self.assertEqual(hands.tip_to_wrist.shape, (3, 5))
+
+    def test_degenerate_hand_does_not_divide_by_zero(self):
+        hands = HandFeatures(np.zeros((1, 21, 3)))
+        np.testing.assert_array_equal(hands.pointing, 0)
+
+    def test_sides(self):
+        self.assertIsNone(HandFeatures(pointing_hand((1, 0), wrist=(0.2, 0.5))).sides)
+        hands = HandFeatures(np.stack([pointing_hand((1, 0), wrist=(0.8, 0.5)), pointing_hand((1, 0), wrist=(0.2, 0.5))]))
+        self.assertEqual(hands.sides, (1, 0))
+
+
+class TestMovementGestures(unittest.TestCase):
+    def test_scores_every_hand(self):
+        hands = HandFeatures(np.stack([pointing_hand((1, 0)), pointing_hand((0, -1))]))
+        np.testing.assert_allclose(GestureLeft().score(hands), [1, 0], atol=1e-6)
+        np.testing.assert_allclose(GestureRight().score(hands), [-1, 0], atol=1e-6)
+        np.testing.assert_allclose(GestureUp().score(hands), [0, 1], atol=1e-6)
+        np.testing.assert_allclose(GestureDown().score(hands), [0, -1], atol=1e-6)
+
+    def test_no_hands(self):
+        self.assertEqual(GestureLeft().score(HandFeatures(np.zeros((0, 21, 3)))).shape, (0,))
+
+
+class TestGesturePray(unittest.TestCase):
+    def test_needs_two_hands(self):
+        np.testing.assert_array_equal(GesturePray().score(HandFeatures(praying_hand())), [0])
+
+    def test_joined_hands(self):
+        hands = HandFeatures(np.stack([praying_hand(), praying_hand()]))
+        np.testing.assert_allclose(GesturePray().score(hands), [1, 1])
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from controls import Controls, Input
+from controls.hotswap import HotSwapControls
+
+
+class StaticControls(Controls):
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.closed = False
+
+    def get_inputs(self):
+        return self.inputs
+
+    def close(self):
+        self.closed = True
+
+
+class TestHotSwapControls(unittest.TestCase):
+    def test_fallback_serves_until_ready(self):
+        release = threading.Event()
+
+        def factory():
+            release.wait()
+            return StaticControls([Input.SUN_STRIKE])
+
+        controls = HotSwapControls(StaticControls([Input.LEFT]), factory)
+        self.assertEqual(controls.get_inputs(), [Input.LEFT])
+
+        release.set()
+        self.assertTrue(controls.wait(5))
+        self.assertTrue(controls.swapped)
+        self.assertEqual(controls.get_inputs(), [Input.SUN_STRIKE])
+
+    def test_failed_initialization_keeps_fallback(self):
+        def factory():
+            raise OSError("no camera")
+
+        controls = HotSwapControls(StaticControls([Input.LEFT]), factory)
+        self.assertTrue(controls.wait(5))
+        self.assertFalse(controls.swapped)
+        self.assertEqual(controls.get_inputs(), [Input.LEFT])
+
+    def test_any_failure_keeps_fallback(self):
+        def factory():
+            raise RuntimeError("no hands")
+
+        with self.assertLogs("controls.hotswap", "ERROR"):
+            controls = HotSwapControls(StaticControls([Input.LEFT]), factory)
+            self.assertTrue(controls.wait(5))
+        self.assertFalse(controls.swapped)
+
+    def test_controls_built_after_close_are_closed(self):
+        release = threading.Event()
+        built = StaticControls([Input.SUN_STRIKE])
+
+        def factory():
+            release.wait()
+            return built
+
+        fallback = StaticControls([Input.LEFT])
+        controls = HotSwapControls(fallback, factory)
+        controls.close()
+        release.set()
+        self.assertTrue(controls.wait(5))
+
+        self.assertTrue(fallback.closed)
+        self.assertTrue(built.closed)
+        self.assertFalse(controls.swapped)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import sys
+import unittest
+from unittest import mock
+
+import pygame.camera
+
+from controls.recognizer import Recognizer
+
+
+class TestRecognizer(unittest.TestCase):
+    def test_camera_is_stopped_when_mediapipe_is_missing(self):
+        camera = mock.Mock()
+        camera.get_size.return_value = (64, 48)
+        with mock.patch.object(pygame.camera, "init"), \
+                mock.patch.object(pygame.camera, "list_cameras", return_value=["/dev/video0"]), \
+                mock.patch.object(pygame.camera, "Camera", return_value=camera), \
+                mock.patch.dict(sys.modules, {"mediapipe": None}):
+            with self.assertRaises(ImportError):
+                Recognizer()
+        camera.start.assert_called_once()
+        camera.stop.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
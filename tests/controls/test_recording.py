@@ -0,0 +1,77 @@
+import os
+import random
+import tempfile
+import unittest
+
+from controls import Input
+from controls.recording import RecordingControls, ReplayControls
+from controls.scripted import ScriptedControls, patrol
+from core.simulation import Simulation
+
+
+def snapshot(level):
+    return [tuple(entity.body.position) for entity in level.bodies], [spell.rect.topleft for spell in level.spells]
+
+
+class TestRecording(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip_is_compact(self):
+        script = [[Input.LEFT]] * 100 + [[Input.SUN_STRIKE, Input.RIGHT]] + [[]] * 50
+        recorder = RecordingControls(ScriptedControls(script, repeat=False), self.path)
+        for dt in [16] * 120 + [33] * 31:
+            recorder.tick(dt)
+            recorder.get_inputs()
+        recorder.close()
+
+        self.assertLess(os.path.getsize(self.path), 64)
+        replay = ReplayControls(self.path)
+        self.assertEqual(replay.frames, 151)
+
+        frames = []
+        while not replay.finished:
+            dt = replay.next_dt
+            frames.append((dt, set(replay.get_inputs())))
+        self.assertEqual(frames[0], (16, {Input.LEFT}))
+        self.assertEqual(frames[100], (16, {Input.SUN_STRIKE, Input.RIGHT}))
+        self.assertEqual(frames[-1], (33, set()))
+
+    def test_long_frames_are_recorded(self):
+        recorder = RecordingControls(ScriptedControls([[Input.LEFT]], repeat=False), self.path)
+        recorder.tick(24 * 60 * 60 * 1000)
+        recorder.get_inputs()
+        recorder.close()
+
+        replay = ReplayControls(self.path)
+        self.assertEqual(replay.next_dt, 24 * 60 * 60 * 1000)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a recording")
+        with self.assertRaises(ValueError):
+            ReplayControls(self.path)
+
+    def test_session_replays_exactly(self):
+        # Frame times jitter like in a real session
+        rng = random.Random(1)
+        simulation = Simulation(RecordingControls(patrol(16), self.path), draw=False)
+        try:
+            simulation.run_frame_times(rng.choice([8, 16, 17, 33, 120]) for _ in range(600))
+            recorded = snapshot(simulation.level)
+        finally:
+            simulation.close()
+
+        simulation = Simulation(ReplayControls(self.path), draw=False)
+        try:
+            report = simulation.replay()
+            replayed = snapshot(simulation.level)
+        finally:
+            simulation.close()
+
+        self.assertEqual(report.frames, 600)
+        self.assertEqual(replayed, recorded)
@@ -0,0 +1,21 @@
+import unittest
+
+from controls import Input
+from controls.scripted import ScriptedControls
+
+
+class TestScriptedControls(unittest.TestCase):
+    def test_one_entry_per_frame(self):
+        controls = ScriptedControls([[Input.LEFT], [], [Input.RIGHT]], repeat=False)
+        self.assertEqual([controls.get_inputs() for _ in range(4)], [[Input.LEFT], [], [Input.RIGHT], []])
+
+    def test_repeat(self):
+        controls = ScriptedControls([[Input.LEFT], [Input.RIGHT]])
+        self.assertEqual([controls.get_inputs() for _ in range(3)], [[Input.LEFT], [Input.RIGHT], [Input.LEFT]])
+
+    def test_timeline(self):
+        controls = ScriptedControls.timeline([(20, [Input.UP]), (0, [Input.DOWN])], duration=50, dt=10)
+        self.assertEqual(
+            [controls.get_inputs() for _ in range(5)],
+            [[Input.DOWN], [Input.DOWN], [Input.UP], [Input.UP], [Input.UP]],
+        )
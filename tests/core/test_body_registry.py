@@ -0,0 +1,54 @@
+import unittest
+
+from pymunk import Space, Poly
+
+from core.entity import BodyRegistry, PhysicalEntity
+
+
+class Crate(PhysicalEntity):
+    def __init__(self, *groups):
+        super().__init__(*groups, name='crate')
+        self._fsm = None
+
+
+def register_crate(registry: BodyRegistry) -> Crate:
+    crate = Crate()
+    shape = Poly.create_box(crate.body, (10, 10))
+    shape.mass = 1
+    registry.register(crate, shape)
+    return crate
+
+
+class TestBodyRegistry(unittest.TestCase):
+    def setUp(self):
+        self.space = Space()
+        self.registry = BodyRegistry(self.space)
+
+    def test_changes_wait_for_flush(self):
+        crate = register_crate(self.registry)
+        self.assertEqual(len(self.space.bodies), 0)
+
+        self.registry.flush()
+        self.assertEqual(list(self.space.bodies), [crate.body])
+        self.assertEqual(len(self.space.shapes), 1)
+
+    def test_killed_entity_is_reclaimed(self):
+        crates = [register_crate(self.registry) for _ in range(3)]
+        self.registry.flush()
+        self.space.step(0.01)
+
+        crates[0].kill()
+        crates[0].kill()
+        self.assertEqual(len(self.space.bodies), 3)
+
+        self.registry.flush()
+        self.assertEqual(len(self.space.bodies), 2)
+        self.assertEqual(len(self.space.shapes), 2)
+        stats = self.registry.stats()
+        self.assertEqual((stats.live, stats.added, stats.reclaimed), (2, 3, 1))
+
+    def test_killed_before_flush_never_enters_space(self):
+        register_crate(self.registry).kill()
+        self.registry.flush()
+        self.assertEqual(len(self.space.bodies), 0)
+        self.assertEqual(self.registry.stats().reclaimed, 0)
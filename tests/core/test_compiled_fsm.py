@@ -0,0 +1,103 @@
+import unittest
+from enum import auto
+
+from core.fsm import FSMTable, State
+
+
+class LampState(State):
+    ON = auto()
+    OFF = auto()
+
+
+class Lamp:
+    fsm_table = FSMTable(LampState, {
+        LampState.INIT: '_state_init',
+        LampState.ON: '_state_on',
+        LampState.OFF: '_state_off',
+    })
+
+    def __init__(self):
+        self.fsm = Lamp.fsm_table.bind(self)
+        self.toggles = 0
+
+    def _state_init(self, *args, **kwargs):
+        return LampState.ON
+
+    def _state_on(self, *args, **kwargs):
+        self.toggles += kwargs.get('times', 1)
+        return LampState.OFF
+
+    def _state_off(self, *args, **kwargs):
+        return LampState.ON
+
+
+class BrokenLamp(Lamp):
+    def _state_on(self, *args, **kwargs):
+        return LampState.DEAD
+
+
+class StickyLamp(Lamp):
+    def __init__(self):
+        super().__init__()
+        self.entered_from = []
+
+    def _state_off(self, *args, **kwargs):
+        self.entered_from.append(self.fsm.previous_state)
+        return LampState.OFF
+
+
+class TestCompiledFSM(unittest.TestCase):
+    def test_same_interface_as_finite_state_machine(self):
+        lamp = Lamp()
+        self.assertEqual(lamp.fsm.state, LampState.INIT)
+        self.assertIs(lamp.fsm.states, LampState)
+
+        lamp.fsm.update()
+        self.assertEqual(lamp.fsm.state, LampState.ON)
+        self.assertEqual(lamp.fsm.previous_state, LampState.INIT)
+        self.assertEqual(lamp.fsm.transitions[LampState.ON], lamp._state_on)
+
+        lamp.fsm.state = LampState.DEAD
+        self.assertEqual(lamp.fsm.state, LampState.DEAD)
+
+    def test_init_and_enum_member_with_equal_value_are_distinct(self):
+        self.assertEqual(LampState.ON.value, LampState.INIT)
+        lamp = Lamp()
+        lamp.fsm.update()
+        self.assertIsNot(lamp.fsm.state, LampState.INIT)
+
+    def test_missing_transition_raises_key_error(self):
+        lamp = BrokenLamp()
+        lamp.fsm.update()
+        lamp.fsm.update()
+        with self.assertRaises(KeyError):
+            lamp.fsm.update()
+
+    def test_subclass_overrides_are_used(self):
+        lamp = BrokenLamp()
+        lamp.fsm.update()
+        lamp.fsm.update()
+        self.assertEqual(lamp.fsm.state, LampState.DEAD)
+
+    def test_batched_step(self):
+        lamps = [Lamp() for _ in range(5)]
+        lamps[0].fsm.update()
+        Lamp.fsm_table.step([lamp.fsm for lamp in lamps], times=2)
+        self.assertEqual([lamp.fsm.state for lamp in lamps], [LampState.OFF] + [LampState.ON] * 4)
+        self.assertEqual(lamps[0].toggles, 2)
+
+    def test_transition_sees_previous_state_like_finite_state_machine(self):
+        # previous_state is already the current state when a transition runs
+        lamp = StickyLamp()
+        for _ in range(4):
+            lamp.fsm.update()
+        self.assertEqual(lamp.entered_from, [LampState.OFF, LampState.OFF])
+
+        lamps = [StickyLamp(), StickyLamp()]
+        for _ in range(4):
+            Lamp.fsm_table.step([lamp.fsm for lamp in lamps])
+        self.assertEqual([lamp.entered_from for lamp in lamps], [[LampState.OFF, LampState.OFF]] * 2)
+
+    def test_slotted(self):
+        with self.assertRaises(AttributeError):
+            Lamp().fsm.extra = 1
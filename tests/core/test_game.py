@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core.game import Game
+
+
+class TestGame(unittest.TestCase):
+    def setUp(self):
+        # The game writes its logs to the working directory
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(root.name)
+
+    def test_log_is_written_when_crashing(self):
+        player = mock.Mock()
+
+        def crash(game):
+            game.player = player
+            raise RuntimeError("boom")
+
+        with mock.patch.object(Game, "_setup", crash):
+            with self.assertRaises(RuntimeError):
+                Game("test", 64, 64).run()
+
+        with open("game.log") as file:
+            log = file.read()
+        self.assertIn("Game crashed", log)
+        self.assertIn("RuntimeError: boom", log)
+        player.controls.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from controls import Input
+from controls.scripted import ScriptedControls
+from core.simulation import Simulation
+
+
+class TestSimulation(unittest.TestCase):
+    def test_walks_right_headless(self):
+        simulation = Simulation(ScriptedControls([[Input.RIGHT]]), dt=16, draw=False)
+        try:
+            start = simulation.level.hero.body.position
+            report = simulation.run(120)
+            self.assertGreater(simulation.level.hero.body.position.x, start.x)
+        finally:
+            simulation.close()
+
+        self.assertEqual(report.frames, 120)
+        self.assertAlmostEqual(report.simulated_seconds, 1.92)
+        self.assertGreater(report.speed, 0)
+
+    def test_draws(self):
+        simulation = Simulation(ScriptedControls([[Input.SUN_STRIKE], []]), dt=16, size=(320, 180))
+        try:
+            report = simulation.run(10)
+        finally:
+            simulation.close()
+        self.assertTrue(report.drawn)
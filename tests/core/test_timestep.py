@@ -0,0 +1,22 @@
+import unittest
+
+from core.timestep import FixedTimestep
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_carries_leftover_time(self):
+        timestep = FixedTimestep(0.01, 8)
+        self.assertEqual(timestep.advance(0.025), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(0.005), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.0)
+
+    def test_steps_do_not_depend_on_frame_rate(self):
+        fast, slow = FixedTimestep(0.01, 8), FixedTimestep(0.01, 8)
+        self.assertEqual(sum(fast.advance(1 / 120) for _ in range(120)), sum(slow.advance(1 / 30) for _ in range(30)))
+
+    def test_caps_catch_up_steps(self):
+        timestep = FixedTimestep(0.01, 4)
+        self.assertEqual(timestep.advance(1.0), 4)
+        self.assertLess(timestep.alpha, 1.0)
+        self.assertAlmostEqual(timestep.dropped, 0.96)
@@ -0,0 +1,48 @@
+import unittest
+
+from pygame import Surface
+from pygame.sprite import Group
+
+from entities.spells import InstantSpell
+from entities.spells.pool import SpellPool
+from utils.animation import Animation, FrameSequence
+
+
+class TestSpellPool(unittest.TestCase):
+    def setUp(self):
+        frames = FrameSequence(Surface((64, 16)))
+        self.pool = SpellPool(lambda pool: InstantSpell(Animation(frames, repeat=False), pool=pool))
+
+    def cast(self, group):
+        spell = self.pool.acquire()
+        spell.spawn(group, pos=(10, 20))
+        return spell
+
+    def test_dead_spell_is_reused(self):
+        group = Group()
+        spell = self.cast(group)
+        while spell.alive():
+            group.update(dt=100)
+
+        again = self.cast(group)
+        self.assertIs(again, spell)
+        self.assertEqual(again.fsm.state, InstantSpell.SpellState.INIT)
+        self.assertFalse(again._animation.ended)
+        self.assertEqual(again.rect.midbottom, (10, 20))
+
+    def test_sustained_casting_allocates_nothing(self):
+        group = Group()
+        for frame in range(200):
+            if frame % 2 == 0:
+                self.cast(group)
+            group.update(dt=100)
+
+        stats = self.pool.stats()
+        self.assertLessEqual(stats.created, 6)
+        self.assertGreater(stats.hit_rate, 0.9)
+
+    def test_double_kill_releases_once(self):
+        spell = self.cast(Group())
+        spell.kill()
+        spell.kill()
+        self.assertEqual(self.pool.stats().free, 1)
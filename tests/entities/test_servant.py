@@ -0,0 +1,68 @@
+import unittest
+
+from pygame import Surface
+from pygame.sprite import Group
+
+from entities.enemies import Servant
+from utils.animation import FrameSequence
+
+State = Servant.ServantState
+
+
+def make_servant(*groups, hp=15):
+    frames = {state: FrameSequence(Surface((64, 16))) for state in (State.INIT, State.IDLE, State.HURT, State.DEATH)}
+    return Servant("assets/gamekit/1 Bat", hp, 5, *groups, frames=frames)
+
+
+def run(servant, frames):
+    for _ in range(frames):
+        servant.update(dt=1000)
+
+
+class TestServant(unittest.TestCase):
+    def test_hurt_then_idle(self):
+        servant = make_servant()
+        run(servant, 2)
+        servant.hurt(5)
+        self.assertEqual(servant.fsm.state, State.HURT)
+        self.assertFalse(servant.animation.ended)
+
+        run(servant, 1)
+        self.assertEqual(servant.fsm.state, State.IDLE)
+        self.assertIs(servant.animation[0], servant.frames[State.IDLE][0])
+
+    def test_hurt_to_death_kills(self):
+        group = Group()
+        servant = make_servant(group)
+        run(servant, 2)
+        servant.hurt(15)
+        run(servant, 1)
+        self.assertEqual(servant.fsm.state, State.DEATH)
+        self.assertIs(servant.animation[0], servant.frames[State.DEATH][0])
+        self.assertTrue(servant.alive())
+
+        run(servant, 1)
+        self.assertEqual(servant.fsm.state, State.DEAD)
+        self.assertFalse(servant.alive())
+
+        # The dead are not hurt again
+        servant.hurt(5)
+        self.assertEqual(servant.fsm.state, State.DEAD)
+
+    def test_update_all_matches_update(self):
+        single, batched = make_servant(), make_servant()
+        for servant in (single, batched):
+            servant.body.position = (40, 30)
+        for frame in range(6):
+            if frame == 2:
+                single.hurt(15)
+                batched.hurt(15)
+            single.update(dt=600)
+            Servant.update_all([batched], dt=600)
+            self.assertEqual(single.fsm.state, batched.fsm.state)
+            self.assertEqual(single.rect, batched.rect)
+        self.assertEqual(batched.fsm.state, State.DEAD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+import pygame
+from pygame import Rect, Surface
+from pygame.sprite import Sprite
+
+from entities.enemies import swarm
+from entities.enemies.swarm import Swarm
+from utils.animation import FrameSequence
+
+
+COLORS = {swarm.IDLE: (255, 0, 0), swarm.HURT: (0, 255, 0), swarm.DEATH: (0, 0, 255)}
+
+
+def make_swarm(capacity=4):
+    frames = {}
+    for state, color in COLORS.items():
+        sheet = Surface((64, 16))
+        sheet.fill(color)
+        frames[state] = FrameSequence(sheet)
+    return Swarm(frames, hp=15, atk=5, capacity=capacity)
+
+
+def make_sprite(rect):
+    sprite = Sprite()
+    sprite.rect = Rect(rect)
+    return sprite
+
+
+class TestSwarm(unittest.TestCase):
+    def test_spawn_grows_capacity(self):
+        bats = make_swarm(capacity=2)
+        indices = bats.spawn(np.zeros((3, 2)))
+        self.assertEqual(len(bats), 3)
+        self.assertGreaterEqual(bats.capacity, 3)
+        np.testing.assert_array_equal(bats.hp[indices], 15)
+
+    def test_moves_in_bulk(self):
+        bats = make_swarm()
+        bats.spawn([(0, 0), (10, 10)], velocities=[(100, 0), (0, -100)])
+        bats.update(500)
+        np.testing.assert_allclose(bats.positions[:2], [(50, 0), (10, -40)])
+
+    def test_hurt_then_idle_or_death(self):
+        bats = make_swarm()
+        indices = bats.spawn([(0, 0), (0, 0)])
+        bats.hit(indices[:1], 5)
+        bats.hit(indices[1:], 20)
+        np.testing.assert_array_equal(bats.states[indices], swarm.HURT)
+
+        bats.update(1000)
+        np.testing.assert_array_equal(bats.states[indices], [swarm.IDLE, swarm.DEATH])
+
+        bats.update(1000)
+        self.assertEqual(len(bats), 1)
+
+        # The freed slot is reused
+        self.assertEqual(bats.spawn([(0, 0)])[0], indices[1])
+
+    def test_draw_blits_visible_members(self):
+        bats = make_swarm()
+        bats.spawn([(8, 8), (36, 8), (500, 500)])
+        surface = Surface((32, 32))
+        bats.draw(surface)
+
+        # A whole member at the top left corner and the left edge of one past the right side
+        width, height = bats.size.tolist()
+        drawn = pygame.mask.from_threshold(surface, COLORS[swarm.IDLE], (1, 1, 1, 255))
+        self.assertEqual(drawn.count(), width * height + 4 * height)
+        self.assertEqual(drawn.get_bounding_rects(), [Rect(0, 0, width, height), Rect(28, 0, 4, height)])
+
+    def test_stops_at_obstacles(self):
+        bats = make_swarm()
+        bats.obstacles = np.array([[0, 100, 200, 200]])
+        index = bats.spawn([(50, 50)], velocities=[(10, 100)])[0]
+        bats.update(500)
+        np.testing.assert_allclose(bats.positions[index], (55, 50))
+        np.testing.assert_allclose(bats.velocities[index], (10, 0))
+
+    def test_collide_with_living_members(self):
+        bats = make_swarm()
+        indices = bats.spawn([(0, 0), (100, 0), (0, 100)])
+        bats.states[indices[2]] = swarm.DEAD
+        spell, miss = make_sprite((-4, -4, 120, 8)), make_sprite((300, 300, 8, 8))
+        self.assertEqual(list(bats.collide([spell, miss])), [(spell, indices[:2].tolist())])
+
+    def test_nearest(self):
+        bats = make_swarm()
+        indices = bats.spawn([(0, 0), (100, 0)])
+        self.assertEqual(bats.nearest((80, 0)), indices[1])
+        self.assertIsNone(bats.nearest((80, 0), max_distance=4))
+        self.assertIsNone(make_swarm().nearest((0, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import level.bundle
+from level.bundle import compile_level, load_level, read_bundle
+from level.geometry import merge_tiles
+from utils.vfs import asset_fs
+
+LEVEL = "assets/levels/test_level.tmx"
+
+
+class TestLevelBundle(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(level.bundle, "_CACHE_DIR", self.directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_compiled_arrays(self):
+        path = os.path.join(self.directory.name, "level.lvl")
+        compile_level(LEVEL, path)
+        header, arrays = read_bundle(path)
+
+        ground = arrays["layer/ground"]
+        self.assertEqual(ground.shape, (13, 30))
+        self.assertFalse(ground.flags.writeable)
+        self.assertEqual(arrays["geometry/ground"].tolist(), [list(r) for r in merge_tiles(ground != 0)])
+        self.assertEqual(len(header["tiles"]), max(arrays[f"layer/{name}"].max() for name in header["layers"]))
+        self.assertIn("assets/plains.tsx", header["dependencies"])
+        self.assertEqual(arrays["geometry/ground"].ctypes.data % 16, 0)
+
+    def test_spawns(self):
+        bundle = load_level(LEVEL)
+        self.assertEqual(bundle.spawn("hero"), (80, 192))
+        np.testing.assert_array_equal(bundle.spawns("enemies"), [[160, 160]])
+        with self.assertRaises(KeyError):
+            bundle.spawn("dragon")
+
+    def test_recompiled_when_a_source_changes(self):
+        with mock.patch.object(level.bundle, "compile_level", wraps=compile_level) as compiled:
+            load_level(LEVEL)
+            load_level(LEVEL)
+            self.assertEqual(compiled.call_count, 1)
+
+            signature = asset_fs.signature
+            edited = lambda path: (0, 0) if str(path).endswith("plains.tsx") else signature(path)
+            with mock.patch.object(asset_fs, "signature", side_effect=edited):
+                load_level(LEVEL)
+            self.assertEqual(compiled.call_count, 2)
+
+    def test_recompiled_while_the_old_bundle_is_mapped(self):
+        old = load_level(LEVEL)
+        mapped = {os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name)}
+
+        # Files still mapped cannot be replaced or removed on Windows
+        def locked(call):
+            def wrapper(*args):
+                if args[-1] in mapped:
+                    raise PermissionError(args[-1])
+                return call(*args)
+            return wrapper
+
+        signature = asset_fs.signature
+        edited = lambda path: (0, 0) if str(path).endswith("plains.tsx") else signature(path)
+        with mock.patch.object(asset_fs, "signature", side_effect=edited), \
+                mock.patch.object(level.bundle.os, "replace", locked(os.replace)), \
+                mock.patch.object(level.bundle.os, "remove", locked(os.remove)):
+            new = load_level(LEVEL)
+            self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+        self.assertEqual(new.spawn("hero"), old.spawn("hero"))
+        del old, new
+
+        # Outdated bundles are removed by the next compilation, once nothing maps them
+        edited_again = lambda path: (1, 1) if str(path).endswith("plains.tsx") else signature(path)
+        with mock.patch.object(asset_fs, "signature", side_effect=edited_again):
+            load_level(LEVEL)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, "level.lvl")
+        with open(path, "wb") as f:
+            f.write(b"not a level bundle")
+        with self.assertRaises(ValueError):
+            read_bundle(path)
+
+    def test_truncated_cache_is_recompiled(self):
+        load_level(LEVEL)
+        for size in (0, 5, 100):
+            for name in os.listdir(self.directory.name):
+                with open(os.path.join(self.directory.name, name), "r+b") as f:
+                    f.truncate(size)
+            self.assertEqual(load_level(LEVEL).spawn("hero"), (80, 192))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from level.geometry import merge_tiles
+
+
+class TestMergeTiles(unittest.TestCase):
+    def test_empty_grid(self):
+        self.assertEqual(merge_tiles([]), [])
+        self.assertEqual(merge_tiles([[False, False]]), [])
+
+    def test_solid_block_is_one_rect(self):
+        solid = [[True] * 30 for _ in range(3)]
+        self.assertEqual(merge_tiles(solid), [(0, 0, 30, 3)])
+
+    def test_rects_cover_every_solid_cell_once(self):
+        solid = [
+            [True, True, False, True],
+            [True, True, True, True],
+            [False, True, True, False],
+        ]
+        covered = [[0] * 4 for _ in range(3)]
+        for x, y, w, h in merge_tiles(solid):
+            for j in range(y, y + h):
+                for i in range(x, x + w):
+                    covered[j][i] += 1
+
+        self.assertEqual(covered, [[int(cell) for cell in row] for row in solid])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from controls import Input
+from controls.scripted import ScriptedControls
+from core.simulation import Simulation
+from entities.enemies import swarm
+from entities.spells.instant import SUN_STRIKE
+
+
+class TestLevelSwarm(unittest.TestCase):
+    def play(self, inputs):
+        simulation = Simulation(ScriptedControls([inputs]), dt=16, draw=False)
+        self.addCleanup(simulation.close)
+        return simulation.level
+
+    def test_map_swarm_is_spawned(self):
+        level = self.play([])
+        self.assertEqual(len(level.swarm), len(level.bundle.spawns("swarm")))
+        self.assertGreater(len(level.swarm), 0)
+
+    def test_spells_hit_swarm_members_once(self):
+        level = self.play([])
+        bats = level.swarm
+        hit, missed = bats.spawn([(400, 300), (1800, 380)])
+        SUN_STRIKE.create(level.dynamic, level.spells, pos=bats.midbottom(hit))
+
+        level.update(16)
+        self.assertEqual(bats.states[hit], swarm.HURT)
+        self.assertEqual(bats.hp[hit], bats.max_hp - SUN_STRIKE.dmg)
+        self.assertEqual(bats.hp[missed], bats.max_hp)
+
+        level.update(16)
+        self.assertEqual(bats.hp[hit], bats.max_hp - SUN_STRIKE.dmg)
+
+    def test_sun_strike_targets_nearest_swarm_member(self):
+        level = self.play([Input.SUN_STRIKE])
+        x, y = level.hero.rect.center
+        target = level.swarm.spawn([(x, y - 80)])[0]
+
+        level.update(16)
+        self.assertEqual(len(level.spells), 1)
+        self.assertEqual(level.swarm.states[target], swarm.HURT)
+
+
+if __name__ == '__main__':
+    unittest.main()
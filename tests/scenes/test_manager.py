@@ -0,0 +1,111 @@
+import threading
+import unittest
+
+import pygame
+
+from scenes import Scene, SceneManager
+from scenes.loading_scene import LoadingScene
+from utils.preload import AssetManifest, Preloader
+
+
+class _Scene(Scene):
+    likely_next = ("next",)
+
+    def __init__(self, manager, log, name):
+        super().__init__(manager)
+        self.log = log
+        self.name = name
+
+    def setup(self):
+        self.log.append(("setup", self.name))
+
+    def teardown(self):
+        self.log.append(("teardown", self.name))
+
+    def release(self):
+        self.log.append(("release", self.name))
+
+
+class TestSceneManager(unittest.TestCase):
+    def setUp(self):
+        self.preloader = Preloader()
+        self.addCleanup(self.preloader.shutdown)
+        self.manager = SceneManager(pygame.Surface((64, 64)), self.preloader, keep_alive=1)
+        self.log = []
+        self.built = []
+
+    def _add(self, name, **kwargs):
+        def build():
+            self.built.append(name)
+            return _Scene(self.manager, self.log, name)
+        self.manager.add_scene(name, build, **kwargs)
+
+    def test_scenes_are_built_on_first_set(self):
+        self._add("menu")
+        self._add("game")
+        self.assertEqual(self.built, [])
+
+        self.manager.set_scene("menu")
+        self.manager.set_scene("game")
+        self.manager.set_scene("menu")
+        self.assertEqual(self.built, ["menu", "game"])
+        self.assertEqual(self.log[-2:], [("teardown", "game"), ("setup", "menu")])
+
+    def test_setting_the_current_scene_again_keeps_it(self):
+        self._add("a")
+        self._add("b")
+        self.manager.set_scene("a")
+        self.manager.set_scene("a")
+        self.manager.set_scene("b")
+        self.assertNotIn(("release", "a"), self.log)
+        self.assertEqual(self.built, ["a", "b"])
+
+    def test_scenes_beyond_keep_alive_are_released(self):
+        for name in ("a", "b", "c"):
+            self._add(name)
+        for name in ("a", "b", "c", "a"):
+            self.manager.set_scene(name)
+
+        self.assertIn(("release", "a"), self.log)
+        self.assertEqual(self.built, ["a", "b", "c", "a"])
+        self.assertEqual(set(self.manager.scenes), {"a", "c"})
+
+    def test_uncached_scenes_are_released_when_left(self):
+        self._add("menu")
+        self._add("shop", cache=False)
+        self.manager.set_scene("shop")
+        self.manager.set_scene("menu")
+        self.assertEqual(self.log[-3:], [("teardown", "shop"), ("release", "shop"), ("setup", "menu")])
+        self.assertNotIn("shop", self.manager.scenes)
+
+    def test_scenes_added_built_are_kept(self):
+        self.manager.add_scene("built", _Scene(self.manager, self.log, "built"))
+        self._add("a")
+        self._add("b")
+        for name in ("built", "a", "b"):
+            self.manager.set_scene(name)
+        self.assertNotIn(("release", "built"), self.log)
+
+    def test_loading_scene_until_assets_are_in(self):
+        release = threading.Event()
+        self._add("game", manifest=AssetManifest(tasks=(("wait", lambda: release.wait(10)),)))
+        self.manager.set_scene("game")
+        self.assertIsInstance(self.manager.current_scene, LoadingScene)
+        self.assertEqual(self.built, [])
+
+        release.set()
+        self.assertTrue(self.manager.prefetch("game").wait(10))
+        self.manager.update(16)
+        self.assertEqual(self.built, ["game"])
+        self.assertEqual(self.manager.current_scene.name, "game")
+
+    def test_likely_next_scene_is_prefetched(self):
+        loaded = threading.Event()
+        self._add("menu")
+        self._add("next", manifest=AssetManifest(tasks=(("warm", loaded.set),)))
+        self.manager.set_scene("menu")
+        self.assertTrue(loaded.wait(10))
+        self.assertEqual(self.built, ["menu"])
+
+if __name__ == '__main__':
+    unittest.main()
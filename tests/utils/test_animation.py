@@ -0,0 +1,32 @@
+import unittest
+
+from pygame import Surface
+
+from utils.animation import Animation, FrameSequence
+
+
+class TestFrameSequence(unittest.TestCase):
+    def setUp(self):
+        self.sheet = Surface((128, 32))
+        self.sheet.fill((255, 0, 0), (0, 0, 16, 32))
+
+    def test_frames_are_sliced_once(self):
+        frames = FrameSequence(self.sheet)
+        self.assertEqual(len(frames), 4)
+        self.assertIs(frames[1], frames[1])
+        self.assertEqual(frames[0].get_size(), (32, 32))
+
+    def test_flipped_frames_are_mirrored(self):
+        frames = FrameSequence(self.sheet)
+        self.assertEqual(frames[0].get_at((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(frames.flipped[0].get_at((31, 0)), (255, 0, 0, 255))
+        self.assertEqual(frames.flipped[0].get_at((0, 0)), (0, 0, 0, 255))
+
+    def test_animation_reuses_frames(self):
+        frames = FrameSequence(self.sheet)
+        animation = Animation(frames)
+        self.assertIs(animation.start(), frames[0])
+        self.assertIs(animation.update(250, True), frames.flipped[1])
+
+if __name__ == '__main__':
+    unittest.main()
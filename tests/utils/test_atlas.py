@@ -0,0 +1,68 @@
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from pygame import Rect
+
+import utils.atlas
+from ui import icons
+from utils import assets, register_atlas, unregister_atlas
+from utils.atlas import build_atlas, pack
+from utils.preload import AssetManifest, Preloader
+
+
+class TestPack(unittest.TestCase):
+    def test_regions_fit_and_do_not_overlap(self):
+        rng = random.Random(0)
+        sizes = {str(i): (rng.randint(1, 200), rng.randint(1, 200)) for i in range(200)}
+        regions = pack(sizes, page_size=512, padding=1)
+
+        self.assertEqual(set(regions), set(sizes))
+        for key, region in regions.items():
+            self.assertEqual((region.width, region.height), sizes[key])
+            self.assertLessEqual(region.x + region.width, 512)
+            self.assertLessEqual(region.y + region.height, 512)
+
+        for a, ra in regions.items():
+            for b, rb in regions.items():
+                if a < b and ra.page == rb.page:
+                    self.assertFalse(Rect(ra[1:]).colliderect(Rect(rb[1:])), (a, b))
+
+    def test_same_sized_sheets_share_a_page(self):
+        regions = pack({str(i): (48, 48) for i in range(64)}, page_size=512)
+        self.assertEqual({region.page for region in regions.values()}, {0})
+
+    def test_oversized_image_raises(self):
+        with self.assertRaises(ValueError):
+            pack({"big": (600, 10)}, page_size=512)
+
+
+class TestUIAtlas(unittest.TestCase):
+    def test_icons_come_from_the_registered_atlas(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(utils.atlas, "_CACHE_DIR", directory):
+            atlas = build_atlas("ui", icons.ICON_PATHS, page_size=512)
+        register_atlas(atlas)
+        self.addCleanup(unregister_atlas, "ui")
+
+        self.assertIn(icons.RIGHT_ICON.get_parent(), atlas.pages)
+        self.assertIs(icons.COIN_ICON, atlas.image(icons.ICON_PATHS[60]))
+        with self.assertRaises(AttributeError):
+            icons.MISSING_ICON
+
+    def test_preloaded_atlas_is_reused(self):
+        assets.clear()
+        preloader = Preloader()
+        self.addCleanup(preloader.shutdown)
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(utils.atlas, "_CACHE_DIR", directory):
+            progress = preloader.load(AssetManifest(tasks=(("atlas_ui", icons.build_atlas),)))
+            self.assertTrue(progress.wait(10))
+            self.assertEqual(progress.failed, 0)
+
+            with mock.patch.object(utils.atlas, "_build") as built:
+                atlas = icons.build_atlas()
+            built.assert_not_called()
+        self.assertIn(icons.ICON_PATHS[0], atlas.regions)
+
+if __name__ == '__main__':
+    unittest.main()
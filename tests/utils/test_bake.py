@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame
+import pygame.image
+import pygame.transform
+
+from constants import PROJECT_ROOT
+from utils.bake import BakedAssets, bake, frame_count
+from utils.vfs import AssetFS
+
+
+class TestBake(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = self._tmp.name
+        self.output = os.path.join(self.root, "baked")
+        os.makedirs(os.path.join(self.root, "assets", "Bat"))
+
+        # A two frame sheet with a transparent border
+        sheet = pygame.Surface((8, 4), pygame.SRCALPHA)
+        sheet.fill((255, 0, 0, 255), (1, 1, 2, 2))
+        sheet.fill((0, 0, 255, 128), (5, 1, 2, 2))
+        pygame.image.save(sheet, os.path.join(self.root, "assets", "Bat", "Fly_2.png"))
+
+        # A palette image with its key color twice, only one of them transparent
+        shutil.copy(os.path.join(PROJECT_ROOT, "assets", "gamekit", "4 Palette", "palette.png"), os.path.join(self.root, "assets"))
+
+        self.fs = AssetFS(self.root, cache_dir=os.path.join(self.root, "cache"))
+
+    def _raw(self, path):
+        return pygame.transform.scale2x(pygame.image.load(os.path.join(self.root, path)))
+
+    def test_frame_count(self):
+        self.assertEqual(frame_count("Dude_Monster_Run_6.png", (192, 32)), 6)
+        self.assertEqual(frame_count("Background.png", (100, 200)), 1)
+        # Numbered single images
+        self.assertEqual(frame_count("Frame_tile_33.png", (64, 64)), 1)
+        self.assertEqual(frame_count("1 64x64/2_3.png", (128, 128)), 1)
+
+    def test_baked_images_match_the_sources(self):
+        manifest = bake(["assets"], self.output, fs=self.fs)
+        self.assertEqual(set(manifest), {"assets/Bat/Fly_2.png", "assets/palette.png"})
+
+        sheet = manifest["assets/Bat/Fly_2.png"]
+        self.assertEqual((sheet.size, sheet.trim, sheet.frames, sheet.frame_size), ((16, 8), (2, 2, 12, 4), 2, (8, 8)))
+        self.assertIsInstance(manifest["assets/palette.png"].colorkey, int)
+
+        # Saved cropped to their trim rect
+        for path, entry in manifest.items():
+            raw = self._raw(path)
+            self.assertEqual(entry.size, raw.get_size())
+            trimmed = pygame.image.load(os.path.join(self.output, entry.baked))
+            self.assertEqual(trimmed.get_size(), entry.trim[2:])
+
+        raw = self._raw("assets/Bat/Fly_2.png").subsurface(sheet.trim)
+        trimmed = pygame.image.load(os.path.join(self.output, sheet.baked))
+        self.assertEqual(
+            [trimmed.get_at((x, y)) for x in range(12) for y in range(4)],
+            [raw.get_at((x, y)) for x in range(12) for y in range(4)],
+        )
+
+    def test_unchanged_images_are_not_baked_again(self):
+        bake(["assets"], self.output, fs=self.fs)
+        with mock.patch("utils.bake.bake_image") as bake_image:
+            manifest = bake(["assets"], self.output, fs=self.fs)
+        bake_image.assert_not_called()
+        self.assertEqual(len(manifest), 2)
+
+    def test_changed_images_are_baked_again(self):
+        bake(["assets"], self.output, fs=self.fs)
+        with mock.patch.object(self.fs, "signature", return_value=(0, 0)):
+            bake(["assets"], self.output, fs=self.fs)
+        self.assertEqual({entry.signature for entry in BakedAssets(self.output).entries.values()}, {(0, 0)})
+        self.assertEqual(BakedAssets(os.path.join(self.root, "missing")).entries, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from utils import bench
+from utils.bench import Result, benchmark
+
+
+class TestBench(unittest.TestCase):
+    def tearDown(self):
+        bench._cases.pop("test.sum", None)
+
+    def test_measure_batches_fast_operations(self):
+        median, best, iterations = bench.measure(lambda: sum(range(10)), rounds=3, round_time=0.001)
+        self.assertGreater(iterations, 1)
+        self.assertLessEqual(best, median)
+        self.assertGreater(best, 0)
+
+    def test_case_is_set_up_and_cleaned_up(self):
+        events = []
+
+        @benchmark("test.sum")
+        def case():
+            events.append("setup")
+            yield lambda: sum(range(10))
+            events.append("teardown")
+
+        with self.assertRaises(ValueError):
+            benchmark("test.sum")(case)
+
+        result, = bench.run(["test.sum"], rounds=2, round_time=0.001)
+        self.assertEqual(events, ["setup", "teardown"])
+        self.assertEqual(result.name, "test.sum")
+        self.assertEqual(result.rounds, 2)
+
+    def test_compare_against_baseline(self):
+        baseline = {"a": Result("a", 2.0, 1.0, 1, 1), "b": Result("b", 2.0, 1.0, 1, 1)}
+        results = [Result("a", 2.0, 1.2, 1, 1), Result("b", 2.0, 1.4, 1, 1), Result("c", 1.0, 1.0, 1, 1)]
+
+        a, b, c = bench.compare(results, baseline)
+        self.assertAlmostEqual(a.ratio, 1.2)
+        self.assertFalse(a.regressed(0.25))
+        self.assertTrue(b.regressed(0.25))
+        self.assertIsNone(c.baseline)
+        self.assertFalse(c.regressed(0.25))
+
+    def test_results_round_trip(self):
+        results = [Result("a", 2.0, 1.0, 16, 7)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            bench.save(results, path)
+            self.assertEqual(bench.load(path), {"a": results[0]})
+
+if __name__ == '__main__':
+    unittest.main()
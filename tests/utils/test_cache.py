@@ -0,0 +1,98 @@
+import threading
+import unittest
+
+from utils import load_image, assets
+from utils.cache import AssetCache
+
+
+class TestAssetCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = AssetCache(budget=100)
+        loads = []
+        load = lambda: loads.append(1) or "asset"
+
+        self.assertEqual(cache.get("a", load, lambda _: 10), "asset")
+        self.assertEqual(cache.get("a", load, lambda _: 10), "asset")
+
+        stats = cache.stats()
+        self.assertEqual(len(loads), 1)
+        self.assertEqual((stats.hits, stats.misses, stats.resident_bytes), (1, 1, 10))
+
+    def test_lru_eviction_respects_budget(self):
+        cache = AssetCache(budget=25)
+        cache.get("a", lambda: "a", lambda _: 10)
+        cache.get("b", lambda: "b", lambda _: 10)
+        cache.get("a", lambda: "a", lambda _: 10)
+        cache.get("c", lambda: "c", lambda _: 10)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.stats().evictions, 1)
+        self.assertEqual(cache.stats().resident_bytes, 20)
+
+    def test_oversized_asset_is_kept(self):
+        cache = AssetCache(budget=5)
+        cache.get("a", lambda: "a", lambda _: 10)
+        self.assertIn("a", cache)
+
+    def test_loads_of_other_keys_do_not_wait(self):
+        cache = AssetCache(budget=100)
+        started, other_loaded = threading.Event(), threading.Event()
+
+        def load():
+            started.set()
+            return "a" if other_loaded.wait(5) else "timed out"
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(cache.get("a", load, lambda _: 1)))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        self.assertEqual(cache.get("b", lambda: "b", lambda _: 1), "b")
+        other_loaded.set()
+        thread.join(5)
+        self.assertEqual(results, ["a"])
+
+    def test_concurrent_loads_of_a_key_share_one(self):
+        cache = AssetCache(budget=100)
+        loads, release = [], threading.Event()
+
+        def load():
+            loads.append(1)
+            release.wait(5)
+            return object()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("a", load, lambda _: 1))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(cache.stats().misses, 1)
+
+    def test_failed_load_is_retried(self):
+        cache = AssetCache(budget=100)
+        with self.assertRaises(ZeroDivisionError):
+            cache.get("a", lambda: 1 / 0, lambda _: 1)
+        self.assertEqual(cache.get("a", lambda: "a", lambda _: 1), "a")
+
+
+class TestLoadImage(unittest.TestCase):
+    def setUp(self):
+        assets.clear()
+
+    def test_image_is_decoded_once(self):
+        path = "assets/gamekit/1 Bat/Bat_Idle.png"
+        misses = assets.stats().misses
+        images = [load_image(path) for _ in range(500)]
+
+        self.assertEqual(assets.stats().misses - misses, 1)
+        self.assertTrue(all(image is images[0] for image in images))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import logging
+import tempfile
+import unittest
+
+from utils.log import LogBackend, ThrottleFilter
+
+
+def _record(name: str, msg: str = "message") -> logging.LogRecord:
+    return logging.LogRecord(name, logging.DEBUG, __file__, 0, msg, None, None)
+
+
+class TestThrottleFilter(unittest.TestCase):
+    def test_other_loggers_pass(self):
+        throttle = ThrottleFilter()
+        throttle.limit("level", rate=0.001)
+        self.assertTrue(all(throttle.filter(_record("levels")) for _ in range(10)))
+
+    def test_rate_limit_applies_to_children(self):
+        throttle = ThrottleFilter()
+        throttle.limit("level", rate=0.001, burst=2)
+        passed = [throttle.filter(_record("level.renderer")) for _ in range(10)]
+        self.assertEqual(passed, [True, True] + [False] * 8)
+
+    def test_sampling_keeps_one_in_n(self):
+        throttle = ThrottleFilter()
+        throttle.sample("core.entity", every=4)
+        records = [_record("core.entity") for _ in range(10)]
+        passed = [r for r in records if throttle.filter(r)]
+        self.assertEqual(passed, [records[0], records[4], records[8]])
+        self.assertEqual(passed[0].getMessage(), "message (1 in 4 logged)")
+
+
+class TestLogBackend(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.log")
+        self.level = logging.getLogger().level
+
+    def tearDown(self):
+        logging.getLogger().setLevel(self.level)
+        self.directory.cleanup()
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_records_are_written_in_the_background(self):
+        backend = LogBackend(self.path).start()
+        backend.throttle.limit("test.frame", rate=0.001)
+        for i in range(5):
+            logging.getLogger("test.frame").debug(f"frame {i}")
+        logging.getLogger("test.other").info("other")
+        backend.stop()
+
+        log = self._read(self.path)
+        self.assertIn("frame 0", log)
+        self.assertNotIn("frame 1", log)
+        self.assertIn("other", log)
+
+    def test_dump_includes_throttled_records(self):
+        backend = LogBackend(self.path, ring_size=3).start()
+        backend.throttle.limit("test.frame", rate=0.001)
+        for i in range(5):
+            logging.getLogger("test.frame").debug(f"frame {i}")
+        self.assertTrue(backend.dump("100 ms frame"))
+        self.assertFalse(backend.dump("too soon"))
+        backend.stop()
+
+        dump = self._read(backend.hitch_path)
+        self.assertIn("100 ms frame: last 3 records", dump)
+        self.assertEqual([f"frame {i}" in dump for i in range(5)], [False, False, True, True, True])
+        self.assertNotIn("100 ms frame", self._read(self.path))
+
+    def test_rotation(self):
+        backend = LogBackend(self.path, max_bytes=1024, backups=2).start()
+        for i in range(100):
+            logging.getLogger("test").info(f"line {i}")
+        backend.stop()
+
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import unittest
+
+from utils import load_image, assets
+from utils.preload import AssetManifest, Preloader
+
+IMAGES = ("assets/gamekit/1 Bat/Bat_Idle.png", "assets/gamekit/1 Bat/Bat_Hurt.png")
+
+
+class TestPreloader(unittest.TestCase):
+    def setUp(self):
+        assets.clear()
+        self.preloader = Preloader()
+        self.addCleanup(self.preloader.shutdown)
+
+    def test_preloaded_images_are_cached(self):
+        progress = self.preloader.load(AssetManifest(images=IMAGES))
+        self.assertTrue(progress.wait(10))
+        self.assertEqual((progress.completed, progress.total, progress.fraction), (2, 2, 1.0))
+
+        misses = assets.stats().misses
+        load_image(IMAGES[0])
+        self.assertEqual(assets.stats().misses, misses)
+
+    def test_pending_loads_are_shared(self):
+        calls = []
+        release = threading.Event()
+        task = ("count", lambda: calls.append(threading.current_thread().name) or release.wait(10))
+        first = self.preloader.load(AssetManifest(images=IMAGES[:1], tasks=(task,)))
+        second = self.preloader.load(AssetManifest(images=IMAGES, tasks=(task,)))
+        self.assertFalse(second.done)
+        release.set()
+
+        self.assertTrue(first.wait(10) and second.wait(10))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0].startswith("preload"))
+        self.assertEqual(second.total, 3)
+
+        # Finished loads run again, in case their asset was evicted since
+        self.assertTrue(self.preloader.load(AssetManifest(tasks=(task,))).wait(10))
+        self.assertEqual(len(calls), 2)
+
+    def test_failures_are_counted(self):
+        progress = self.preloader.load(AssetManifest(images=("assets/missing.png",), tasks=(("fail", lambda: 1 / 0),)))
+        self.assertTrue(progress.wait(10))
+        self.assertTrue(progress.done)
+        self.assertEqual(progress.failed, 2)
+
+    def test_empty_manifest_is_done(self):
+        progress = self.preloader.load(AssetManifest())
+        self.assertTrue(progress.done)
+        self.assertEqual(progress.fraction, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import time
+import unittest
+
+import numpy as np
+import pygame
+
+from ui.profiler import ProfilerOverlay
+from utils.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+        self.assertIs(profiler.scope("a"), profiler.scope("b"))
+
+        with profiler.scope("a"):
+            pass
+        profiler.end_frame()
+        self.assertEqual(profiler.names, [])
+        self.assertTrue(np.isnan(profiler.percentiles("a")).all())
+
+    def test_scopes_accumulate_per_frame(self):
+        profiler = Profiler(history=4)
+        profiler.enabled = True
+
+        for _ in range(6):
+            for _ in range(2):
+                with profiler.scope("work"):
+                    time.sleep(0.002)
+            profiler.end_frame()
+
+        self.assertEqual(profiler.names, ["work", Profiler.FRAME])
+        timings = profiler.timings("work")
+        self.assertEqual(len(timings), 4)
+        self.assertTrue((timings >= 4).all())
+        self.assertTrue((profiler.timings() >= timings).all())
+
+    def test_percentiles_of_missing_frames(self):
+        profiler = Profiler(history=10)
+        profiler.enabled = True
+
+        profiler.end_frame()
+        for i in range(4):
+            if i % 2:
+                with profiler.scope("rare"):
+                    pass
+            profiler.end_frame()
+
+        # Frames before the scope first ran are unknown, later ones without it took no time
+        rare = profiler.timings("rare")
+        self.assertEqual(len(rare), 3)
+        self.assertEqual(rare[1], 0)
+        self.assertEqual(profiler.percentiles("rare", (0,))[0], 0)
+
+    def test_enabling_resets_history(self):
+        profiler = Profiler()
+        profiler.enabled = True
+        with profiler.scope("a"):
+            pass
+        profiler.end_frame()
+
+        profiler.enabled = False
+        profiler.enabled = True
+        self.assertEqual(profiler.names, [])
+
+
+class TestProfilerOverlay(unittest.TestCase):
+    def test_overlay_draws_only_when_enabled(self):
+        profiler = Profiler()
+        overlay = ProfilerOverlay(profiler)
+        overlay.setup()
+        surface = pygame.Surface((320, 240))
+        surface.fill((255, 0, 255))
+
+        overlay.draw(surface)
+        self.assertEqual(pygame.transform.average_color(surface)[:3], (255, 0, 255))
+
+        overlay.toggle()
+        for _ in range(3):
+            with profiler.scope("stage"):
+                pass
+            profiler.end_frame()
+        overlay.draw(surface)
+        self.assertNotEqual(pygame.transform.average_color(surface)[:3], (255, 0, 255))
+
+if __name__ == '__main__':
+    unittest.main()
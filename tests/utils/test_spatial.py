@@ -0,0 +1,63 @@
+import math
+import random
+import unittest
+
+from pygame import Rect
+
+from utils.spatial import SpatialHash, collide, rect_distance
+
+
+class Box:
+    def __init__(self, rect):
+        self.rect = Rect(rect)
+
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.boxes = [Box((rng.randint(-500, 1500), rng.randint(-500, 1500), rng.randint(0, 80), rng.randint(0, 80)))
+                      for _ in range(300)]
+        self.index = SpatialHash(cell_size=64)
+        self.index.sync(self.boxes)
+        self.rng = rng
+
+    def test_queries_match_brute_force(self):
+        for _ in range(50):
+            point = (self.rng.uniform(-600, 1600), self.rng.uniform(-600, 1600))
+            area = Rect(*point, self.rng.randint(1, 300), self.rng.randint(1, 300))
+            radius = self.rng.uniform(0, 200)
+
+            self.assertCountEqual(self.index.query_rect(area), [b for b in self.boxes if area.colliderect(b.rect)])
+            self.assertCountEqual(
+                self.index.query_radius(point, radius),
+                [b for b in self.boxes if rect_distance(b.rect, point) <= radius],
+            )
+            nearest = self.index.nearest(point)
+            self.assertAlmostEqual(
+                rect_distance(nearest.rect, point),
+                min(rect_distance(b.rect, point) for b in self.boxes),
+            )
+
+    def test_sync_moves_and_removes(self):
+        moved, removed = self.boxes[0], self.boxes[1]
+        moved.rect.topleft = (5000, 5000)
+        self.index.sync(self.boxes[:1] + self.boxes[2:])
+
+        self.assertNotIn(removed, self.index)
+        self.assertEqual(self.index.query_rect(Rect(4990, 4990, 20, 20)), [moved])
+        self.assertIs(self.index.nearest((6000, 6000)), moved)
+
+    def test_nearest_respects_limits(self):
+        index = SpatialHash(cell_size=10)
+        self.assertIsNone(index.nearest((0, 0)))
+        box = Box((100, 0, 1, 1))
+        index.insert(box, box.rect)
+        self.assertIsNone(index.nearest((0, 0), max_distance=50))
+        self.assertIsNone(index.nearest((0, 0), exclude={box}))
+        self.assertIs(index.nearest((0, 0)), box)
+
+    def test_collide(self):
+        spell = Box(self.boxes[3].rect)
+        pairs = dict(collide([spell, Box((9000, 9000, 1, 1))], self.index))
+        self.assertEqual(list(pairs), [spell])
+        self.assertIn(self.boxes[3], pairs[spell])
@@ -0,0 +1,82 @@
+import os
+import json
+import tempfile
+import threading
+import unittest
+
+from utils.profiler import Profiler
+from utils.trace import Tracer, tracer
+
+
+def _threads(events):
+    return {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "trace.json")
+
+    def _events(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_inactive_tracer_is_a_no_op(self):
+        t = Tracer()
+        self.assertIs(t.span("a"), t.span("b"))
+        t.complete("a", 0, 1)
+        t.close()
+        self.assertEqual(os.listdir(self._tmp.name), [])
+
+    def test_events_of_threads_and_tracks(self):
+        t = Tracer()
+        t.open(self.path)
+
+        with t.span("frame", "frame"):
+            with t.span("load", "asset", track="assets"):
+                pass
+
+        def worker():
+            with t.span("recognize", "recognizer"):
+                t.flow("recognition", 1, start=True)
+
+        thread = threading.Thread(target=worker, name="recognizer")
+        thread.start()
+        thread.join()
+        with t.span("inputs"):
+            t.flow("recognition", 1, start=False)
+        t.close()
+
+        events = self._events()
+        threads = _threads(events)
+        self.assertEqual(sorted(threads.values()), ["MainThread", "assets (MainThread)", "recognizer"])
+
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        self.assertEqual(threads[spans["frame"]["tid"]], "MainThread")
+        self.assertEqual(threads[spans["load"]["tid"]], "assets (MainThread)")
+        self.assertEqual(threads[spans["recognize"]["tid"]], "recognizer")
+        self.assertLessEqual(spans["frame"]["ts"], spans["load"]["ts"])
+        self.assertLessEqual(spans["load"]["ts"] + spans["load"]["dur"], spans["frame"]["ts"] + spans["frame"]["dur"])
+
+        flow = [e for e in events if e["ph"] in "sf"]
+        self.assertEqual([e["ph"] for e in flow], ["s", "f"])
+        self.assertEqual(flow[0]["id"], flow[1]["id"])
+
+    def test_profiler_scopes_are_traced_while_disabled(self):
+        profiler = Profiler()
+        tracer.open(self.path)
+        try:
+            for _ in range(2):
+                with profiler.scope("update"):
+                    pass
+                profiler.end_frame()
+        finally:
+            tracer.close()
+
+        names = [e["name"] for e in self._events() if e["ph"] == "X"]
+        self.assertEqual(names, ["update", Profiler.FRAME] * 2)
+        self.assertEqual(profiler.names, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from utils.vfs import AssetFS
+
+
+class TestAssetFS(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as z:
+            z.writestr("Sprites/bat.png", b"inner")
+        with zipfile.ZipFile(os.path.join(self.root, "pack.zip"), "w") as z:
+            z.writestr("readme.txt", b"outer")
+            z.writestr("nested.zip", inner.getvalue())
+
+        os.makedirs(os.path.join(self.root, "assets"))
+        with open(os.path.join(self.root, "assets", "readme.txt"), "wb") as f:
+            f.write(b"disk")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _fs(self):
+        fs = AssetFS(self.root, cache_dir=os.path.join(self.root, "cache"))
+        fs.mount("pack.zip", "assets")
+        return fs
+
+    def test_nested_archive_members_are_served(self):
+        fs = self._fs()
+        self.assertTrue(fs.exists("assets/Sprites/bat.png"))
+        self.assertEqual(fs.read("assets/Sprites/bat.png"), b"inner")
+        self.assertEqual(fs.source("assets/Sprites/bat.png").read(), b"inner")
+
+    def test_disk_takes_precedence(self):
+        fs = self._fs()
+        self.assertEqual(fs.read("assets/readme.txt"), b"disk")
+        self.assertEqual(fs.read("assets/../assets/readme.txt"), b"disk")
+
+    def test_index_is_reused(self):
+        self._fs()
+        self.assertTrue(os.listdir(os.path.join(self.root, "cache")))
+        self.assertEqual(self._fs().read("assets/Sprites/bat.png"), b"inner")
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self._fs().read("assets/missing.png")
+
+if __name__ == '__main__':
+    unittest.main()